@@ -0,0 +1,308 @@
+__author__ = 'Rakesh Kumar'
+
+import numpy as np
+
+from model.match import field_names
+from model.admitted_traffic_index import get_field_ranges, is_field_ranges_wildcard
+from util import filter_spg_traffic_with_paths
+
+# Concrete headers are kept one per row of a structured array, all of the fields fit in an int64
+header_dtype = np.dtype([(field_name, np.int64) for field_name in field_names])
+
+
+def get_host_pair_headers(ng, host_pairs):
+
+    '''
+    The concrete header of the traffic between each of the host pairs, same as the one in get_specific_traffic with
+    the fields it leaves open set to zero.
+    '''
+
+    headers = np.zeros(len(host_pairs), dtype=header_dtype)
+
+    for i, (src_h_id, dst_h_id) in enumerate(host_pairs):
+        src_h_obj = ng.get_node_object(src_h_id)
+        dst_h_obj = ng.get_node_object(dst_h_id)
+
+        headers["ethernet_type"][i] = 0x0800
+        headers["ethernet_source"][i] = int(src_h_obj.mac_addr.replace(":", ""), 16)
+        headers["ethernet_destination"][i] = int(dst_h_obj.mac_addr.replace(":", ""), 16)
+        headers["in_port"][i] = int(src_h_obj.switch_port.port_number)
+
+    return headers
+
+
+class AdmittedTrafficTable(object):
+
+    '''
+    The traffic elements admitted at a node for a dst, compiled into arrays so that the elements that each of a batch
+    of concrete headers falls in are found with a few array operations. For each field, the beginnings and ends of the
+    ranges of that field in all of the elements cut its values into segments, and each element has a row saying which
+    of the segments it has. A header value is turned into its segment by a binary search, and an element has the
+    header if it has the segments of all of the header's fields.
+    '''
+
+    def __init__(self, traffic_elements, element_succs, element_modifications):
+
+        self.num_elements = len(traffic_elements)
+
+        # The succs the elements are admitted via, and the elements admitted via each of them
+        self.succs = []
+        succ_elements = {}
+        for i, succ in enumerate(element_succs):
+            if succ not in succ_elements:
+                self.succs.append(succ)
+                succ_elements[succ] = []
+            succ_elements[succ].append(i)
+        self.succ_elements = [np.array(succ_elements[succ]) for succ in self.succs]
+
+        self.field_boundaries = {}
+        self.field_segments = {}
+
+        for field_name in field_names:
+            elements_ranges = [get_field_ranges(te.traffic_fields[field_name]) for te in traffic_elements]
+
+            # Fields that all of the elements have all of the values of do not need looking up
+            if all(is_field_ranges_wildcard(field_name, ranges) for ranges in elements_ranges):
+                continue
+
+            boundaries = np.unique([b for ranges in elements_ranges for r in ranges for b in r]).astype(np.int64)
+
+            # Segment k has the values from boundaries[k - 1] up to boundaries[k]
+            segments = np.zeros((self.num_elements, len(boundaries) + 1), dtype=bool)
+            for i, ranges in enumerate(elements_ranges):
+                for begin, end in ranges:
+                    segments[i, np.searchsorted(boundaries, begin, side="right"):
+                             np.searchsorted(boundaries, end, side="right")] = True
+
+            self.field_boundaries[field_name] = boundaries
+            self.field_segments[field_name] = segments
+
+        # The values that the elements modify the fields of the header to, -1 where they leave it as it is
+        self.field_modifications = {}
+
+        for i, modifications in enumerate(element_modifications):
+            for field_name in modifications:
+
+                # Only a modification to a single value applies to a concrete header
+                ranges = get_field_ranges(modifications[field_name][1])
+                if len(ranges) != 1 or ranges[0][1] - ranges[0][0] != 1:
+                    continue
+
+                if field_name not in self.field_modifications:
+                    self.field_modifications[field_name] = np.full(self.num_elements, -1, dtype=np.int64)
+                self.field_modifications[field_name][i] = ranges[0][0]
+
+    def get_matches(self, headers):
+
+        '''
+        :param headers: Array of header_dtype
+        :return: Boolean array, with a row for each of the elements and a column for each of the headers
+        '''
+
+        matches = np.ones((self.num_elements, len(headers)), dtype=bool)
+
+        for field_name in self.field_segments:
+            segment_indices = np.searchsorted(self.field_boundaries[field_name], headers[field_name], side="right")
+            matches &= self.field_segments[field_name][:, segment_indices]
+
+        return matches
+
+    def iter_succ_matches(self, headers):
+
+        '''
+        :param headers: Array of header_dtype
+        :return: Generator of (succ, positions of the headers admitted via succ, the first element that admits each)
+        '''
+
+        matches = self.get_matches(headers)
+
+        for succ, elements in zip(self.succs, self.succ_elements):
+            succ_matches = matches[elements]
+            rows = np.nonzero(succ_matches.any(axis=0))[0]
+            if len(rows):
+                yield succ, rows, elements[succ_matches[:, rows].argmax(axis=0)]
+
+    # Modifies the headers, in place, the way each of the given elements modify the traffic in them
+    def apply_modifications(self, headers, elements):
+        for field_name, values in self.field_modifications.items():
+            element_values = values[elements]
+            is_modified = element_values >= 0
+            headers[field_name][is_modified] = element_values[is_modified]
+
+
+class BulkPathQuery(object):
+
+    '''
+    Finds the active paths of a batch of concrete headers at once, the same ones that get_active_path finds for each
+    of them as specific_traffic. The admitted traffic that the headers are checked against at each node is compiled
+    into an AdmittedTrafficTable the first time it is needed, and the headers that are at the same node headed to the
+    same dst are looked up together. The tables are thrown away when any link or port changes state.
+    '''
+
+    def __init__(self, pg):
+        self.pg = pg
+        self.tables = {}
+        self.port_state_key = None
+
+    def check_port_state(self):
+        port_state_key = self.pg.network_graph.get_port_state_key()
+        if port_state_key != self.port_state_key:
+            self.tables = {}
+            self.port_state_key = port_state_key
+
+    def get_spg_table(self, sw, node, dst, exclude_inactive):
+
+        key = (node, dst, exclude_inactive)
+        if key not in self.tables:
+            at = sw.port_graph.get_admitted_traffic(node, dst)
+            if exclude_inactive:
+                at = filter_spg_traffic_with_paths(sw, at, node, dst)
+
+            self.tables[key] = AdmittedTrafficTable(at.traffic_elements,
+                                                    [dst] * len(at.traffic_elements),
+                                                    [te.switch_modifications for te in at.traffic_elements])
+        return self.tables[key]
+
+    def get_npg_table(self, node, dst):
+
+        key = (node, dst, True)
+        if key not in self.tables:
+            traffic_elements = []
+            element_succs = []
+            for succ in self.pg.get_admitted_traffic_succs(node, dst):
+                at = self.pg.get_admitted_traffic_via_succ(node, dst, succ).clone_with_active_traffic_elements()
+                traffic_elements.extend(at.traffic_elements)
+                element_succs.extend([succ] * len(at.traffic_elements))
+
+            element_modifications = []
+            for te in traffic_elements:
+                if te.enabling_edge_data and te.enabling_edge_data.applied_modifications:
+                    element_modifications.append(te.enabling_edge_data.applied_modifications)
+                else:
+                    element_modifications.append({})
+
+            self.tables[key] = AdmittedTrafficTable(traffic_elements, element_succs, element_modifications)
+
+        return self.tables[key]
+
+    def get_paths(self, headers, src_ports, dst_ports):
+
+        '''
+        :param headers: Array of header_dtype, one for each of the queries
+        :param src_ports: The port each of the headers enters the network at
+        :param dst_ports: The port each of the headers is headed to
+        :return: List with the nodes on the active path of each of the queries, or None where there is none
+        '''
+
+        self.check_port_state()
+
+        paths = [None] * len(headers)
+        headers = headers.copy()
+        headers["in_port"] = [int(src_port.port_number) for src_port in src_ports]
+
+        # Queries between ports on the same switch only need the switch port graph of that switch
+        same_sw_queries = {}
+        src_port_queries = {}
+        for i, (src_port, dst_port) in enumerate(zip(src_ports, dst_ports)):
+            if src_port.sw.node_id == dst_port.sw.node_id:
+                same_sw_queries.setdefault((src_port, dst_port), []).append(i)
+            else:
+                src_port_queries.setdefault(src_port, []).append(i)
+
+        for (src_port, dst_port), queries in same_sw_queries.items():
+            queries = np.array(queries)
+            table = self.get_spg_table(src_port.sw,
+                                       src_port.switch_port_graph_ingress_node,
+                                       dst_port.switch_port_graph_egress_node,
+                                       False)
+
+            for i in queries[table.get_matches(headers[queries]).any(axis=0)]:
+                paths[i] = [src_port.switch_port_graph_ingress_node, dst_port.switch_port_graph_egress_node]
+
+        # Each walk through the network port graph starts at an egress port of the source switch that the header is
+        # admitted to, and heads to one of the ingress ports of the destination switch
+        walks = []
+        for src_port, queries in src_port_queries.items():
+            queries = np.array(queries)
+
+            for src_sw_port in src_port.sw.non_host_port_iter():
+                table = self.get_spg_table(src_port.sw,
+                                           src_port.switch_port_graph_ingress_node,
+                                           src_sw_port.switch_port_graph_egress_node,
+                                           True)
+
+                for succ, rows, elements in table.iter_succ_matches(headers[queries]):
+                    modified_headers = headers[queries[rows]]
+                    table.apply_modifications(modified_headers, elements)
+
+                    for i, modified_header in zip(queries[rows], modified_headers.tolist()):
+                        for dst_sw_port in dst_ports[i].sw.non_host_port_iter():
+                            walks.append((i,
+                                          modified_header,
+                                          [src_port.switch_port_graph_ingress_node,
+                                           src_sw_port.network_port_graph_egress_node],
+                                          dst_sw_port))
+
+        # The walks that get to the destination switch still need to be admitted to the dst_port there
+        dst_walks = {}
+        for walk in self.walk_network_port_graph(walks):
+            dst_walks.setdefault((walk[3], dst_ports[walk[0]]), []).append(walk)
+
+        for (dst_sw_port, dst_port), walk_group in dst_walks.items():
+            walk_headers = np.array([walk[1] for walk in walk_group], dtype=header_dtype)
+            walk_headers["in_port"] = int(dst_sw_port.port_number)
+
+            table = self.get_spg_table(dst_port.sw,
+                                       dst_sw_port.switch_port_graph_ingress_node,
+                                       dst_port.switch_port_graph_egress_node,
+                                       True)
+
+            for r in np.nonzero(table.get_matches(walk_headers).any(axis=0))[0]:
+                i, walk_header, walk_path, dst_sw_port = walk_group[r]
+                if paths[i] is not None:
+                    raise Exception("Can't have more than one active paths; something is wrong.")
+                paths[i] = walk_path + [dst_port.switch_port_graph_egress_node]
+
+        return paths
+
+    def walk_network_port_graph(self, walks):
+
+        '''
+        Takes all of the walks through the network port graph a step at a time, the ones at the same node headed to
+        the same dst together. A walk that is admitted via more than one succ splits into one walk for each of them.
+
+        :param walks: List of (query, header as a tuple, nodes so far, dst_sw_port)
+        :return: The walks that got to the ingress node of their dst_sw_port
+        '''
+
+        done_walks = []
+        max_path_length = len(self.pg.g) + 2
+
+        while walks:
+            node_walks = {}
+            for walk in walks:
+                node_walks.setdefault((walk[2][-1], walk[3].network_port_graph_ingress_node), []).append(walk)
+
+            walks = []
+            for (node, dst), walk_group in node_walks.items():
+                walk_headers = np.array([walk[1] for walk in walk_group], dtype=header_dtype)
+
+                # Traffic going through a switch is in it from the port of the ingress node
+                if node.node_type == "ingress":
+                    walk_headers["in_port"] = int(node.parent_obj.port_number)
+
+                table = self.get_npg_table(node, dst)
+
+                for succ, rows, elements in table.iter_succ_matches(walk_headers):
+                    modified_headers = walk_headers[rows]
+                    table.apply_modifications(modified_headers, elements)
+
+                    for r, modified_header in zip(rows, modified_headers.tolist()):
+                        i, walk_header, walk_path, dst_sw_port = walk_group[r]
+
+                        if succ == dst:
+                            done_walks.append((i, modified_header, walk_path + [succ], dst_sw_port))
+                        elif len(walk_path) < max_path_length:
+                            walks.append((i, modified_header, walk_path + [succ], dst_sw_port))
+
+        return done_walks
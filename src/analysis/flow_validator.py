@@ -1,18 +1,24 @@
+import os
 import sys
 import time
 import grpc
+import multiprocessing
 
 sys.path.append("./")
 
 from sdnsim_client import SDNSimClient
 from collections import defaultdict
+from itertools import izip
 from experiments.timer import Timer
 from model.network_port_graph import NetworkPortGraph
 from model.traffic import Traffic
 from model.traffic_element import TrafficElement
 from model.match import Match
+from model.object_registry import ObjectRegistry
+from model.lru_memo import LRUMemo
 from util import get_specific_traffic
 from util import get_admitted_traffic, get_active_path, get_failover_path_after_failed_sequence
+from util import get_failover_paths_after_failed_sequences
 from analysis.policy_statement import CONNECTIVITY_CONSTRAINT, ISOLATION_CONSTRAINT
 from analysis.policy_statement import PATH_LENGTH_CONSTRAINT, LINK_AVOIDANCE_CONSTRAINT
 from analysis.policy_statement import PolicyViolation, PolicyStatement, PolicyConstraint
@@ -20,29 +26,131 @@ from analysis.policy_statement import PolicyViolation, PolicyStatement, PolicyCo
 
 _ONE_DAY_IN_SECONDS = 60 * 60 * 24
 
+active_path_cache_size = 4096
+
+# The FlowValidator and the port pairs it is validating, as seen by the processes of the pool that validates them.
+# It is set before the pool is started, so the processes get it as they are forked.
+validation_pool_context = None
+
+
+def validate_pair_in_pool(i):
+
+    fv, pairs = validation_pool_context
+    src_port, dst_port, ps, lmbdas = pairs[i]
+
+    active_path_time, active_path_length, violations = fv.validate_pair(src_port, dst_port, ps, lmbdas)
+
+    # Violations go back as the positions of their lmbda and constraint, these are put back together on the other end
+    violations = [(lmbdas.index(v.lmbda), ps.constraints.index(v.constraint)) for v in violations]
+
+    return active_path_time, active_path_length, violations
+
 __author__ = 'Rakesh Kumar'
 
 
 class FlowValidator(object):
 
-    def __init__(self, network_graph, use_sdnsim=False, nc=None):
+    def __init__(self, network_graph, use_sdnsim=False, nc=None, num_processes=1, snapshot_dir=None,
+                 lazy_admitted_traffic=False):
 
         self.network_graph = network_graph
         self.use_sdnsim = use_sdnsim
+        self.num_processes = num_processes
+        self.snapshot_dir = snapshot_dir
+
+        # Compute the admitted traffic for the dsts at a switch only once a policy needs it
+        self.lazy_admitted_traffic = lazy_admitted_traffic
 
         self.sdnsim_client = None
         self.port_graph = None
 
+        # The registry of the network graph as parsed and the snapshot named after it, see init_snapshot_registry
+        self.snapshot_registry = None
+        self.snapshot_path = None
+
+        # Active paths computed on the port graph, keyed by the ports, traffic and the network graph's port state
+        self.active_path_cache = LRUMemo(active_path_cache_size)
+
         if self.use_sdnsim:
             self.sdnsim_client = SDNSimClient(nc)
             self.sdnsim_client.initialize_sdnsim()
         else:
             self.port_graph = NetworkPortGraph(network_graph)
+            if self.snapshot_dir:
+                self.init_snapshot_registry()
             self.init_network_port_graph()
 
     def init_network_port_graph(self):
-        self.port_graph.init_network_port_graph()
-        self.port_graph.init_network_admitted_traffic()
+
+        # The paths found on the port graphs from before are of no use with the new ones. Loading a snapshot also puts
+        # back the port state epoch of the network graph, so they could be looked up again otherwise.
+        self.active_path_cache = LRUMemo(active_path_cache_size)
+
+        if self.snapshot_registry:
+            self.init_network_port_graph_from_snapshot()
+        else:
+            self.compute_network_port_graph()
+
+    def compute_network_port_graph(self):
+        self.port_graph.init_network_port_graph(self.num_processes)
+        self.port_graph.init_network_admitted_traffic(self.num_processes, self.lazy_admitted_traffic)
+
+    def init_snapshot_registry(self):
+
+        '''
+
+        Snapshots are named by a hash of the state of the network graph as parsed (the flow tables, groups, ports and
+        links) and hold the state of all the objects in it after initialization, so the registry they are taken with
+        can only be built before the network graph is initialized. When it already is, there are no snapshots.
+
+        :return: None
+        '''
+
+        if any(sw.port_graph for sw in self.network_graph.get_switches()):
+            return
+
+        self.snapshot_registry = ObjectRegistry(self.network_graph)
+        self.snapshot_path = os.path.join(self.snapshot_dir,
+                                          "flow_validator_" + self.snapshot_registry.get_state_hash() + ".snapshot")
+
+    def init_network_port_graph_from_snapshot(self):
+
+        '''
+
+        Load the initialized port graphs from the snapshot for this network graph in snapshot_dir if there is one,
+        otherwise initialize them and save the snapshot. The objects of the network graph are put back in the state
+        they were in right after initialization, whatever state they are in now.
+
+        :return: None
+        '''
+
+        if os.path.exists(self.snapshot_path):
+            self.load_snapshot(self.snapshot_registry, self.snapshot_path)
+        else:
+            self.compute_network_port_graph()
+            self.save_snapshot(self.snapshot_registry, self.snapshot_path)
+
+    def save_snapshot(self, registry, snapshot_path):
+
+        if not os.path.exists(self.snapshot_dir):
+            os.makedirs(self.snapshot_dir)
+
+        # Written to the side first, so there is never a partial snapshot at snapshot_path
+        tmp_snapshot_path = snapshot_path + "." + str(os.getpid())
+        with open(tmp_snapshot_path, "wb") as f:
+            f.write(registry.dumps((len(registry.objects), registry.get_states(), self.port_graph)))
+        os.rename(tmp_snapshot_path, snapshot_path)
+
+    def load_snapshot(self, registry, snapshot_path):
+
+        with open(snapshot_path, "rb") as f:
+            num_objects, states, port_graph = registry.loads(f.read())
+
+        if num_objects != len(registry.objects):
+            raise Exception("Snapshot does not match the network graph:", snapshot_path)
+
+        registry.set_states(states)
+        self.port_graph = port_graph
 
     def de_init_network_port_graph(self):
         self.port_graph.de_init_network_port_graph()
@@ -61,7 +169,12 @@ class FlowValidator(object):
             traffic.set_field("ethernet_destination", int(dst_port.attached_host.mac_addr.replace(":", ""), 16))
             traffic.set_field("in_port", int(src_port.port_number))
             traffic.set_field("has_vlan_tag", 0)
-            traffic_path = get_active_path(self.port_graph, traffic, src_port, dst_port)
+
+            key = (src_port, dst_port, frozenset(traffic.get_fields_keys()), self.network_graph.get_port_state_key())
+            found, traffic_path = self.active_path_cache.lookup(key)
+            if not found:
+                traffic_path = get_active_path(self.port_graph, traffic, src_port, dst_port)
+                self.active_path_cache.store(key, traffic_path)
 
         return traffic_path
 
@@ -103,6 +216,19 @@ class FlowValidator(object):
 
         return traffic_path
 
+    def get_failover_paths_after_failed_sequences(self, traffic, src_port, dst_port, active_path, lmbdas):
+
+        # The simulator takes the whole failure sequence at once, so each one is its own query there
+        if self.use_sdnsim:
+            failover_paths = {}
+            for lmbda in lmbdas:
+                failover_paths[lmbda] = self.get_failover_path_after_failed_sequence(traffic, src_port, dst_port,
+                                                                                     active_path, lmbda)
+        else:
+            failover_paths = get_failover_paths_after_failed_sequences(self.port_graph, active_path, lmbdas)
+
+        return failover_paths
+
     def port_pair_iter(self, src_zone, dst_zone):
 
         for src_port in src_zone:
@@ -138,7 +264,72 @@ class FlowValidator(object):
 
         return result
 
-    def validate_policy(self, policy_statement_list, active_path_computation_times=None, path_lengths=None):
+    def validate_policy(self, policy_statement_list, active_path_computation_times=None, path_lengths=None,
+                        max_violations=None, first_violation_per_statement=False):
+
+        self.violations = list(self.iter_violations(policy_statement_list,
+                                                    active_path_computation_times,
+                                                    path_lengths,
+                                                    max_violations,
+                                                    first_violation_per_statement))
+
+        return self.violations
+
+    def iter_violations(self, policy_statement_list, active_path_computation_times=None, path_lengths=None,
+                        max_violations=None, first_violation_per_statement=False):
+
+        '''
+
+        Validates the policy statements the same way as validate_policy, but yields the violations as they are found
+        instead of collecting them all.
+
+        :param policy_statement_list: List of PolicyStatement
+        :param active_path_computation_times: If not None, the time taken to compute each active path is added to it
+        :param path_lengths: If not None, the length of each active path is added to it
+        :param max_violations: If not None, stop once this many violations have been found
+        :param first_violation_per_statement: If True, stop checking a policy statement once it has a violation
+        :return: Generator of PolicyViolation
+        '''
+
+        pairs = self.get_policy_pairs(policy_statement_list)
+
+        violated_statements = set()
+        num_violations = 0
+
+        if max_violations is not None and max_violations <= 0:
+            return
+
+        def skip_pair(pair):
+            return first_violation_per_statement and pair[2] in violated_statements
+
+        results = self.iter_pair_results(pairs, skip_pair)
+        try:
+            for pair, (active_path_time, active_path_length, violations) in results:
+
+                # Results computed ahead in the pool may belong to statements that have a violation by now
+                if skip_pair(pair):
+                    continue
+
+                if active_path_computation_times != None:
+                    active_path_computation_times.append(active_path_time)
+
+                if path_lengths != None:
+                    path_lengths.append(active_path_length)
+
+                for v in violations:
+                    yield v
+
+                    num_violations += 1
+                    if max_violations is not None and num_violations >= max_violations:
+                        return
+
+                    if first_violation_per_statement:
+                        violated_statements.add(pair[2])
+                        break
+        finally:
+            results.close()
+
+    def get_policy_pairs(self, policy_statement_list):
 
         # Avoid duplication of effort across policies
         # p_map is a two-dimensional dictionary:
@@ -153,76 +344,185 @@ class FlowValidator(object):
                         self.p_map[lmbda][(src_port, dst_port)] = []
                     self.p_map[lmbda][(src_port, dst_port)].append(ps)
 
-        # Now the validation
         self.max_k = len(max(self.p_map.keys(), key=lambda link_perm: len(link_perm)))
-        self.violations = []
 
+        # The active path only depends on the port pair and the policy statement, and the failover paths for all
+        # the lmbdas that come with them are computed in one go so that the shared failure prefixes are reused
+        pair_ps_lmbdas = defaultdict(list)
         for lmbda in self.p_map:
-            for src_port, dst_port in list(self.p_map[lmbda].keys()):
+            for src_port, dst_port in self.p_map[lmbda]:
                 for ps in self.p_map[lmbda][(src_port, dst_port)]:
+                    pair_ps_lmbdas[(src_port, dst_port, ps)].append(lmbda)
+
+        return [(src_port, dst_port, ps, pair_ps_lmbdas[(src_port, dst_port, ps)])
+                for src_port, dst_port, ps in pair_ps_lmbdas]
+
+    def iter_pair_results(self, pairs, skip_pair):
+
+        if self.num_processes > 1 and len(pairs) > 1:
+            if self.use_sdnsim:
+                for pair, result in zip(pairs, self.validate_pairs_with_sdnsim(pairs)):
+                    yield pair, result
+            else:
+                for pair, result in self.iter_pairs_in_pool(pairs):
+                    yield pair, result
+        else:
+            for pair in pairs:
+                if not skip_pair(pair):
+                    yield pair, self.validate_pair(*pair)
+
+    def get_pair_violations(self, src_port, dst_port, ps, lmbdas, failover_paths):
+
+        violations = []
+        for lmbda in lmbdas:
+            violations.extend(self.check_constraints(ps, lmbda, src_port, dst_port, failover_paths[lmbda]))
+
+        return violations
+
+    def validate_pair(self, src_port, dst_port, ps, lmbdas):
+
+        with Timer(verbose=True) as t:
+            active_path = self.get_active_path(ps.traffic, src_port, dst_port)
+
+        failover_paths = dict((lmbda, None) for lmbda in lmbdas)
+
+        if active_path:
+            failover_paths = self.get_failover_paths_after_failed_sequences(ps.traffic,
+                                                                            src_port,
+                                                                            dst_port,
+                                                                            active_path,
+                                                                            lmbdas)
+
+        active_path_length = len(active_path) if active_path is not None else None
+
+        return t.secs, active_path_length, self.get_pair_violations(src_port, dst_port, ps, lmbdas, failover_paths)
+
+    def iter_pairs_in_pool(self, pairs):
+
+        '''
+
+        Validate the port pairs in a pool of processes forked after the port graph is initialized, so they all work
+        off the same port graph without copying it. Each process sends back what validate_pair returns for a pair,
+        with the violations as the positions of their lmbda and constraint. The results come out in the order of
+        the pairs, as soon as they are ready.
+
+        :param pairs: List of (src_port, dst_port, ps, lmbdas)
+        :return: Generator of (pair, what validate_pair returns for it)
+        '''
+
+        global validation_pool_context
+
+        validation_pool_context = (self, pairs)
+
+        # Kept until the pool is gone, a process that exits is replaced by one forked at that time
+        pool = multiprocessing.Pool(self.num_processes)
+        try:
+            chunksize = max(1, len(pairs) / (self.num_processes * 4))
+            pool_results = pool.imap(validate_pair_in_pool, range(len(pairs)), chunksize=chunksize)
+
+            for (src_port, dst_port, ps, lmbdas), (active_path_time, active_path_length, violations) in \
+                    izip(pairs, pool_results):
+
+                violations = [PolicyViolation(lmbdas[i], src_port, dst_port, ps.constraints[j], "")
+                              for i, j in violations]
+
+                yield (src_port, dst_port, ps, lmbdas), (active_path_time, active_path_length, violations)
+        finally:
+            pool.terminate()
+            pool.join()
+            validation_pool_context = None
+
+    def validate_pairs_with_sdnsim(self, pairs):
+
+        '''
+
+        Validate the port pairs with up to num_processes calls to the simulator going at once. All the active paths
+        are asked for first and then all the failover paths.
+
+        :param pairs: List of (src_port, dst_port, ps, lmbdas)
+        :return: List of what validate_pair returns for each of the pairs
+        '''
+
+        with Timer(verbose=True) as t:
+            active_paths = self.sdnsim_client.get_active_flow_paths(
+                [(src_port.sw.node_id, src_port.port_number, dst_port.sw.node_id, dst_port.port_number, ps.traffic, [])
+                 for src_port, dst_port, ps, lmbdas in pairs],
+                self.num_processes)
+
+        failover_path_queries = []
+        for (src_port, dst_port, ps, lmbdas), active_path in zip(pairs, active_paths):
+            if active_path:
+                for lmbda in lmbdas:
+                    failover_path_queries.append((src_port.sw.node_id, src_port.port_number,
+                                                  dst_port.sw.node_id, dst_port.port_number,
+                                                  ps.traffic,
+                                                  [l.forward_link for l in lmbda]))
+
+        failover_paths_iter = iter(self.sdnsim_client.get_active_flow_paths(failover_path_queries, self.num_processes))
+
+        results = []
+        for (src_port, dst_port, ps, lmbdas), active_path in zip(pairs, active_paths):
+
+            failover_paths = dict((lmbda, None) for lmbda in lmbdas)
+            if active_path:
+                for lmbda in lmbdas:
+                    failover_paths[lmbda] = next(failover_paths_iter)
+
+            # The time for all of the active paths is spread over the pairs
+            results.append((t.secs / len(pairs),
+                            len(active_path) if active_path is not None else None,
+                            self.get_pair_violations(src_port, dst_port, ps, lmbdas, failover_paths)))
+
+        return results
+
+    def check_constraints(self, ps, lmbda, src_port, dst_port, failover_path):
 
-                    with Timer(verbose=True) as t:
-                        active_path = self.get_active_path(ps.traffic, src_port, dst_port)
-
-                    if active_path_computation_times != None:
-                        active_path_computation_times.append(t.secs)
-
-                    if path_lengths != None:
-                        path_lengths.append(len(active_path))
-
-                    failover_path = None
-
-                    if active_path:
-                        failover_path = self.get_failover_path_after_failed_sequence(ps.traffic,
-                                                                                     src_port,
-                                                                                     dst_port,
-                                                                                     active_path,
-                                                                                     lmbda)
-
-                    for constraint in ps.constraints:
-                        if constraint.constraint_type == CONNECTIVITY_CONSTRAINT:
-                            if not failover_path:
-                                v = PolicyViolation(lmbda,
-                                                    src_port,
-                                                    dst_port,
-                                                    constraint,
-                                                    "")
-                                self.violations.append(v)
-
-                        elif constraint.constraint_type == LINK_AVOIDANCE_CONSTRAINT:
-                            if failover_path:
-                                passes_links = False
-
-                                for ld in constraint.constraint_params:
-                                    if self.passes_link(failover_path, ld):
-                                        passes_links = True
-                                        break
-
-                                if passes_links:
-                                    v = PolicyViolation(lmbda,
-                                                        src_port,
-                                                        dst_port,
-                                                        constraint,
-                                                        str(failover_path))
-                                    self.violations.append(v)
-
-                        elif constraint.constraint_type == PATH_LENGTH_CONSTRAINT:
-                            if failover_path:
-                                if len(failover_path) > constraint.constraint_params:
-                                    v = PolicyViolation(lmbda,
-                                                        src_port,
-                                                        dst_port,
-                                                        constraint,
-                                                        str(failover_path))
-                                    self.violations.append(v)
-
-                        elif constraint.constraint_type == ISOLATION_CONSTRAINT:
-                            if failover_path:
-                                v = PolicyViolation(lmbda,
-                                                    src_port,
-                                                    dst_port,
-                                                    constraint,
-                                                    "")
-                                self.violations.append(v)
-
-        return self.violations
\ No newline at end of file
+        violations = []
+
+        for constraint in ps.constraints:
+            if constraint.constraint_type == CONNECTIVITY_CONSTRAINT:
+                if not failover_path:
+                    v = PolicyViolation(lmbda,
+                                        src_port,
+                                        dst_port,
+                                        constraint,
+                                        "")
+                    violations.append(v)
+
+            elif constraint.constraint_type == LINK_AVOIDANCE_CONSTRAINT:
+                if failover_path:
+                    passes_links = False
+
+                    for ld in constraint.constraint_params:
+                        if self.passes_link(failover_path, ld):
+                            passes_links = True
+                            break
+
+                    if passes_links:
+                        v = PolicyViolation(lmbda,
+                                            src_port,
+                                            dst_port,
+                                            constraint,
+                                            str(failover_path))
+                        violations.append(v)
+
+            elif constraint.constraint_type == PATH_LENGTH_CONSTRAINT:
+                if failover_path:
+                    if len(failover_path) > constraint.constraint_params:
+                        v = PolicyViolation(lmbda,
+                                            src_port,
+                                            dst_port,
+                                            constraint,
+                                            str(failover_path))
+                        violations.append(v)
+
+            elif constraint.constraint_type == ISOLATION_CONSTRAINT:
+                if failover_path:
+                    v = PolicyViolation(lmbda,
+                                        src_port,
+                                        dst_port,
+                                        constraint,
+                                        "")
+                    violations.append(v)
+
+        return violations
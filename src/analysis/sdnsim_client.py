@@ -1,6 +1,6 @@
 import grpc
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from rpc import sdnsim_pb2
 from rpc import sdnsim_pb2_grpc
 from netaddr import IPNetwork
@@ -274,9 +274,7 @@ class SDNSimClient(object):
         except grpc.RpcError as e:
             print "Call to Initialize failed:", e.details(), e.code().name, e.code().value
 
-    def get_active_flow_path(self, src_sw_id, src_sw_port_num, dst_sw_id, dst_sw_port_num, policy_match, lmbda):
-
-        path = None
+    def prepare_active_path_params(self, src_sw_id, src_sw_port_num, dst_sw_id, dst_sw_port_num, policy_match, lmbda):
 
         flow = sdnsim_pb2.Flow(src_port=sdnsim_pb2.PolicyPort(switch_id=src_sw_id,
                                                               port_num=src_sw_port_num),
@@ -288,13 +286,26 @@ class SDNSimClient(object):
         for link in lmbda:
             rpc_links.append(self.rpc_links[link[0]][link[1]])
 
-        nafp = sdnsim_pb2.ActivePathParams(flow=flow,
+        return sdnsim_pb2.ActivePathParams(flow=flow,
                                            lmbda=sdnsim_pb2.Lmbda(links=rpc_links))
+
+    def get_path_from_active_path_info(self, api):
+
+        path = []
+        for port in api.ports:
+            path.append(port.switch_id + ":" + str(port.port_num))
+
+        return path
+
+    def get_active_flow_path(self, src_sw_id, src_sw_port_num, dst_sw_id, dst_sw_port_num, policy_match, lmbda):
+
+        path = None
+
+        nafp = self.prepare_active_path_params(src_sw_id, src_sw_port_num, dst_sw_id, dst_sw_port_num,
+                                               policy_match, lmbda)
         try:
             api = self.stub.GetActiveFlowPath(nafp)
-            path = []
-            for port in api.ports:
-                path.append(port.switch_id + ":" + str(port.port_num))
+            path = self.get_path_from_active_path_info(api)
 
             #print "GetActiveFlowPath was successful, time taken:", api.time_taken/1000000000, "seconds."
         except grpc.RpcError as e:
@@ -302,6 +313,40 @@ class SDNSimClient(object):
 
         return path
 
+    def get_active_flow_paths(self, queries, max_in_flight):
+
+        '''
+        Same as calling get_active_flow_path for each query, but keeps up to max_in_flight calls going at once
+        instead of waiting on each one before sending the next.
+
+        :param queries: List of tuples with the arguments of get_active_flow_path
+        :param max_in_flight: Number of calls that can be outstanding at a time
+        :return: List of paths, in the order of the queries
+        '''
+
+        paths = [None] * len(queries)
+        in_flight = deque()
+
+        for i, query in enumerate(queries):
+            in_flight.append((i, self.stub.GetActiveFlowPath.future(self.prepare_active_path_params(*query))))
+
+            # Only wait on the oldest call once there are max_in_flight of them going
+            if len(in_flight) >= max_in_flight:
+                self.collect_active_flow_path(in_flight.popleft(), paths)
+
+        while in_flight:
+            self.collect_active_flow_path(in_flight.popleft(), paths)
+
+        return paths
+
+    def collect_active_flow_path(self, call, paths):
+
+        i, future = call
+        try:
+            paths[i] = self.get_path_from_active_path_info(future.result())
+        except grpc.RpcError as e:
+            print "Call to GetActiveFlowPath failed:", e.details(), e.code().name, e.code().value
+
     def get_num_active_flows_when_links_fail(self, reps, src_ports, dst_ports, policy_matches):
 
         flows = self.prepare_rpc_flows(src_ports, dst_ports, policy_matches)
@@ -323,3 +323,51 @@ def get_failover_path_after_failed_sequence(pg, current_path, failed_link_sequen
         ld.set_link_ports_up()
 
     return failover_path_after_failure
+
+
+def get_failover_paths_after_failed_sequences(pg, active_path, failed_link_sequences):
+
+    '''
+    Same as get_failover_path_after_failed_sequence for each of the failed_link_sequences, but the failover path
+    after a prefix that is shared by several sequences is computed only once. The sequences are put in a trie of the
+    links that fail, and the trie is walked depth-first with the links on the way to a trie node kept down.
+
+    :return: Dictionary with the failover path (or None) for each of the failed_link_sequences
+    '''
+
+    failure_trie = {}
+    for failed_link_sequence in failed_link_sequences:
+        trie_node = failure_trie
+        for ld in failed_link_sequence:
+            trie_node = trie_node.setdefault(ld, {})
+
+    failover_paths = {(): active_path}
+    get_failover_paths_in_failure_trie(pg, failure_trie, (), active_path, failover_paths)
+
+    return dict((failed_link_sequence, failover_paths[failed_link_sequence])
+                for failed_link_sequence in failed_link_sequences)
+
+
+def get_failover_paths_in_failure_trie(pg, failure_trie, failed_link_prefix, current_path, failover_paths):
+
+    for ld in failure_trie:
+
+        failed_link_sequence = failed_link_prefix + (ld,)
+
+        # Once there is no failover path, there is none for the longer sequences either
+        if not current_path:
+            failover_paths[failed_link_sequence] = None
+            get_failover_paths_in_failure_trie(pg, failure_trie[ld], failed_link_sequence, None, failover_paths)
+            continue
+
+        # A link that failed earlier in the sequence is already down
+        already_down = ld in failed_link_prefix
+        if not already_down:
+            ld.set_link_ports_down()
+
+        failover_path = get_failover_path(pg, current_path, ld)
+        failover_paths[failed_link_sequence] = failover_path
+        get_failover_paths_in_failure_trie(pg, failure_trie[ld], failed_link_sequence, failover_path, failover_paths)
+
+        if not already_down:
+            ld.set_link_ports_up()
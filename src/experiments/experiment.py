@@ -69,6 +69,29 @@ class Experiment(object):
         with open(filename, "w") as outfile:
             pickle.dump(violations, outfile)
 
+    def write_violations(self, violations):
+
+        '''
+        Writes the violations one JSON object per line, as they come. Unlike dump_violations, this works with the
+        generator from FlowValidator.iter_violations without having all of the violations in memory at once.
+        :return: Number of violations written
+        '''
+
+        filename = "data/" + self.experiment_tag + "_violations.jsonl"
+        print "Writing violations to file:", filename
+
+        num_violations = 0
+        with open(filename, "w") as outfile:
+            for v in violations:
+                outfile.write(json.dumps({"lmbda": str(v.lmbda),
+                                          "src_port": str(v.src_port),
+                                          "dst_port": str(v.dst_port),
+                                          "constraint": str(v.constraint)}) + "\n")
+                outfile.flush()
+                num_violations += 1
+
+        return num_violations
+
     def load_data(self, filename):
 
         print "Reading file:", filename
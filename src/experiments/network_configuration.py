@@ -16,6 +16,7 @@ from mininet.net import Mininet
 from mininet.node import RemoteController
 from mininet.node import OVSSwitch
 from mininet.cli import CLI
+from mininet.util import ipAdd, macColonHex
 from experiments.controller_man import ControllerMan
 from model.network_graph import NetworkGraph
 from model.match import Match
@@ -50,7 +51,8 @@ class NetworkConfiguration(object):
                  topo_params,
                  conf_root,
                  synthesis_name,
-                 synthesis_params):
+                 synthesis_params,
+                 offline=False):
 
         self.controller = controller
         self.topo_name = topo_name
@@ -60,6 +62,9 @@ class NetworkConfiguration(object):
         self.synthesis_name = synthesis_name
         self.synthesis_params = synthesis_params
 
+        # Offline, the synthesized flows and groups are written out without a controller or mininet running
+        self.offline = offline
+
         self.controller_ip = controller_ip
         self.controller_port = controller_port
         self.topo = None
@@ -85,6 +90,8 @@ class NetworkConfiguration(object):
         self.h = httplib2.Http()
         self.controller_api_base_url = controller_api_base_url
         self.controller_api_base_url = controller_api_base_url
+        self.controller_api_user_name = controller_api_user_name
+        self.controller_api_password = controller_api_password
         self.h.add_credentials(controller_api_user_name, controller_api_password)
 
     def __str__(self):
@@ -92,7 +99,7 @@ class NetworkConfiguration(object):
 
     def __del__(self):
 
-        if not self.load_config and self.save_config:
+        if not self.load_config and self.save_config and not self.offline:
             if self.cm:
                 self.cm.stop_controller()
 
@@ -129,7 +136,7 @@ class NetworkConfiguration(object):
             self.synthesis = DijkstraSynthesis(self.synthesis_params)
 
         elif self.synthesis_name == "AboresceneSynthesis":
-            self.synthesis = AboresceneSynthesis(self.synthesis_params)
+            self.synthesis = AboresceneSynthesis(self.synthesis_params, self.controller)
 
         elif self.synthesis_name == "VPLSSynthesis":
             self.synthesis = self.synthesis_name
@@ -141,7 +148,7 @@ class NetworkConfiguration(object):
         if self.synthesis_name == "DijkstraSynthesis":
             self.synthesis.network_graph = self.ng
             self.synthesis.network_configuration = self
-            self.synthesis.synthesis_lib = SynthesisLib("localhost", "8181", self.ng, self)
+            self.synthesis.synthesis_lib = SynthesisLib("localhost", "8181", self.ng, self, offline=self.offline)
             if flow_specs:
                 self.synthesis.synthesize_node_pairs(flow_specs["src_hosts"], flow_specs["dst_hosts"])
             else:
@@ -150,11 +157,14 @@ class NetworkConfiguration(object):
         elif self.synthesis_name == "AboresceneSynthesis":
             self.synthesis.network_graph = self.ng
             self.synthesis.network_configuration = self
-            self.synthesis.synthesis_lib = SynthesisLib("localhost", "8181", self.ng, self)
+            self.synthesis.synthesis_lib = SynthesisLib("localhost", "8181", self.ng, self, offline=self.offline)
             flow_match = Match(is_wildcard=True)
             flow_match["ethernet_type"] = 0x0800
             self.synthesis.synthesize_all_switches(flow_match)
 
+        if self.synthesis_name in ["DijkstraSynthesis", "AboresceneSynthesis"]:
+            self.synthesis.synthesis_lib.flush_changes()
+
         if synthesis_setup_gap:
             time.sleep(synthesis_setup_gap)
 
@@ -242,9 +252,48 @@ class NetworkConfiguration(object):
             self.wait_until_link_status(edges[1][0], edges[1][1], 'up')
             time.sleep(5)
 
+    def get_offline_ryu_switches(self):
+
+        '''
+        The switches the way get_ryu_switches pulls them from Ryu, with the ports from the topology and the flows and
+        groups that the synthesis has recorded so far, if any.
+        '''
+
+        offline_switches = {}
+        synthesis_lib = getattr(self.synthesis, "synthesis_lib", None)
+        if synthesis_lib:
+            offline_switches = synthesis_lib.offline_switches
+
+        ryu_switches = {}
+
+        for sw in self.topo.switches():
+            dpid = int(sw[1:])
+
+            this_ryu_switch = {"ports": [], "flow_tables": defaultdict(list), "groups": []}
+
+            # Same hardware addresses as mininet gives the ports when it is asked to set them
+            for port_no in sorted(self.topo.ports[sw]):
+                this_ryu_switch["ports"].append({"port_no": port_no,
+                                                 "hw_addr": macColonHex((0x02 << 40) | (dpid << 16) | port_no),
+                                                 "name": sw + "-eth" + str(port_no)})
+
+            if dpid in offline_switches:
+                this_ryu_switch["flow_tables"] = offline_switches[dpid]["flow_tables"]
+                this_ryu_switch["groups"] = offline_switches[dpid]["groups"]
+
+            ryu_switches[dpid] = this_ryu_switch
+
+        return ryu_switches
+
     def get_ryu_switches(self):
 
-        if not self.load_config and self.save_config:
+        if not self.load_config and self.save_config and self.offline:
+            ryu_switches = self.get_offline_ryu_switches()
+
+            with open(self.conf_path + "ryu_switches.json", "w") as outfile:
+                json.dump(ryu_switches, outfile, indent=4)
+
+        elif not self.load_config and self.save_config:
             ryu_switches = {}
 
             # Get all the ryu_switches from the inventory API
@@ -359,17 +408,20 @@ class NetworkConfiguration(object):
 
         if not self.load_config and self.save_config:
 
-            mininet_host_nodes = {}
+            if self.offline:
+                mininet_host_nodes = self.get_offline_mininet_host_nodes()
+            else:
+                mininet_host_nodes = {}
 
-            for sw in self.topo.switches():
-                mininet_host_nodes[sw] = []
-                for h in self.get_all_switch_hosts(sw):
-                    mininet_host_dict = {"host_switch_id": "s" + sw[1:],
-                                         "host_name": h.name,
-                                         "host_IP": h.IP(),
-                                         "host_MAC": h.MAC()}
+                for sw in self.topo.switches():
+                    mininet_host_nodes[sw] = []
+                    for h in self.get_all_switch_hosts(sw):
+                        mininet_host_dict = {"host_switch_id": "s" + sw[1:],
+                                             "host_name": h.name,
+                                             "host_IP": h.IP(),
+                                             "host_MAC": h.MAC()}
 
-                    mininet_host_nodes[sw].append(mininet_host_dict)
+                        mininet_host_nodes[sw].append(mininet_host_dict)
 
             with open(self.conf_path + "mininet_host_nodes.json", "w") as outfile:
                 json.dump(mininet_host_nodes, outfile, indent=4)
@@ -380,6 +432,23 @@ class NetworkConfiguration(object):
 
         return mininet_host_nodes
 
+    def get_offline_mininet_host_nodes(self):
+
+        '''
+        The hosts with the IP and MAC addresses that mininet gives them, numbering them in the order of the topology.
+        '''
+
+        mininet_host_nodes = dict((sw, []) for sw in self.topo.switches())
+
+        for i, h in enumerate(self.topo.hosts(), start=1):
+            sw = self.topo.ports[h][0][0]
+            mininet_host_nodes[sw].append({"host_switch_id": "s" + sw[1:],
+                                           "host_name": h,
+                                           "host_IP": ipAdd(i),
+                                           "host_MAC": macColonHex(i)})
+
+        return mininet_host_nodes
+
     def get_onos_host_nodes(self):
 
         if not self.load_config and self.save_config:
@@ -460,7 +529,10 @@ class NetworkConfiguration(object):
 
         if not self.load_config and self.save_config:
 
-            if self.controller == "ryu":
+            if self.offline:
+                pass
+
+            elif self.controller == "ryu":
                 self.cm = ControllerMan(controller=self.controller)
                 self.cm.start_controller()
                 time.sleep(5)
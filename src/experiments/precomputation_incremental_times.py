@@ -24,12 +24,16 @@ sys.path.append("./")
 class PrecomputationIncrementalTimes(Experiment):
     def __init__(self,
                  num_iterations,
-                 network_configurations):
+                 network_configurations,
+                 snapshot_dir=None):
 
         super(PrecomputationIncrementalTimes, self).__init__("precomputation_incremental_times", num_iterations)
 
         self.network_configurations = network_configurations
 
+        # Directory with the snapshots of the initialized port graphs, None to initialize them every time
+        self.snapshot_dir = snapshot_dir
+
         self.data = {
             "initial_time": defaultdict(defaultdict),
             "active_path_computation_time": defaultdict(defaultdict),
@@ -130,10 +134,12 @@ class PrecomputationIncrementalTimes(Experiment):
             self.data["active_path_computation_time"][nc.nc_topo_str][nhps] = []
             self.data["path_length"][nc.nc_topo_str][nhps] = []
 
+            # The snapshot is named after the network graph as parsed, so it is made before any iteration initializes it
+            fv = FlowValidator(nc.ng, snapshot_dir=self.snapshot_dir)
+
             for i in xrange(self.num_iterations):
                 print "iteration:", i + 1
 
-                fv = FlowValidator(nc.ng)
                 with Timer(verbose=True) as t:
                     fv.init_network_port_graph()
 
@@ -648,8 +654,9 @@ def main():
 
     num_iterations = 1
     num_hosts_per_switch_list = [12]#[6, 8]# [6, 8]#, 4, 6, 8, 10]
+    snapshot_dir = None
     network_configurations = prepare_network_configurations(num_hosts_per_switch_list)
-    exp = PrecomputationIncrementalTimes(num_iterations, network_configurations)
+    exp = PrecomputationIncrementalTimes(num_iterations, network_configurations, snapshot_dir=snapshot_dir)
 
     # Trigger the experiment
     exp.trigger()
@@ -115,13 +115,17 @@ class SecurityPolicyTimes(Experiment):
 
     def __init__(self,
                  nc_list,
-                 num_iterations):
+                 num_iterations,
+                 snapshot_dir=None):
 
         super(SecurityPolicyTimes, self).__init__("security_policy_times", 1)
 
         self.nc_list = nc_list
         self.num_iterations = num_iterations
 
+        # Directory with the snapshots of the initialized port graphs, None to initialize them every time
+        self.snapshot_dir = snapshot_dir
+
         self.data = {
             "initialization_time": defaultdict(defaultdict),
             "validation_time": defaultdict(defaultdict)
@@ -132,7 +136,7 @@ class SecurityPolicyTimes(Experiment):
         for nc in self.nc_list:
 
             with Timer(verbose=True) as t:
-                fv = FlowValidator(nc.ng)
+                fv = FlowValidator(nc.ng, snapshot_dir=self.snapshot_dir)
                 fv.init_network_port_graph()
 
             policy_statements = construct_security_policy_statements(nc)
@@ -385,8 +389,9 @@ def main():
     num_iterations = 1
     num_grids_list = [1]
     num_hosts_per_switch_list = [3]
+    snapshot_dir = None
     nc_list = prepare_network_configurations(num_grids_list, num_hosts_per_switch_list)
-    exp = SecurityPolicyTimes(nc_list, num_iterations)
+    exp = SecurityPolicyTimes(nc_list, num_iterations, snapshot_dir=snapshot_dir)
 
     # exp.trigger()
     # exp.dump_data()
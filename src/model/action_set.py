@@ -2,10 +2,12 @@ __author__ = 'Rakesh Kumar'
 
 import sys
 
-from intervaltree_modified import Interval, IntervalTree
+from intervaltree_modified import Interval
+from interval_set import IntervalSet
 
 from match import OdlMatchJsonParser
 from match import ryu_field_names_mapping
+from match import field_widths
 from collections import defaultdict
 
 
@@ -238,20 +240,41 @@ class ActionSet:
 
         # Capture the value before (in principle and after) the modification in a tuple
         for set_action in self.action_dict["set_field"]:
-            value_tree = IntervalTree([Interval(set_action.field_modified_to, set_action.field_modified_to + 1)])
+            value_tree = IntervalSet(field_widths[set_action.modified_field],
+                                     [Interval(set_action.field_modified_to, set_action.field_modified_to + 1)])
             modified_fields_dict[set_action.modified_field] = (flow_match_element, value_tree)
 
         if "push_vlan" in self.action_dict:
-            value_tree = IntervalTree([Interval(1, 2)])
+            value_tree = IntervalSet(field_widths["has_vlan_tag"], [Interval(1, 2)])
             modified_fields_dict["has_vlan_tag"] = (flow_match_element, value_tree)
 
         # A vlan tag popped means, the field does not matter anymore
         if "pop_vlan" in self.action_dict:
-            value_tree = IntervalTree([Interval(0, 1)])
+            value_tree = IntervalSet(field_widths["has_vlan_tag"], [Interval(0, 1)])
             modified_fields_dict["has_vlan_tag"] = (flow_match_element, value_tree)
 
         return modified_fields_dict
 
+    # The ports whose state the output action edges depend on, None if the edges depend on all of the ports
+    def get_output_action_edge_ports(self):
+
+        edge_ports = set()
+
+        for output_action in self.action_dict["output"]:
+
+            if int(self.sw.network_graph.OFPP_IN) == int(output_action.out_port):
+                return None
+
+            edge_ports.add(int(output_action.out_port))
+
+            # Failover actions also depend on the watch ports of all the buckets in their group
+            if output_action.is_failover_action():
+                for bucket in output_action.bucket.group.bucket_list:
+                    if bucket.watch_port:
+                        edge_ports.add(int(bucket.watch_port.port_number))
+
+        return edge_ports
+
     def get_action_set_output_action_edges(self, in_port_specified_in_match):
 
         port_graph_edges = []
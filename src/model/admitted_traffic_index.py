@@ -0,0 +1,125 @@
+__author__ = 'Rakesh Kumar'
+
+from bisect import bisect_right
+from match import field_names, field_widths
+from model.intervaltree_modified import Interval
+from model.traffic_element import TrafficElement
+
+
+def get_field_ranges(field):
+
+    # Wildcard fields are kept as just the one Interval
+    if isinstance(field, Interval):
+        return [(field.begin, field.end)]
+    else:
+        return TrafficElement.get_field_ranges(field)
+
+
+def is_field_ranges_wildcard(field_name, ranges):
+    return len(ranges) == 1 and ranges[0][0] <= 0 and ranges[0][1] >= 1 << field_widths[field_name]
+
+
+class TrafficElementIndex(object):
+
+    '''
+    Finds the traffic elements that have a concrete packet, or that overlap another traffic element, without
+    intersecting them one at a time. The values of each field are cut into segments by the beginnings and ends of the
+    ranges of that field in all of the elements, and each segment has a bitmask of the elements that have it. A lookup
+    is then a binary search in each field and an AND of the bitmasks found. Bit i of the masks is the i-th element.
+    '''
+
+    def __init__(self, traffic_elements):
+
+        self.elements_mask = (1 << len(traffic_elements)) - 1
+
+        # (field_name, boundaries, segment_masks) for the fields that are not wildcards in all of the elements
+        self.field_lookups = []
+
+        for field_name in field_names:
+            elements_ranges = [get_field_ranges(te.traffic_fields[field_name]) for te in traffic_elements]
+            if all(is_field_ranges_wildcard(field_name, ranges) for ranges in elements_ranges):
+                continue
+
+            boundaries = sorted(set(b for ranges in elements_ranges for r in ranges for b in r))
+
+            # Segment k has the values from boundaries[k - 1] up to boundaries[k]
+            segment_masks = [0] * (len(boundaries) + 1)
+            for i, ranges in enumerate(elements_ranges):
+                for begin, end in ranges:
+                    for k in xrange(bisect_right(boundaries, begin), bisect_right(boundaries, end)):
+                        segment_masks[k] |= 1 << i
+
+            self.field_lookups.append((field_name, boundaries, segment_masks))
+
+    def get_elements_mask(self, packet, in_port=None):
+
+        '''
+        :param packet: Gives the value of each field as packet[field_name]
+        :param in_port: If not None, used instead of the in_port of the packet
+        :return: Bitmask of the elements that have the packet
+        '''
+
+        elements_mask = self.elements_mask
+
+        for field_name, boundaries, segment_masks in self.field_lookups:
+            if field_name == "in_port" and in_port is not None:
+                value = in_port
+            else:
+                value = packet[field_name]
+
+            elements_mask &= segment_masks[bisect_right(boundaries, value)]
+            if not elements_mask:
+                break
+
+        return elements_mask
+
+    def get_overlapping_elements_mask(self, traffic_element):
+
+        '''
+        :return: Bitmask of the elements that have some of the traffic in traffic_element
+        '''
+
+        elements_mask = self.elements_mask
+
+        for field_name, boundaries, segment_masks in self.field_lookups:
+
+            ranges = get_field_ranges(traffic_element.traffic_fields[field_name])
+            if is_field_ranges_wildcard(field_name, ranges):
+                continue
+
+            field_mask = 0
+            for begin, end in ranges:
+                for k in xrange(bisect_right(boundaries, begin), bisect_right(boundaries, end - 1) + 1):
+                    field_mask |= segment_masks[k]
+
+            elements_mask &= field_mask
+            if not elements_mask:
+                break
+
+        return elements_mask
+
+
+class AdmittedTrafficIndex(TrafficElementIndex):
+
+    '''
+    Tells the succs via which a single concrete packet is admitted, out of the traffic elements admitted via each of
+    them.
+    '''
+
+    def __init__(self, traffic_elements, element_succs):
+
+        super(AdmittedTrafficIndex, self).__init__(traffic_elements)
+
+        self.succs = []
+        self.succ_masks = []
+        succ_indices = {}
+        for i, succ in enumerate(element_succs):
+            if succ not in succ_indices:
+                succ_indices[succ] = len(self.succs)
+                self.succs.append(succ)
+                self.succ_masks.append(0)
+            self.succ_masks[succ_indices[succ]] |= 1 << i
+
+    def get_succs(self, packet, in_port=None):
+        elements_mask = self.get_elements_mask(packet, in_port)
+        return [succ for succ, succ_mask in zip(self.succs, self.succ_masks) if elements_mask & succ_mask]
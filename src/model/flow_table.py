@@ -6,6 +6,7 @@ from port_graph_node import PortGraphNode
 from match import Match
 from traffic import Traffic, TrafficElement
 from instruction_set import InstructionSet
+from admitted_traffic_index import TrafficElementIndex
 
 
 class Flow:
@@ -51,6 +52,13 @@ class Flow:
         self.complement_traffic = Traffic()
         self.applied_traffic = None
 
+        # The traffic that makes it to this flow past the flows ahead of it, before the flow's own actions narrow
+        # applied_traffic down any further
+        self.table_applied_traffic = None
+
+        # Edges this flow contributes to its table's port graph edges, keyed by the succ node
+        self.port_graph_edges = defaultdict(list)
+
         self.traffic.add_traffic_elements([self.traffic_element])
         self.complement_traffic.add_traffic_elements(self.traffic_element.get_complement_traffic_elements())
 
@@ -106,6 +114,9 @@ class FlowTable:
         #  Sort the flows list by priority
         self.flows = sorted(self.flows, key=lambda flow: flow.priority, reverse=True)
 
+        self.current_port_graph_edges = None
+        self.flows_index = None
+
     def init_port_graph_state(self):
 
         for f in self.flows:
@@ -121,69 +132,208 @@ class FlowTable:
         # The key is the succ node, and the list contains edge contents
 
         self.current_port_graph_edges = None
+        self.flows_index = None
 
 
     def _get_port_graph_edges_dict(self):
         port_graph_edges = defaultdict(list)
 
-        remaining_traffic = Traffic(init_wildcard=True)
+        for position, flow in enumerate(self.flows):
 
-        for flow in self.flows:
+            self.compute_flow_port_graph_edges(flow, self.get_flow_applied_traffic(flow, position))
 
-            intersection = flow.traffic.intersect(remaining_traffic)
+            for succ in flow.port_graph_edges:
+                port_graph_edges[succ].extend(flow.port_graph_edges[succ])
 
-            if not intersection.is_empty():
+        return port_graph_edges
 
-                # See what is left after this rule is through
-                prev_remaining_traffic = remaining_traffic
-                remaining_traffic = flow.complement_traffic.intersect(remaining_traffic)
-                flow.applied_traffic = intersection
+    def compute_flow_port_graph_edges(self, flow, applied_traffic):
 
-                flow.get_port_graph_edges(port_graph_edges)
+        flow.port_graph_edges = defaultdict(list)
+        flow.table_applied_traffic = applied_traffic
 
-            else:
-                # Say that this flow does not matter
-                flow.applied_traffic = None
+        if not applied_traffic.is_empty():
+            flow.applied_traffic = applied_traffic
+            flow.get_port_graph_edges(flow.port_graph_edges)
+        else:
+            # Say that this flow does not matter
+            flow.applied_traffic = None
 
-        return port_graph_edges
+    # Index of the traffic of the flows in the table, by their position in self.flows
+    def get_flows_index(self):
+        if self.flows_index is None:
+            self.flows_index = TrafficElementIndex([flow.traffic_element for flow in self.flows])
+
+        return self.flows_index
+
+    # The traffic that makes it to the flow past the flows ahead of it in the table. Only the ones that overlap with
+    # the flow can take any of its traffic, so the others are not looked at.
+    def get_flow_applied_traffic(self, flow, position):
+
+        applied_traffic = flow.traffic
+
+        flows_ahead_mask = self.get_flows_index().get_overlapping_elements_mask(flow.traffic_element)
+        flows_ahead_mask &= (1 << position) - 1
+
+        while flows_ahead_mask and not applied_traffic.is_empty():
+            flow_ahead_bit = flows_ahead_mask & -flows_ahead_mask
+            flows_ahead_mask ^= flow_ahead_bit
+
+            flow_ahead = self.flows[flow_ahead_bit.bit_length() - 1]
+            applied_traffic = flow_ahead.complement_traffic.intersect(applied_traffic)
+
+        return applied_traffic
 
     def compute_flow_table_port_graph_edges(self):
         self.current_port_graph_edges = self._get_port_graph_edges_dict()
 
-    def update_port_graph_edges(self):
+    # Whether the port graph edges of the flow can change when the port port_num changes state
+    def is_flow_port_graph_edges_port(self, flow, port_num):
+
+        # Flows with no traffic or no instructions have no edges, whatever the state of the ports
+        if flow.applied_traffic is None or not flow.instruction_set:
+            return False
+
+        edge_ports = flow.instruction_set.get_port_graph_edge_ports()
+        return edge_ports is None or int(port_num) in edge_ports
+
+    def update_port_graph_edges(self, port_num=None):
+
+        '''
+
+        Update the port graph edges after the port port_num changed state. The traffic that makes it to each flow does
+        not depend on the state of the ports, only the edges that a flow's actions output to do, so only the flows with
+        actions that output to the port, or that are in a failover group watching it, are looked at again. An edge is
+        reported as modified only if the edge contents for its succ are now different.
+
+        :param port_num: The port that changed state, if None then the edges of all the flows are computed again
+        :return: List of modified edges (pred, succ)
+        '''
+
+        modified_succs = set()
+
+        for position, flow in enumerate(self.flows):
+
+            prev_flow_port_graph_edges = flow.port_graph_edges
+
+            if port_num is None:
+                self.compute_flow_port_graph_edges(flow, self.get_flow_applied_traffic(flow, position))
+            elif self.is_flow_port_graph_edges_port(flow, port_num):
+                self.compute_flow_port_graph_edges(flow, flow.table_applied_traffic)
+            else:
+                continue
 
-        modified_keys = []
-        modified_edges = []
+            for succ in set(prev_flow_port_graph_edges) | set(flow.port_graph_edges):
+                if prev_flow_port_graph_edges.get(succ, []) != flow.port_graph_edges.get(succ, []):
+                    modified_succs.add(succ)
 
-        # Compute what these edges would look like now.
-        new_port_graph_edges = self._get_port_graph_edges_dict()
+        self.update_succ_port_graph_edges(modified_succs)
 
-        # Compare where the differences are return the edges that got affected
-        # This ought to be a three prong comparison
+        return sorted((self.port_graph_node.node_id, succ.node_id) for succ in modified_succs)
 
-        self.set_new = set(new_port_graph_edges.keys())
-        self.set_current = set(self.current_port_graph_edges.keys())
+    # Put together the edges to the given succs from the flows' edges, in the order of the flows
+    def update_succ_port_graph_edges(self, succs):
 
-        self.intersect = self.set_new.intersection(self.set_current)
+        for succ in succs:
+            succ_port_graph_edges = []
+            for flow in self.flows:
+                if succ in flow.port_graph_edges:
+                    succ_port_graph_edges.extend(flow.port_graph_edges[succ])
 
-        # 1. The edges that existed previously and now don't
-        modified_keys.extend((self.set_current - self.intersect))
+            if succ_port_graph_edges:
+                self.current_port_graph_edges[succ] = succ_port_graph_edges
+            elif succ in self.current_port_graph_edges:
+                del self.current_port_graph_edges[succ]
 
-        # 2. The edges that did not exist previously but now do.
-        modified_keys.extend((self.set_new - self.intersect))
+    def update_flow_port_graph_edges(self, start, removed_flows, added_flows):
 
-        # 3. The edges that existed previously and now do as well
-        # TODO: but the contents of traffic filters/modifications
-        modified_values = [k for k in self.intersect if len(new_port_graph_edges[k]) != len(self.current_port_graph_edges[k])]
+        '''
 
-        modified_keys.extend(modified_values)
+        Update the port graph edges after the flows were removed/added at position start and onwards in the table.
+        Only the added flows and the ones after start that overlap with the traffic of the removed/added flows
+        can end up with different applied traffic, so only their edges are computed again.
 
-        # Set the flow table's port graph edges to now modified ones
-        if modified_keys:
-            self.current_port_graph_edges = new_port_graph_edges
-            modified_edges = [(self.port_graph_node.node_id, k.node_id) for k in modified_keys]
+        :param start: Position of the first change in self.flows
+        :param removed_flows: Flows that were taken out of the table
+        :param added_flows: Flows that were put in the table
+        :return: List of modified edges (pred, succ) in the same form as update_port_graph_edges
+        '''
+
+        # The positions of the flows in the table have changed
+        self.flows_index = None
+
+        # Nothing to update before the switch port graph is initialized
+        if self.current_port_graph_edges is None:
+            return []
+
+        for flow in added_flows:
+            flow.init_port_graph_state()
+
+        flows_index = self.get_flows_index()
+        changed_flows_mask = 0
+        for flow in removed_flows + added_flows:
+            changed_flows_mask |= flows_index.get_overlapping_elements_mask(flow.traffic_element)
+
+        modified_succs = set()
+        for flow in removed_flows:
+            modified_succs.update(flow.port_graph_edges)
+
+        for position in xrange(start, len(self.flows)):
+            flow = self.flows[position]
+
+            if not changed_flows_mask & (1 << position):
+                continue
+
+            modified_succs.update(flow.port_graph_edges)
+            self.compute_flow_port_graph_edges(flow, self.get_flow_applied_traffic(flow, position))
+            modified_succs.update(flow.port_graph_edges)
+
+        self.update_succ_port_graph_edges(modified_succs)
+
+        return sorted((self.port_graph_node.node_id, succ.node_id) for succ in modified_succs)
+
+    # Position of a new flow in the table: after all the flows of higher or the same priority
+    def get_flow_position(self, flow):
+
+        position = 0
+        while position < len(self.flows) and self.flows[position].priority >= flow.priority:
+            position += 1
+
+        return position
+
+    def add_flow(self, flow_raw):
+
+        flow = Flow(self.sw, self, flow_raw)
+
+        position = self.get_flow_position(flow)
+        self.flows.insert(position, flow)
+
+        return flow, self.update_flow_port_graph_edges(position, [], [flow])
+
+    def remove_flow(self, flow):
+
+        position = self.flows.index(flow)
+        del self.flows[position]
+        self.network_graph.total_flow_rules -= 1
+
+        return self.update_flow_port_graph_edges(position, [flow], [])
+
+    def modify_flow(self, flow, flow_raw):
+
+        old_position = self.flows.index(flow)
+        del self.flows[old_position]
+        self.network_graph.total_flow_rules -= 1
+
+        new_flow = Flow(self.sw, self, flow_raw)
+
+        # Keep the place of the flow in the table unless its priority changed
+        if new_flow.priority == flow.priority:
+            position = old_position
+        else:
+            position = self.get_flow_position(new_flow)
+        self.flows.insert(position, new_flow)
 
-        return modified_edges
+        return new_flow, self.update_flow_port_graph_edges(min(old_position, position), [flow], [new_flow])
 
     def de_init_flow_table_port_graph(self):
         pass
\ No newline at end of file
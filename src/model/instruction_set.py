@@ -190,6 +190,17 @@ class InstructionSet:
             # TODO: Handle meter instruction
             # TODO: Write meta-data case
 
+    # The ports whose state the port graph edges depend on, None if they depend on all of the ports
+    def get_port_graph_edge_ports(self):
+
+        applied_edge_ports = self.applied_action_set.get_output_action_edge_ports()
+        written_edge_ports = self.written_action_set.get_output_action_edge_ports()
+
+        if applied_edge_ports is None or written_edge_ports is None:
+            return None
+
+        return applied_edge_ports | written_edge_ports
+
     def get_applied_port_graph_edges(self):
 
         applied_port_graph_edges = []
@@ -0,0 +1,196 @@
+__author__ = 'Rakesh Kumar'
+
+import sys
+
+from bisect import bisect_left, bisect_right
+from intervaltree_modified import Interval
+
+
+class IntervalSet(object):
+
+    '''
+    A set of values of a single header field with a fixed bit width, kept as a sorted tuple of the boundaries of
+    disjoint, non-adjacent intervals: (begin_0, end_0, begin_1, end_1, ...). Almost every field holds one or two
+    intervals, so all the operations are done by a merge over the sorted tuples in O(n + m) instead of maintaining a
+    balanced tree.
+
+    It is a drop-in replacement for the IntervalTree as a value of a field in a TrafficElement and
+    supports the same subset of its interface (add, chop, clear, copy, search, is_empty, iteration over Intervals).
+    '''
+
+    __slots__ = ('width', 'bounds')
+
+    def __init__(self, width, intervals=None):
+
+        self.width = width
+        self.bounds = ()
+
+        if intervals:
+            self.bounds = self.merge_ranges([(iv.begin, iv.end) for iv in intervals])
+
+    @property
+    def max_value(self):
+        return 1 << self.width
+
+    # Takes a list of (begin, end) tuples, returns the bounds of the sorted, disjoint, non-adjacent ranges that
+    # cover the same values, clipped to the width
+    def merge_ranges(self, ranges):
+
+        bounds = []
+        max_value = self.max_value
+
+        for begin, end in sorted(ranges):
+            if begin < 0:
+                begin = 0
+            if end > max_value:
+                end = max_value
+            if begin >= end:
+                continue
+
+            if bounds and begin <= bounds[-1]:
+                if end > bounds[-1]:
+                    bounds[-1] = end
+            else:
+                bounds.append(begin)
+                bounds.append(end)
+
+        return tuple(bounds)
+
+    def get_ranges(self):
+        bounds = self.bounds
+        return [(bounds[i], bounds[i + 1]) for i in xrange(0, len(bounds), 2)]
+
+    def __iter__(self):
+        for begin, end in self.get_ranges():
+            yield Interval(begin, end)
+
+    def __len__(self):
+        return len(self.bounds) / 2
+
+    def __nonzero__(self):
+        return len(self.bounds) > 0
+
+    def __contains__(self, interval):
+
+        # True if all the values in the interval are in this field. An even index is the begin of a range.
+        i = bisect_right(self.bounds, interval.begin) - 1
+        return i >= 0 and i % 2 == 0 and interval.end <= self.bounds[i + 1]
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.width == other.width and self.bounds == other.bounds
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.width, self.bounds))
+
+    # Pickled as just a tuple, these are sent around a lot in pickles between processes
+    def __getstate__(self):
+        return self.width, self.bounds
+
+    def __setstate__(self, state):
+        self.width, self.bounds = state
+
+    def __str__(self):
+        return "IntervalSet(" + str(self.get_ranges()) + ")"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def is_empty(self):
+        return len(self.bounds) == 0
+
+    def copy(self):
+        field_copy = IntervalSet(self.width)
+        field_copy.bounds = self.bounds
+        return field_copy
+
+    def clear(self):
+        self.bounds = ()
+
+    def add(self, interval):
+        self.bounds = self.merge_ranges(self.get_ranges() + [(interval.begin, interval.end)])
+
+    def chop(self, begin, end):
+
+        remaining = []
+
+        for r_begin, r_end in self.get_ranges():
+            if r_end <= begin or end <= r_begin:
+                remaining.append(r_begin)
+                remaining.append(r_end)
+            else:
+                if r_begin < begin:
+                    remaining.append(r_begin)
+                    remaining.append(begin)
+                if end < r_end:
+                    remaining.append(end)
+                    remaining.append(r_end)
+
+        self.bounds = tuple(remaining)
+
+    def search(self, begin, end=None):
+
+        if end is None:
+            end = begin + 1
+
+        # Pick the ranges from the first one that ends after begin to the last one that begins before end
+        lo = bisect_right(self.bounds, begin)
+        lo -= lo % 2
+        hi = bisect_left(self.bounds, end)
+        hi += hi % 2
+
+        return set(Interval(self.bounds[i], self.bounds[i + 1]) for i in xrange(lo, hi, 2))
+
+    def complement(self):
+
+        # The boundaries of the gaps are the same ones, with 0 and max_value added at the ends (if not already there)
+        bounds = (0,) + self.bounds + (self.max_value,)
+        if bounds[0] == bounds[1]:
+            bounds = bounds[2:]
+        if bounds and bounds[-1] == bounds[-2]:
+            bounds = bounds[:-2]
+
+        complement_field = IntervalSet(self.width)
+        complement_field.bounds = bounds
+        return complement_field
+
+    def intersect(self, other):
+
+        intersection = []
+
+        a = self.bounds
+        b = other.bounds
+        i = 0
+        j = 0
+        while i < len(a) and j < len(b):
+
+            begin = a[i] if a[i] > b[j] else b[j]
+            end = a[i + 1] if a[i + 1] < b[j + 1] else b[j + 1]
+
+            if begin < end:
+                intersection.append(begin)
+                intersection.append(end)
+
+            # Move past whichever one ends first
+            if a[i + 1] < b[j + 1]:
+                i += 2
+            else:
+                j += 2
+
+        intersection_field = IntervalSet(self.width)
+        intersection_field.bounds = tuple(intersection)
+        return intersection_field
+
+    def num_values(self):
+        return sum(end - begin for begin, end in self.get_ranges())
+
+    @staticmethod
+    def from_field(width, field):
+
+        # The wildcard is a bare Interval, anything else is a collection of Intervals
+        if isinstance(field, Interval):
+            return IntervalSet(width, [Interval(0, sys.maxsize)])
+        else:
+            return IntervalSet(width, field)
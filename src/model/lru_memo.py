@@ -0,0 +1,49 @@
+__author__ = 'Rakesh Kumar'
+
+from collections import OrderedDict
+
+
+class LRUMemo(object):
+
+    '''
+    Memo table that keeps at most max_size results, when it is full the least recently used result is dropped.
+    Setting max_size to 0 (or None) turns it off.
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Returns a (found, value) tuple, as None is a perfectly good value to memoize
+    def lookup(self, key):
+
+        if key in self.entries:
+            value = self.entries.pop(key)
+            self.entries[key] = value
+            self.hits += 1
+            return True, value
+
+        self.misses += 1
+        return False, None
+
+    def store(self, key, value):
+
+        if not self.max_size:
+            return
+
+        if key in self.entries:
+            del self.entries[key]
+        elif len(self.entries) >= self.max_size:
+            self.entries.popitem(last=False)
+
+        self.entries[key] = value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
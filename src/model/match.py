@@ -19,6 +19,21 @@ field_names = ["in_port",
                "vlan_id",
                "has_vlan_tag"]
 
+# Number of bits needed to hold the values of each field, vlan_id carries the OFPVID_PRESENT bit (0x1000)
+field_widths = {"in_port": 32,
+                "ethernet_type": 16,
+                "ethernet_source": 48,
+                "ethernet_destination": 48,
+                "src_ip_addr": 32,
+                "dst_ip_addr": 32,
+                "ip_protocol": 8,
+                "tcp_destination_port": 16,
+                "tcp_source_port": 16,
+                "udp_destination_port": 16,
+                "udp_source_port": 16,
+                "vlan_id": 13,
+                "has_vlan_tag": 1}
+
 ryu_field_names_mapping = {"in_port": "in_port",
                            "eth_type": "ethernet_type",
                            "eth_src": "ethernet_source",
@@ -402,8 +417,7 @@ class Match(DictMixin):
                     # print "self[field_name]:", self[field_name]
                     mac_hex_str = hex(self[field_name])[2:]
                     # print "mac_hex_str:", mac_hex_str
-                    if len(mac_hex_str) == 11:
-                        mac_hex_str = "0" + mac_hex_str
+                    mac_hex_str = mac_hex_str.zfill(12)
 
                     mac_hex_str = unicode(':'.join(s.encode('hex') for s in mac_hex_str.decode('hex')))
                     match_raw[ryu_field_names_mapping_reverse[field_name]] = mac_hex_str
@@ -93,6 +93,11 @@ class NetworkGraph(object):
         self.host_ids = set()
         self.switch_ids = []
 
+        # The ids of the ports that are down, and a counter that is bumped whenever the port graphs change in other
+        # ways (links added/removed, flows changed). As long as both stay the same, so do the paths in the port graphs.
+        self.down_port_ids = set()
+        self.port_state_epoch = 0
+
         self.L = []
 
     def onos_sw_device_id_to_node_id_mapping(self, onos_node_id):
@@ -313,6 +318,7 @@ class NetworkGraph(object):
             raise Exception("Unknown Link Type")
 
         link_data = NetworkGraphLinkData(self, node1_id, node1_port, node2_id, node2_port, link_type)
+        self.port_state_epoch += 1
 
         self.graph.add_edge(node1_id,
                             node2_id,
@@ -328,6 +334,7 @@ class NetworkGraph(object):
     def remove_link(self, node1_id, node1_port, node2_id, node2_port):
 
         self.graph.remove_edge(node1_id, node2_id)
+        self.port_state_epoch += 1
 
         if self.graph.node[node1_id]["node_type"] == "switch":
             self.graph.node[node1_id]["sw"].ports[node1_port].state = "down"
@@ -465,6 +472,9 @@ class NetworkGraph(object):
         self.parse_host_nodes(hosts)
         self.parse_links(links)
 
+    def get_port_state_key(self):
+        return self.port_state_epoch, frozenset(self.down_port_ids)
+
     def get_node_graph(self):
         return self.graph
 
@@ -1,11 +1,42 @@
 __author__ = 'Rakesh Kumar'
 
+import multiprocessing
+
 from port_graph import PortGraph
 from switch_port_graph import SwitchPortGraph
 from port_graph_edge import PortGraphEdge, NetworkPortGraphEdgeData
 from traffic import Traffic
+from switch import Switch
+from host import Host
+from network_graph import NetworkGraph
+from object_registry import ObjectRegistry, get_model_objects
 from experiments.timer import Timer
 
+# The network port graph and the registry of its objects, as seen by the processes of the pools used during the
+# initialization. It is set before a pool is started, so the processes get it as they are forked.
+pool_context = None
+
+
+def compute_sw_transfer_function_in_pool(sw_id):
+
+    npg, registry = pool_context
+    sw = npg.network_graph.get_node_object(sw_id)
+
+    snapshot = registry.get_state_snapshot(get_model_objects(sw, (NetworkGraph, Switch, Host)))
+    sw_transfer_function_edges = npg.compute_sw_transfer_function(sw)
+
+    return registry.dumps((registry.get_state_changes(snapshot), sw_transfer_function_edges))
+
+
+def compute_network_admitted_traffic_for_sw_in_pool(sw_id):
+
+    npg, registry = pool_context
+    sw = npg.network_graph.get_node_object(sw_id)
+
+    npg.init_network_admitted_traffic_for_sw(sw)
+
+    return registry.dumps(npg.get_dsts_admitted_traffic(npg.get_sw_dsts(sw)))
+
 
 class NetworkPortGraph(PortGraph):
 
@@ -13,6 +44,30 @@ class NetworkPortGraph(PortGraph):
 
         super(NetworkPortGraph, self).__init__(network_graph)
 
+        # Switches whose dsts have their admitted traffic computed, None when it is computed for all of them up front
+        self.admitted_traffic_sw_ids = None
+
+    def init_lazy_dst_admitted_traffic(self, dst):
+
+        if self.admitted_traffic_sw_ids is None or dst.sw.node_id in self.admitted_traffic_sw_ids:
+            return
+
+        # Marked first, the propagation itself looks up the admitted traffic for dst
+        self.admitted_traffic_sw_ids.add(dst.sw.node_id)
+        self.init_network_admitted_traffic_for_sw(dst.sw)
+
+    def get_admitted_traffic(self, node, dst):
+        self.init_lazy_dst_admitted_traffic(dst)
+        return super(NetworkPortGraph, self).get_admitted_traffic(node, dst)
+
+    def get_admitted_traffic_via_succ(self, node, dst, succ):
+        self.init_lazy_dst_admitted_traffic(dst)
+        return super(NetworkPortGraph, self).get_admitted_traffic_via_succ(node, dst, succ)
+
+    def get_admitted_traffic_succs(self, node, dst):
+        self.init_lazy_dst_admitted_traffic(dst)
+        return super(NetworkPortGraph, self).get_admitted_traffic_succs(node, dst)
+
     def get_edge_from_admitted_traffic(self, pred, succ, admitted_traffic, edge_sw=None, exclude_inactive=False):
 
         edge = PortGraphEdge(pred, succ)
@@ -65,25 +120,22 @@ class NetworkPortGraph(PortGraph):
             self.add_node(sw.ports[port].network_port_graph_egress_node)
             self.add_node(sw.ports[port].network_port_graph_ingress_node)
 
-    def add_sw_transfer_function(self, sw):
+    def compute_sw_transfer_function(self, sw):
 
         '''
 
-        Add nodes to the port graph that belong to its ports that are not connected to hosts.
-        Add edges from the switch port graph for the nodes that correspond to ports not connected to hosts
+        Compute the switch port graph and its admitted traffic.
 
         :param sw: Switch concerned
-        :return: None
+        :return: List of (pred, succ, edge) for the edges of the port graph between ports not connected to hosts
         '''
 
         sw.port_graph = SwitchPortGraph(sw.network_graph, sw)
         sw.port_graph.init_switch_port_graph()
         sw.port_graph.init_switch_admitted_traffic()
 
-        for port in sw.non_host_port_iter():
-            self.add_node(port.network_port_graph_egress_node)
-            self.add_node(port.network_port_graph_ingress_node)
-            
+        sw_transfer_function_edges = []
+
         for src_port in sw.non_host_port_iter():
             for dst_port in sw.non_host_port_iter():
                 pred = src_port.switch_port_graph_ingress_node
@@ -93,7 +145,77 @@ class NetworkPortGraph(PortGraph):
 
                 if not at.is_empty():
                     edge_obj = self.get_edge_from_admitted_traffic(pred, succ, at, edge_sw=sw)
-                    self.add_edge(pred, succ, edge_obj)
+                    sw_transfer_function_edges.append((pred, succ, edge_obj))
+
+        return sw_transfer_function_edges
+
+    def add_sw_transfer_function_edges(self, sw, sw_transfer_function_edges):
+
+        for port in sw.non_host_port_iter():
+            self.add_node(port.network_port_graph_egress_node)
+            self.add_node(port.network_port_graph_ingress_node)
+
+        for pred, succ, edge_obj in sw_transfer_function_edges:
+            self.add_edge(pred, succ, edge_obj)
+
+    def add_sw_transfer_function(self, sw):
+
+        '''
+
+        Add nodes to the port graph that belong to its ports that are not connected to hosts.
+        Add edges from the switch port graph for the nodes that correspond to ports not connected to hosts
+
+        :param sw: Switch concerned
+        :return: None
+        '''
+
+        sw_transfer_function_edges = self.compute_sw_transfer_function(sw)
+        self.add_sw_transfer_function_edges(sw, sw_transfer_function_edges)
+
+    def add_sw_transfer_functions_in_pool(self, switches, num_processes):
+
+        '''
+
+        Compute the switch transfer functions in a pool of forked processes, each switch only touches its own objects.
+        The changes to those objects (and the edges) come back pickled, with the objects that already existed
+        before the fork referred to by their number in an ObjectRegistry, and are applied here in the switch order.
+
+        :param switches: Switches concerned
+        :param num_processes: Number of processes in the pool
+        :return: None
+        '''
+
+        # What an earlier initialization left on the ports refers to the objects of the other switches, which the
+        # processes replace as they go. Started over like init_switch_port_graph does, each switch only reaches its own.
+        for sw in switches:
+            sw.port_graph = None
+            for port in sw.ports.values():
+                port.init_port_graph_state()
+
+        registry = ObjectRegistry(self.network_graph)
+        results = self.map_in_pool(registry, compute_sw_transfer_function_in_pool,
+                                   [sw.node_id for sw in switches], num_processes)
+
+        for sw, result in zip(switches, results):
+            state_changes, sw_transfer_function_edges = registry.loads(result)
+            registry.apply_state_changes(state_changes)
+            self.add_sw_transfer_function_edges(sw, sw_transfer_function_edges)
+
+    def map_in_pool(self, registry, func, args, num_processes):
+
+        global pool_context
+
+        pool_context = (self, registry)
+
+        pool = multiprocessing.Pool(num_processes)
+        try:
+            results = pool.map(func, args, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+            pool_context = None
+
+        return results
 
     def add_switch_edges(self, sw, port_numbers):
 
@@ -107,28 +229,73 @@ class NetworkPortGraph(PortGraph):
                 edge_obj = self.get_edge_from_admitted_traffic(pred, succ, admitted_traffic, edge_sw=sw)
                 self.add_edge(pred, succ, edge_obj)
 
+    # Two edges admit the same traffic if they have the same filters with the same modifications, in the same order
+    def is_equal_edge_traffic(self, edge, other_edge):
+
+        if len(edge.edge_data_list) != len(other_edge.edge_data_list):
+            return False
+
+        for ed, other_ed in zip(edge.edge_data_list, other_edge.edge_data_list):
+            if not ed.edge_filter_traffic.is_equal_traffic(other_ed.edge_filter_traffic):
+                return False
+            if ed.applied_modifications != other_ed.applied_modifications:
+                return False
+
+        return True
+
     def modify_switch_transfer_edges(self, sw, modified_switch_edges):
 
+        '''
+
+        Build the edges through the switch again from its admitted traffic. When an edge admits the same traffic as
+        before, only the paths through the switch behind it have changed, so its edge data is kept with the new paths
+        and the admitted traffic that was computed using it stays as it is.
+
+        :param sw: Switch concerned
+        :param modified_switch_edges: List of modified edges (pred, succ) through the switch
+        :return: List of the modified edges that now admit different traffic
+        '''
+
+        traffic_modified_edges = []
+        seen_edges = set()
+
         for modified_edge in modified_switch_edges:
 
+            if modified_edge in seen_edges:
+                continue
+            seen_edges.add(modified_edge)
+
             pred = sw.port_graph.get_node(modified_edge[0])
             succ = sw.port_graph.get_node(modified_edge[1])
 
-            # First remove the edge
+            admitted_traffic = sw.port_graph.get_admitted_traffic(pred, succ)
+            edge_obj = self.get_edge_from_admitted_traffic(pred, succ, admitted_traffic, edge_sw=sw)
+
             edge = self.get_edge(pred, succ)
             if edge:
+                if self.is_equal_edge_traffic(edge, edge_obj):
+                    for ed, new_ed in zip(edge.edge_data_list, edge_obj.edge_data_list):
+                        ed.switch_port_graph_paths = new_ed.switch_port_graph_paths
+                    continue
+
                 self.remove_edge(pred, succ)
 
-            # Then, add the edge back by using the new transfer traffic now
-            admitted_traffic = sw.port_graph.get_admitted_traffic(pred, succ)
-            edge_obj = self.get_edge_from_admitted_traffic(pred, succ, admitted_traffic, edge_sw=sw)
             self.add_edge(pred, succ, edge_obj)
+            traffic_modified_edges.append(modified_edge)
+
+        return traffic_modified_edges
 
-    def init_network_port_graph(self):
+    def init_network_port_graph(self, num_processes=1):
+
+        self.network_graph.port_state_epoch += 1
 
         # Iterate through switches and add the ports and relevant abstract analysis
-        for sw in self.network_graph.get_switches():
-            self.add_sw_transfer_function(sw)
+        switches = list(self.network_graph.get_switches())
+        if num_processes > 1 and len(switches) > 1:
+            self.add_sw_transfer_functions_in_pool(switches, num_processes)
+        else:
+            for sw in switches:
+                self.add_sw_transfer_function(sw)
 
         # Add edges between ports on node edges, where nodes are only switches.
         for node_edge in self.network_graph.graph.edges():
@@ -146,33 +313,197 @@ class NetworkPortGraph(PortGraph):
         for sw in self.network_graph.get_switches():
             sw.port_graph.de_init_switch_port_graph()
 
+    def get_admitted_host_traffic(self, sw, non_host_port):
+
+        # Accumulate traffic that is admitted for each host
+        admitted_host_traffic = Traffic()
+        for host_port in sw.host_port_iter():
+            at = sw.port_graph.get_admitted_traffic(non_host_port.switch_port_graph_ingress_node,
+                                                    host_port.switch_port_graph_egress_node)
+            admitted_host_traffic.union(at)
+
+        return admitted_host_traffic
+
     def init_network_admitted_traffic_for_sw(self, sw):
+
+        non_host_ports = list(sw.non_host_port_iter())
+
+        changes = []
+        for non_host_port in non_host_ports:
+            changes.append((non_host_port.network_port_graph_ingress_node,
+                            self.get_admitted_host_traffic(sw, non_host_port),
+                            None,
+                            non_host_port.network_port_graph_ingress_node))
+
+        end_to_end_modified_edges = []
+        self.propagate_admitted_traffic_changes(changes, end_to_end_modified_edges)
+
+        for non_host_port, change in zip(non_host_ports, changes):
+            admitted_host_traffic = change[1]
+            admitted_host_traffic.set_field("in_port", int(non_host_port.port_number))
+
+    def update_network_admitted_traffic_for_sw(self, sw, end_to_end_modified_edges):
+
+        # Nothing to update if the admitted traffic for the switch's dsts has not been computed yet
+        if self.admitted_traffic_sw_ids is not None and sw.node_id not in self.admitted_traffic_sw_ids:
+            return
+
+        # Only the ports where the traffic admitted for the hosts has changed need it propagated again
+        non_host_ports = []
         for non_host_port in sw.non_host_port_iter():
+            dst = non_host_port.network_port_graph_ingress_node
 
-            # Accumulate traffic that is admitted for each host
-            admitted_host_traffic = Traffic()
-            for host_port in sw.host_port_iter():
-                at = sw.port_graph.get_admitted_traffic(non_host_port.switch_port_graph_ingress_node,
-                                                        host_port.switch_port_graph_egress_node)
-                admitted_host_traffic.union(at)
+            admitted_host_traffic = self.get_admitted_host_traffic(sw, non_host_port)
+            admitted_host_traffic.set_field("in_port", int(non_host_port.port_number))
 
-            end_to_end_modified_edges = []
-            self.propagate_admitted_traffic(non_host_port.network_port_graph_ingress_node,
-                                            admitted_host_traffic,
-                                            None,
-                                            non_host_port.network_port_graph_ingress_node,
-                                            end_to_end_modified_edges)
+            if not admitted_host_traffic.is_equal_traffic(self.get_admitted_traffic_via_succ(dst, dst, None)):
+                non_host_ports.append(non_host_port)
 
+        changes = []
+        for non_host_port in non_host_ports:
+            changes.append((non_host_port.network_port_graph_ingress_node,
+                            self.get_admitted_host_traffic(sw, non_host_port),
+                            None,
+                            non_host_port.network_port_graph_ingress_node))
+
+        self.propagate_admitted_traffic_changes(changes, end_to_end_modified_edges)
+
+        for non_host_port, change in zip(non_host_ports, changes):
+            admitted_host_traffic = change[1]
             admitted_host_traffic.set_field("in_port", int(non_host_port.port_number))
 
-    def init_network_admitted_traffic(self):
+    def update_admitted_traffic_due_to_flow_table_change(self, flow_table, modified_flow_table_edges):
+
+        end_to_end_modified_edges = []
+
+        sw = flow_table.sw
+        if sw.port_graph is None:
+            return end_to_end_modified_edges
+
+        self.network_graph.port_state_epoch += 1
+
+        # Update admitted traffic due to switch transfer function changes
+        modified_switch_edges = sw.port_graph.update_admitted_traffic_due_to_flow_table_change(flow_table,
+                                                                                               modified_flow_table_edges)
+        modified_switch_edges = self.filter_modified_edges(modified_switch_edges)
+
+        modified_switch_edges = self.modify_switch_transfer_edges(sw, modified_switch_edges)
+        self.update_admitted_traffic(modified_switch_edges, end_to_end_modified_edges)
+
+        # The traffic the switch lets through to its hosts may have changed as well
+        self.update_network_admitted_traffic_for_sw(sw, end_to_end_modified_edges)
+
+        return end_to_end_modified_edges
+
+    def add_flow(self, sw_id, table_id, flow_raw):
+
+        '''
+
+        Add a flow to a switch's flow table and update the port graphs and the admitted traffic to reflect it.
+
+        :param sw_id: Switch concerned
+        :param table_id: Table the flow goes in
+        :param flow_raw: Flow in the same form as the controller's flows that the network graph was parsed from
+        :return: The new Flow object
+        '''
+
+        sw = self.network_graph.get_node_object(sw_id)
+        flow_table = self.get_flow_table(sw, table_id)
+
+        flow, modified_flow_table_edges = flow_table.add_flow(flow_raw)
+        self.update_admitted_traffic_due_to_flow_table_change(flow_table, modified_flow_table_edges)
+
+        return flow
+
+    def remove_flow(self, flow):
+
+        modified_flow_table_edges = flow.flow_table.remove_flow(flow)
+        self.update_admitted_traffic_due_to_flow_table_change(flow.flow_table, modified_flow_table_edges)
+
+    def modify_flow(self, flow, flow_raw):
+
+        new_flow, modified_flow_table_edges = flow.flow_table.modify_flow(flow, flow_raw)
+        self.update_admitted_traffic_due_to_flow_table_change(flow.flow_table, modified_flow_table_edges)
+
+        return new_flow
+
+    def get_flow_table(self, sw, table_id):
+
+        for flow_table in sw.flow_tables:
+            if str(flow_table.table_id) == str(table_id):
+                return flow_table
+
+        raise Exception("Switch " + sw.node_id + " does not have flow table: " + str(table_id))
+
+    # The destinations of the traffic admitted by init_network_admitted_traffic_for_sw
+    def get_sw_dsts(self, sw):
+        return [non_host_port.network_port_graph_ingress_node for non_host_port in sw.non_host_port_iter()]
+
+    # Returns (node, dst, admitted traffic per succ) for all the nodes that admit traffic for any of the dsts
+    def get_dsts_admitted_traffic(self, dsts):
+
+        dsts_admitted_traffic = []
+        for node_id in self.g.nodes():
+            node = self.get_node(node_id)
+            for dst in dsts:
+                if dst in node.admitted_traffic:
+                    dsts_admitted_traffic.append((node, dst, node.admitted_traffic[dst]))
+
+        return dsts_admitted_traffic
+
+    def init_network_admitted_traffic_in_pool(self, switches, num_processes):
+
+        '''
+
+        Compute the admitted traffic for the destinations at each switch in a pool of forked processes. The admitted
+        traffic is kept per destination, and the propagation for a destination only reads the port graph and writes
+        the admitted traffic for that destination, so the processes do not get in each other's way. The admitted
+        traffic for the destinations of each switch comes back pickled and is put in place here in the switch order.
+
+        :param switches: Switches concerned
+        :param num_processes: Number of processes in the pool
+        :return: None
+        '''
+
+        registry = ObjectRegistry(self)
+        results = self.map_in_pool(registry, compute_network_admitted_traffic_for_sw_in_pool,
+                                   [sw.node_id for sw in switches], num_processes)
+
+        for result in results:
+            for node, dst, dst_admitted_traffic in registry.loads(result):
+                node.admitted_traffic[dst] = dst_admitted_traffic
+
+    def init_network_admitted_traffic(self, num_processes=1, lazy=False):
+
+        '''
+
+        Compute the admitted traffic for the dsts at all the switches. If lazy, the admitted traffic for the dsts at a
+        switch is instead computed the first time that the admitted traffic for one of them is looked up, and from
+        then on it is kept up to date like the rest.
+
+        :param num_processes: Number of processes to compute it in
+        :param lazy: Whether to wait until the admitted traffic for each switch's dsts is needed
+        :return: None
+        '''
+
+        if lazy:
+            self.admitted_traffic_sw_ids = set()
+            return
+
+        self.admitted_traffic_sw_ids = None
 
         # Go to each switch and find the ports that connects to other switches
-        for sw in self.network_graph.get_switches():
-            self.init_network_admitted_traffic_for_sw(sw)
+        switches = list(self.network_graph.get_switches())
+        if num_processes > 1 and len(switches) > 1:
+            self.init_network_admitted_traffic_in_pool(switches, num_processes)
+        else:
+            for sw in switches:
+                self.init_network_admitted_traffic_for_sw(sw)
 
     def add_node_graph_link(self, node1_id, node2_id, updating=False):
 
+        self.network_graph.port_state_epoch += 1
+
         # Update the physical port representations in network graph objects
         edge_port_dict = self.network_graph.get_link_ports_dict(node1_id, node2_id)
         sw1 = self.network_graph.get_node_object(node1_id)
@@ -211,14 +542,14 @@ class NetworkPortGraph(PortGraph):
                                                                                                     "port_up")
             modified_switch_edges = self.filter_modified_edges(modified_switch_edges)
 
-            self.modify_switch_transfer_edges(sw1, modified_switch_edges)
+            modified_switch_edges = self.modify_switch_transfer_edges(sw1, modified_switch_edges)
             self.update_admitted_traffic(modified_switch_edges, end_to_end_modified_edges)
 
             modified_switch_edges = sw2.port_graph.update_admitted_traffic_due_to_port_state_change(edge_port_dict[node2_id],
                                                                                                     "port_up")
             modified_switch_edges = self.filter_modified_edges(modified_switch_edges)
 
-            self.modify_switch_transfer_edges(sw2, modified_switch_edges)
+            modified_switch_edges = self.modify_switch_transfer_edges(sw2, modified_switch_edges)
             self.update_admitted_traffic(modified_switch_edges, end_to_end_modified_edges)
 
     def filter_modified_edges(self, modified_switch_edges):
@@ -232,6 +563,8 @@ class NetworkPortGraph(PortGraph):
 
     def remove_node_graph_link(self, node1_id, node2_id):
 
+        self.network_graph.port_state_epoch += 1
+
         # Update the physical port representations in network graph objects
         edge_port_dict = self.network_graph.get_link_ports_dict(node1_id, node2_id)
         sw1 = self.network_graph.get_node_object(node1_id)
@@ -269,13 +602,13 @@ class NetworkPortGraph(PortGraph):
         modified_switch_edges = sw1.port_graph.update_admitted_traffic_due_to_port_state_change(edge_port_dict[node1_id], "port_down")
         modified_switch_edges = self.filter_modified_edges(modified_switch_edges)
 
-        self.modify_switch_transfer_edges(sw1, modified_switch_edges)
+        modified_switch_edges = self.modify_switch_transfer_edges(sw1, modified_switch_edges)
         self.update_admitted_traffic(modified_switch_edges, end_to_end_modified_edges)
 
         modified_switch_edges = sw2.port_graph.update_admitted_traffic_due_to_port_state_change(edge_port_dict[node2_id], "port_down")
         modified_switch_edges = self.filter_modified_edges(modified_switch_edges)
 
-        self.modify_switch_transfer_edges(sw2, modified_switch_edges)
+        modified_switch_edges = self.modify_switch_transfer_edges(sw2, modified_switch_edges)
         self.update_admitted_traffic(modified_switch_edges, end_to_end_modified_edges)
 
     def compute_edge_admitted_traffic(self, traffic_to_propagate, edge):
@@ -301,4 +634,6 @@ class NetworkPortGraph(PortGraph):
             if not i.is_empty():
                 pred_admitted_traffic.union(i)
 
+        pred_admitted_traffic.compact_if_needed()
+
         return pred_admitted_traffic
\ No newline at end of file
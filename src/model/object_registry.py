@@ -0,0 +1,176 @@
+__author__ = 'Rakesh Kumar'
+
+import cPickle
+import hashlib
+from cStringIO import StringIO
+from collections import deque
+
+immutable_types = (type(None), bool, int, long, float, str, unicode)
+
+
+def is_model_object(obj):
+    return hasattr(obj, "__dict__") and getattr(obj.__class__, "__module__", "").startswith("model.")
+
+
+def get_model_objects(root, boundary_types=()):
+
+    '''
+    Walks everything that can be reached from root (via attributes, containers and networkx graphs) and returns the
+    objects of classes defined in the model package in the order they were found. The walk does not go past the
+    objects of boundary_types (other than root), but they are included in the list.
+    '''
+
+    model_objects = []
+    seen = set()
+    to_visit = deque([root])
+
+    while to_visit:
+        obj = to_visit.popleft()
+
+        if isinstance(obj, immutable_types) or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        if is_model_object(obj):
+            model_objects.append(obj)
+            if obj is not root and isinstance(obj, boundary_types):
+                continue
+            to_visit.extend(obj.__dict__[attr] for attr in sorted(obj.__dict__))
+
+        elif isinstance(obj, dict):
+            for key in sorted(obj):
+                to_visit.append(key)
+                to_visit.append(obj[key])
+
+        elif isinstance(obj, (list, tuple, deque)):
+            to_visit.extend(obj)
+
+        elif isinstance(obj, (set, frozenset)):
+            to_visit.extend(sorted(obj))
+
+        elif hasattr(obj, "__dict__") and getattr(obj.__class__, "__module__", "").startswith("networkx."):
+            to_visit.extend(obj.__dict__[attr] for attr in sorted(obj.__dict__))
+
+    return model_objects
+
+
+class ObjectRegistry(object):
+
+    '''
+    Numbers the model objects that can be reached from root, so that they can be pickled as just their number, and
+    gives the means to pickle the changes made to them (and everything new they refer to). This is how the processes
+    forked after the registry is built send back the results of their computation: The objects in the registry are
+    at the same place in both the parent and the forked process, the forked process pickles the changes to the ones
+    it touched and the parent applies them to its own.
+    '''
+
+    def __init__(self, root):
+        self.objects = get_model_objects(root)
+        self.object_indices = dict((id(obj), i) for i, obj in enumerate(self.objects))
+
+    def persistent_id(self, obj):
+        return self.object_indices.get(id(obj))
+
+    def persistent_load(self, pid):
+        return self.objects[pid]
+
+    def dumps(self, obj):
+        f = StringIO()
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self.persistent_id
+        pickler.dump(obj)
+        return f.getvalue()
+
+    def loads(self, data):
+        unpickler = cPickle.Unpickler(StringIO(data))
+        unpickler.persistent_load = self.persistent_load
+        return unpickler.load()
+
+    def get_value_key(self, value):
+
+        if id(value) in self.object_indices:
+            return "#" + str(self.object_indices[id(value)])
+
+        elif isinstance(value, immutable_types):
+            return repr(value)
+
+        elif isinstance(value, dict):
+            return "{" + ",".join(sorted(self.get_value_key(k) + ":" + self.get_value_key(v)
+                                         for k, v in value.items())) + "}"
+
+        elif isinstance(value, (list, tuple, deque)):
+            return "[" + ",".join(self.get_value_key(v) for v in value) + "]"
+
+        elif isinstance(value, (set, frozenset)):
+            return "{" + ",".join(sorted(self.get_value_key(v) for v in value)) + "}"
+
+        elif hasattr(value, "__dict__") and getattr(value.__class__, "__module__", "").startswith("networkx."):
+            return self.get_value_key(value.__dict__)
+
+        else:
+            return repr(value)
+
+    # A hash of the state of all the objects in the registry, the same state (as long as it was built the same way)
+    # gives the same hash in any process
+    def get_state_hash(self):
+
+        state_hash = hashlib.sha1()
+        for obj in self.objects:
+            state_hash.update(obj.__class__.__name__ + self.get_value_key(obj.__dict__))
+
+        return state_hash.hexdigest()
+
+    # The attributes of all the objects in the registry, pickling these along with whatever they refer to and
+    # applying them with set_states to the registry of another copy of the same objects makes it a copy of this one
+    def get_states(self):
+        return [obj.__dict__ for obj in self.objects]
+
+    def set_states(self, states):
+        for obj, state in zip(self.objects, states):
+            obj.__dict__.clear()
+            obj.__dict__.update(state)
+
+    # Takes the state of the given objects, so that the changes made to them can be found later
+    def get_state_snapshot(self, objects):
+
+        snapshot = []
+        for obj in objects:
+            attrs = {}
+            for attr, value in obj.__dict__.items():
+
+                # Objects in the registry and immutable values only change if they are replaced, anything else can
+                # also change in-place so a pickle of it is kept around to compare to
+                if isinstance(value, immutable_types) or id(value) in self.object_indices:
+                    attrs[attr] = (value, None)
+                else:
+                    attrs[attr] = (value, self.dumps(value))
+
+            snapshot.append((self.object_indices[id(obj)], obj, attrs))
+
+        return snapshot
+
+    def get_state_changes(self, snapshot):
+
+        changes = []
+        for i, obj, attrs in snapshot:
+            changed_attrs = {}
+            for attr, value in obj.__dict__.items():
+                if attr not in attrs or attrs[attr][0] is not value:
+                    changed_attrs[attr] = value
+                elif attrs[attr][1] is not None and attrs[attr][1] != self.dumps(value):
+                    changed_attrs[attr] = value
+
+            removed_attrs = [attr for attr in attrs if attr not in obj.__dict__]
+
+            if changed_attrs or removed_attrs:
+                changes.append((i, changed_attrs, removed_attrs))
+
+        return changes
+
+    def apply_state_changes(self, changes):
+
+        for i, changed_attrs, removed_attrs in changes:
+            obj = self.objects[i]
+            obj.__dict__.update(changed_attrs)
+            for attr in removed_attrs:
+                del obj.__dict__[attr]
@@ -30,6 +30,20 @@ class Port(object):
         else:
             raise NotImplemented
 
+    # Every change of state is reflected in the set of ports that are down kept by the network graph
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        self._state = state
+
+        if state == "down":
+            self.sw.network_graph.down_port_ids.add(self.port_id)
+        else:
+            self.sw.network_graph.down_port_ids.discard(self.port_id)
+
     def init_port_graph_state(self):
 
         # Need port_number parsed in before this is called
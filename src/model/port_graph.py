@@ -1,9 +1,12 @@
 __author__ = 'Rakesh Kumar'
 
+import heapq
+import itertools
 import networkx as nx
 
 from traffic import Traffic
 from traffic_path import TrafficPath
+from admitted_traffic_index import AdmittedTrafficIndex
 
 from collections import defaultdict
 
@@ -27,6 +30,10 @@ class PortGraph(object):
         self.boundary_ingress_nodes = []
         self.boundary_egress_nodes = []
 
+        # AdmittedTrafficIndex per (node_id, dst_id), until the state of the network graph changes
+        self.admitted_traffic_indices = {}
+        self.admitted_traffic_indices_key = None
+
     def get_table_node_id(self, switch_id, table_number):
         return switch_id + ":table" + str(table_number)
 
@@ -109,6 +116,50 @@ class PortGraph(object):
 
         return succ_list
 
+    def get_admitted_traffic_index(self, node, dst):
+
+        # Without a network graph to tell when things change, nothing is kept around
+        if self.network_graph is None:
+            return self.compute_admitted_traffic_index(node, dst)
+
+        port_state_key = self.network_graph.get_port_state_key()
+        if port_state_key != self.admitted_traffic_indices_key:
+            self.admitted_traffic_indices = {}
+            self.admitted_traffic_indices_key = port_state_key
+
+        key = (node.node_id, dst.node_id)
+        if key not in self.admitted_traffic_indices:
+            self.admitted_traffic_indices[key] = self.compute_admitted_traffic_index(node, dst)
+
+        return self.admitted_traffic_indices[key]
+
+    def compute_admitted_traffic_index(self, node, dst):
+
+        traffic_elements = []
+        element_succs = []
+        for succ in self.get_admitted_traffic_succs(node, dst):
+            at_dst_succ = self.get_admitted_traffic_via_succ(node, dst, succ)
+            traffic_elements.extend(at_dst_succ.traffic_elements)
+            element_succs.extend([succ] * len(at_dst_succ.traffic_elements))
+
+        return AdmittedTrafficIndex(traffic_elements, element_succs)
+
+    def get_packet_admitted_succs(self, node, dst, packet):
+
+        '''
+        The succs via which a concrete packet at node is admitted for dst, without computing any traffic.
+
+        :param packet: Gives the value of each field as packet[field_name]
+        :return: List of succs, empty if the packet does not get to dst from node
+        '''
+
+        # Packets at an ingress node come in on its port
+        in_port = None
+        if node.node_type == "ingress":
+            in_port = int(node.parent_obj.port_number)
+
+        return self.get_admitted_traffic_index(node, dst).get_succs(packet, in_port)
+
     def get_dst_sw_nodes(self, node, sw):
 
         dst_sw_at_and_nodes = []
@@ -121,15 +172,45 @@ class PortGraph(object):
         return dst_sw_at_and_nodes
 
     def propagate_admitted_traffic(self, curr, dst_traffic_at_succ, succ, dst, end_to_end_modified_edges):
+        self.propagate_admitted_traffic_changes([(curr, dst_traffic_at_succ, succ, dst)], end_to_end_modified_edges)
+
+    # Sets the admitted traffic at curr for dst via succ, and if that changes it, queues up (curr, dst) so that the
+    # change gets propagated to the predecessors of curr
+    def queue_admitted_traffic_change(self, curr, dst_traffic_at_succ, succ, dst, distance,
+                                      queue, queue_counter, pending, end_to_end_modified_edges):
 
         prev_dst_traffic_at_succ = self.get_admitted_traffic_via_succ(curr, dst, succ)
         self.set_admitted_traffic_via_succ(curr, dst, succ, dst_traffic_at_succ)
-        traffic_after_changes = self.get_admitted_traffic(curr, dst)
 
-        if not (prev_dst_traffic_at_succ == dst_traffic_at_succ):
+        if prev_dst_traffic_at_succ == dst_traffic_at_succ:
+            return
+
+        if curr in self.boundary_ingress_nodes:
+            end_to_end_modified_edges.append((curr.node_id, dst.node_id))
+
+        if (curr, dst) not in pending:
+            pending.add((curr, dst))
+            heapq.heappush(queue, (distance, next(queue_counter), curr, dst))
+
+    # Takes a list of changes, each is a (curr, dst_traffic_at_succ, succ, dst) tuple, and propagates them until the
+    # admitted traffic does not change anymore. The (node, dst) pairs that have changed are kept in a priority queue
+    # ordered by the distance from where the change started, so a node is usually processed once after all of its
+    # successors have changed and all the changes at it are propagated as one union.
+    def propagate_admitted_traffic_changes(self, changes, end_to_end_modified_edges):
+
+        queue = []
+        queue_counter = itertools.count()
+        pending = set()
 
-            if curr in self.boundary_ingress_nodes:
-                end_to_end_modified_edges.append((curr.node_id, dst.node_id))
+        for curr, dst_traffic_at_succ, succ, dst in changes:
+            self.queue_admitted_traffic_change(curr, dst_traffic_at_succ, succ, dst, 0,
+                                               queue, queue_counter, pending, end_to_end_modified_edges)
+
+        while queue:
+            distance, _, curr, dst = heapq.heappop(queue)
+            pending.remove((curr, dst))
+
+            traffic_after_changes = self.get_admitted_traffic(curr, dst)
 
             for pred in self.predecessors_iter(curr):
 
@@ -137,7 +218,8 @@ class PortGraph(object):
 
                 pred_admitted_traffic = self.compute_edge_admitted_traffic(traffic_after_changes, edge)
 
-                self.propagate_admitted_traffic(pred, pred_admitted_traffic, curr, dst, end_to_end_modified_edges)
+                self.queue_admitted_traffic_change(pred, pred_admitted_traffic, curr, dst, distance + 1,
+                                                   queue, queue_counter, pending, end_to_end_modified_edges)
 
     def update_admitted_traffic(self, modified_edges, end_to_end_modified_edges):
 
@@ -150,8 +232,8 @@ class PortGraph(object):
             pred = self.get_node(modified_edge[0])
             succ = self.get_node(modified_edge[1])
 
-            # TODO Limit the destinations by using markers in modified_flow_table_edges
-            # Right now, just take all the destinations at succ and marking them as having been modified...
+            # Take all the destinations at succ as possibly modified, the ones whose traffic via the edge turns out to
+            # be the same are left out below
 
             for dst in self.get_admitted_traffic_dsts(succ):
                 if dst not in admitted_traffic_changes[pred]:
@@ -160,6 +242,8 @@ class PortGraph(object):
                     if succ not in admitted_traffic_changes[pred][dst]:
                         admitted_traffic_changes[pred][dst].append(succ)
 
+        changes = []
+
         # Do this for each pred port that has changed
         for pred in admitted_traffic_changes:
 
@@ -167,6 +251,7 @@ class PortGraph(object):
             for dst in admitted_traffic_changes[pred]:
 
                 now_pred_traffic = Traffic()
+                is_dst_modified = False
 
                 # Check the fate of traffic from changed successors in this loop
                 for succ in admitted_traffic_changes[pred][dst]:
@@ -177,11 +262,21 @@ class PortGraph(object):
 
                     # Update admitted traffic at successor node to reflect changes
                     pred_traffic_via_succ = self.compute_edge_admitted_traffic(succ_traffic, edge)
+
+                    prev_pred_traffic_via_succ = self.get_admitted_traffic_via_succ(pred, dst, succ)
+                    if not pred_traffic_via_succ.is_equal_traffic(prev_pred_traffic_via_succ):
+                        is_dst_modified = True
+
                     self.set_admitted_traffic_via_succ(pred, dst, succ, pred_traffic_via_succ)
 
                     # Accumulate total traffic admitted at this pred
                     now_pred_traffic.union(pred_traffic_via_succ)
 
+                # If the traffic for dst via none of the modified edges changed, then neither did any of the traffic
+                # that the preds of pred have for it
+                if not is_dst_modified:
+                    continue
+
                 # Collect traffic from any succs that was not changed
                 for succ in self.get_admitted_traffic_succs(pred, dst):
                     if succ not in admitted_traffic_changes[pred][dst]:
@@ -193,10 +288,9 @@ class PortGraph(object):
                     edge = self.get_edge(pred_pred, pred)
                     pred_pred_traffic = self.compute_edge_admitted_traffic(now_pred_traffic, edge)
 
-                    self.propagate_admitted_traffic(pred_pred,
-                                                    pred_pred_traffic,
-                                                    pred,
-                                                    dst, end_to_end_modified_edges)
+                    changes.append((pred_pred, pred_pred_traffic, pred, dst))
+
+        self.propagate_admitted_traffic_changes(changes, end_to_end_modified_edges)
 
     def get_graph_at(self):
         graph_ats = defaultdict(defaultdict)
@@ -121,18 +121,27 @@ class SwitchPortGraph(PortGraph):
 
             self.add_edge(flow_table.port_graph_node, succ, edge)
 
+    def update_admitted_traffic_due_to_flow_table_change(self, flow_table, modified_flow_table_edges):
+
+        end_to_end_modified_edges = []
+
+        self.modify_flow_table_edges(flow_table, modified_flow_table_edges)
+        self.update_admitted_traffic(modified_flow_table_edges, end_to_end_modified_edges)
+
+        return end_to_end_modified_edges
+
     def init_switch_admitted_traffic(self):
 
         print "Computing Transfer Function for switch:", self.sw.node_id
 
+        changes = []
+
         # Inject wildcard traffic at each ingress port of the switch's non-host ports
         for port in self.sw.non_host_port_iter():
 
             egress_node = self.get_egress_node(self.sw.node_id, port.port_number)
             dst_traffic_at_succ = Traffic(init_wildcard=True)
-            end_to_end_modified_edges = []
-            self.propagate_admitted_traffic(egress_node, dst_traffic_at_succ, None, egress_node,
-                                            end_to_end_modified_edges)
+            changes.append((egress_node, dst_traffic_at_succ, None, egress_node))
 
         # Inject wildcard traffic at each ingress port of the switch
         for port in self.sw.host_port_iter():
@@ -141,9 +150,10 @@ class SwitchPortGraph(PortGraph):
 
             dst_traffic_at_succ = Traffic(init_wildcard=True)
             dst_traffic_at_succ.set_field("ethernet_destination", int(port.attached_host.mac_addr.replace(":", ""), 16))
-            end_to_end_modified_edges = []
-            self.propagate_admitted_traffic(egress_node, dst_traffic_at_succ, None, egress_node,
-                                            end_to_end_modified_edges)
+            changes.append((egress_node, dst_traffic_at_succ, None, egress_node))
+
+        end_to_end_modified_edges = []
+        self.propagate_admitted_traffic_changes(changes, end_to_end_modified_edges)
 
     def compute_edge_admitted_traffic(self, traffic_to_propagate, edge):
 
@@ -179,6 +189,8 @@ class SwitchPortGraph(PortGraph):
 
                 pred_admitted_traffic.union(i)
 
+        pred_admitted_traffic.compact_if_needed()
+
         return pred_admitted_traffic
 
     def update_admitted_traffic_due_to_port_state_change(self, port_num, event_type):
@@ -198,7 +210,7 @@ class SwitchPortGraph(PortGraph):
             flow_table = pred.parent_obj
 
             # First get the modified edges in this flow_table (edges added/deleted/modified)
-            modified_flow_table_edges = flow_table.update_port_graph_edges()
+            modified_flow_table_edges = flow_table.update_port_graph_edges(port_num)
 
             self.modify_flow_table_edges(flow_table, modified_flow_table_edges)
 
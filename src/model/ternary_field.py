@@ -0,0 +1,238 @@
+__author__ = 'Rakesh Kumar'
+
+import sys
+
+from intervaltree_modified import Interval
+
+
+class TernaryField(object):
+
+    '''
+    A set of values of a single header field with a fixed bit width, kept as a sorted tuple of disjoint ternary
+    prefixes. Each prefix is a (value, wildcard_bits) tuple, it matches every header value whose top
+    (width - wildcard_bits) bits are the same as the ones in value, i.e. the range [value, value + 2**wildcard_bits).
+
+    The prefixes are always kept in the canonical (minimal) form for the set of values that they represent, so two
+    TernaryFields that have the same values have the same prefixes.
+
+    It is a drop-in replacement for the IntervalTree as a value of a field in a TrafficElement and
+    supports the same subset of its interface (add, chop, clear, copy, search, is_empty, iteration over Intervals).
+    '''
+
+    __slots__ = ('width', 'prefixes')
+
+    def __init__(self, width, intervals=None):
+
+        self.width = width
+        self.prefixes = ()
+
+        if intervals:
+            self.prefixes = self.get_prefixes(self.merge_intervals([(iv.begin, iv.end) for iv in intervals]))
+
+    @property
+    def max_value(self):
+        return 1 << self.width
+
+    def clip(self, begin, end):
+        return max(begin, 0), min(end, self.max_value)
+
+    # Splits the range [begin, end) into the minimal list of aligned prefixes covering it
+    @staticmethod
+    def get_range_prefixes(begin, end):
+
+        prefixes = []
+
+        while begin < end:
+
+            # Largest aligned block starting at begin...
+            if begin == 0:
+                wildcard_bits = (end - begin).bit_length() - 1
+            else:
+                wildcard_bits = (begin & -begin).bit_length() - 1
+
+            # ... that also does not spill over the end
+            while begin + (1 << wildcard_bits) > end:
+                wildcard_bits -= 1
+
+            prefixes.append((begin, wildcard_bits))
+            begin += 1 << wildcard_bits
+
+        return prefixes
+
+    def get_prefixes(self, ranges):
+        prefixes = []
+        for begin, end in ranges:
+            prefixes.extend(self.get_range_prefixes(begin, end))
+        return tuple(prefixes)
+
+    # Takes a list of (begin, end) tuples, returns a sorted list of disjoint, non-adjacent ranges clipped to width
+    def merge_intervals(self, ranges):
+
+        merged = []
+
+        for begin, end in sorted(ranges):
+            begin, end = self.clip(begin, end)
+            if begin >= end:
+                continue
+
+            if merged and begin <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((begin, end))
+
+        return merged
+
+    def get_ranges(self):
+
+        ranges = []
+
+        for value, wildcard_bits in self.prefixes:
+            end = value + (1 << wildcard_bits)
+
+            if ranges and ranges[-1][1] == value:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((value, end))
+
+        return ranges
+
+    def __iter__(self):
+        for begin, end in self.get_ranges():
+            yield Interval(begin, end)
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def __nonzero__(self):
+        return len(self.prefixes) > 0
+
+    def __contains__(self, interval):
+
+        # True if all the values in the interval are in this field
+        for begin, end in self.get_ranges():
+            if begin <= interval.begin and interval.end <= end:
+                return True
+
+        return False
+
+    def __eq__(self, other):
+        return isinstance(other, TernaryField) and self.width == other.width and self.prefixes == other.prefixes
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.width, self.prefixes))
+
+    # Pickled as just a tuple, these are sent around a lot in pickles between processes
+    def __getstate__(self):
+        return self.width, self.prefixes
+
+    def __setstate__(self, state):
+        self.width, self.prefixes = state
+
+    def __str__(self):
+        prefix_strs = []
+        for value, wildcard_bits in self.prefixes:
+            prefix_strs.append(bin(value >> wildcard_bits)[2:].zfill(self.width - wildcard_bits) + "x" * wildcard_bits)
+        return "TernaryField([" + ", ".join(prefix_strs) + "])"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def is_empty(self):
+        return len(self.prefixes) == 0
+
+    def copy(self):
+        field_copy = TernaryField(self.width)
+        field_copy.prefixes = self.prefixes
+        return field_copy
+
+    def clear(self):
+        self.prefixes = ()
+
+    def add(self, interval):
+        self.prefixes = self.get_prefixes(self.merge_intervals(self.get_ranges() + [(interval.begin, interval.end)]))
+
+    def chop(self, begin, end):
+
+        remaining = []
+
+        for r_begin, r_end in self.get_ranges():
+            if r_end <= begin or end <= r_begin:
+                remaining.append((r_begin, r_end))
+            else:
+                if r_begin < begin:
+                    remaining.append((r_begin, begin))
+                if end < r_end:
+                    remaining.append((end, r_end))
+
+        self.prefixes = self.get_prefixes(remaining)
+
+    def search(self, begin, end=None):
+
+        if end is None:
+            end = begin + 1
+
+        return set(Interval(r_begin, r_end) for r_begin, r_end in self.get_ranges()
+                   if r_begin < end and begin < r_end)
+
+    def complement(self):
+
+        complement_ranges = []
+        prev_end = 0
+
+        for begin, end in self.get_ranges():
+            if begin > prev_end:
+                complement_ranges.append((prev_end, begin))
+            prev_end = end
+
+        if prev_end < self.max_value:
+            complement_ranges.append((prev_end, self.max_value))
+
+        complement_field = TernaryField(self.width)
+        complement_field.prefixes = self.get_prefixes(complement_ranges)
+        return complement_field
+
+    # Two aligned prefixes are either disjoint or one of them contains the other one,
+    # so the intersection is computed by a single merge pass through the two sorted tuples.
+    def intersect(self, other):
+
+        intersection = []
+
+        i = 0
+        j = 0
+        while i < len(self.prefixes) and j < len(other.prefixes):
+
+            a_value, a_wildcard_bits = self.prefixes[i]
+            b_value, b_wildcard_bits = other.prefixes[j]
+            a_end = a_value + (1 << a_wildcard_bits)
+            b_end = b_value + (1 << b_wildcard_bits)
+
+            if a_end <= b_value:
+                i += 1
+            elif b_end <= a_value:
+                j += 1
+            elif a_wildcard_bits <= b_wildcard_bits:
+                intersection.append(self.prefixes[i])
+                i += 1
+            else:
+                intersection.append(other.prefixes[j])
+                j += 1
+
+        intersection_field = TernaryField(self.width)
+        intersection_field.prefixes = tuple(intersection)
+        return intersection_field
+
+    def num_values(self):
+        return sum(1 << wildcard_bits for value, wildcard_bits in self.prefixes)
+
+    @staticmethod
+    def from_field(width, field):
+
+        # The wildcard is a bare Interval, anything else is a collection of Intervals
+        if isinstance(field, Interval):
+            return TernaryField(width, [Interval(0, sys.maxsize)])
+        else:
+            return TernaryField(width, field)
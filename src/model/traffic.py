@@ -1,18 +1,25 @@
-from match import field_names
+from match import field_names, field_widths
 from traffic_element import TrafficElement
 
 __author__ = 'Rakesh Kumar'
 
+# Traffic gets compacted when the number of its elements grows past this, None turns compaction off. Only traffic made
+# of te of its own is compacted (see compact_if_needed): the te that union and difference pass through are shared with
+# the Traffic they came from, and the changes made in place to them (e.g. clear_switch_modifications) are relied upon
+# to show up in both, which compacting them into new te would stop.
+compaction_threshold = 8
 
 class Traffic:
 
-    def __init__(self, init_wildcard=False):
+    def __init__(self, init_wildcard=False, field_backend=None):
 
         self.traffic_elements = []
+        self.field_backend = field_backend
+        self.compacted_size = 0
 
         # If initialized as wildcard, add one to the list
         if init_wildcard:
-            self.traffic_elements.append(TrafficElement(init_field_wildcard=True))
+            self.traffic_elements.append(TrafficElement(init_field_wildcard=True, field_backend=field_backend))
 
     def clone_with_active_traffic_elements(self):
 
@@ -82,6 +89,11 @@ class Traffic:
     # Checks if in_te is subset of self (any one of its te)
     def is_subset_te(self, in_te):
 
+        # Most of the time in_te is contained by just one of the te, which is cheap to check field by field
+        for te in self.traffic_elements:
+            if te.is_subset(in_te):
+                return True
+
         in_traffic = Traffic()
         in_traffic.traffic_elements.append(in_te)
 
@@ -100,8 +112,57 @@ class Traffic:
         else:
             return False
 
+    # The set of te in the traffic by the values in their fields
+    def get_fields_keys(self):
+        return set(te.get_fields_key() for te in self.traffic_elements)
+
+    def get_non_empty_traffic_elements(self):
+
+        non_empty_traffic_elements = []
+        for te in self.traffic_elements:
+            for field_name in field_names:
+                field = te.traffic_fields[field_name]
+                if not te.is_traffic_field_wildcard(field) and field.is_empty():
+                    break
+            else:
+                non_empty_traffic_elements.append(te)
+
+        return non_empty_traffic_elements
+
+    # The values that packets in the traffic carry in the field, clipped to the width of the field
+    def get_field_projection(self, field_name, traffic_elements):
+
+        field_intervals = []
+        for te in traffic_elements:
+            field = te.traffic_fields[field_name]
+            if te.is_traffic_field_wildcard(field):
+                field_intervals.append(field)
+            else:
+                field_intervals.extend(field)
+
+        max_value = 1 << field_widths[field_name]
+        return [(begin, min(end, max_value)) for begin, end in TrafficElement.get_field_ranges(field_intervals)
+                if begin < max_value]
+
     def is_equal_traffic(self, in_traffic):
 
+        # Same te in both means same traffic
+        if self.get_fields_keys() == in_traffic.get_fields_keys():
+            return True
+
+        # Equal traffic has the same values in each field, so it is enough that one field is different to tell them apart
+        self_traffic_elements = self.get_non_empty_traffic_elements()
+        in_traffic_elements = in_traffic.get_non_empty_traffic_elements()
+
+        if not self_traffic_elements or not in_traffic_elements:
+            return not self_traffic_elements and not in_traffic_elements
+
+        for field_name in field_names:
+            if self.get_field_projection(field_name, self_traffic_elements) != \
+                    self.get_field_projection(field_name, in_traffic_elements):
+                return False
+
+        # Otherwise do it the long way
         if self.is_subset_traffic(in_traffic) and in_traffic.is_subset_traffic(self):
             return True
         else:
@@ -154,6 +215,8 @@ class Traffic:
                     ei.written_modifications_apply = e_in.written_modifications_apply
                     ei.enabling_edge_data = e_in.enabling_edge_data
 
+        traffic_intersection.compact_if_needed()
+
         return traffic_intersection
 
     # Computes a difference between two traffic instances and if they have changed.
@@ -210,6 +273,99 @@ class Traffic:
     def union(self, in_traffic):
         self.traffic_elements.extend(in_traffic.traffic_elements)
 
+    # Drops the te that are contained in another one and merges the pairs that differ in just one field, until
+    # no more of them can be combined. Where te overlap, the earlier one is the one whose modifications and edge data
+    # count (intersect leaves out the later ones), so a te is only combined with an earlier te that carries the same
+    # modifications and edge data, and none of the te in between that carry something else can overlap it. Only the te
+    # whose fields are combinable are combined, so that get_orig_traffic makes the same traffic out of them afterwards.
+    def compact_te_list(self, te_list):
+
+        combined = True
+        while combined:
+            combined = False
+            compacted = []
+            compacted_keys = []
+
+            for te in te_list:
+                key = te.get_metadata_key()
+                is_combined = False
+
+                for i in xrange(len(compacted) - 1, -1, -1):
+                    compacted_te = compacted[i]
+
+                    if compacted_keys[i] != key:
+                        if compacted_te.intersect(te):
+                            break
+                        continue
+
+                    if not compacted_te.is_combinable(te):
+                        continue
+
+                    if compacted_te.is_subset(te):
+                        is_combined = True
+                        break
+
+                    if te.is_subset(compacted_te):
+                        compacted[i] = te
+                        is_combined = True
+                        break
+
+                    merged_te = compacted_te.get_merged_traffic_element(te)
+                    if merged_te:
+                        compacted[i] = merged_te
+                        is_combined = True
+                        break
+
+                if is_combined:
+                    combined = True
+                else:
+                    compacted.append(te)
+                    compacted_keys.append(key)
+
+            te_list = compacted
+
+        return te_list
+
+    # Rewrites the traffic with fewer te that cover the same packets with the same modifications and edge data
+    def compact(self):
+        self.traffic_elements = self.compact_te_list(self.traffic_elements)
+        self.compacted_size = len(self.traffic_elements)
+
+    # Meant for the traffic whose te nobody else holds on to, e.g. what intersect or compute_edge_admitted_traffic build
+    def compact_if_needed(self):
+
+        # Only compact again once the traffic has doubled since the last time, so that traffic that does not compact
+        # well is not compacted over and over again
+        if compaction_threshold and len(self.traffic_elements) > max(compaction_threshold, 2 * self.compacted_size):
+            self.compact()
+
+    # Brings the traffic to its normal form: The te that carry the same modifications and edge data do not overlap,
+    # and no two of them can be merged unless a te in between that carries something else overlaps them
+    def normalize(self):
+
+        disjoint_elements = []
+        disjoint_keys = []
+
+        for te in self.traffic_elements:
+            key = te.get_metadata_key()
+
+            # The parts of te that an earlier te with the same modifications and edge data has are left out
+            remaining = [te]
+            for disjoint_te, disjoint_key in zip(disjoint_elements, disjoint_keys):
+                if disjoint_key != key:
+                    continue
+
+                remaining_after = []
+                for remaining_te in remaining:
+                    remaining_after.extend(disjoint_te.get_disjoint_diff_traffic_elements(remaining_te))
+                remaining = remaining_after
+
+            disjoint_elements.extend(remaining)
+            disjoint_keys.extend([key] * len(remaining))
+
+        self.traffic_elements = self.compact_te_list(disjoint_elements)
+        self.compacted_size = len(self.traffic_elements)
+
     def get_orig_traffic(self,
                          provided_modifications=None,
                          use_embedded_written_modifications=False,
@@ -1,18 +1,44 @@
 import sys
 
+from bisect import bisect_right
 from netaddr import IPNetwork
-from match import field_names
+from match import field_names, field_widths
 from model.intervaltree_modified import IntervalTree, Interval
+from model.ternary_field import TernaryField
+from model.interval_set import IntervalSet
+from model.lru_memo import LRUMemo
+
+# Constructors of an empty field for each of the representations that TrafficElement fields can be kept in
+field_backends = {"interval_set": lambda field_name: IntervalSet(field_widths[field_name]),
+                  "interval_tree": lambda field_name: IntervalTree(),
+                  "ternary": lambda field_name: TernaryField(field_widths[field_name])}
+
+default_field_backend = "interval_set"
+
+# Field representations that do their own merge-based intersect/complement within the field width
+bounded_field_types = (IntervalSet, TernaryField)
+
+# Results of the set operations on te, keyed by the fields of the te involved. The same rules (and so the same te)
+# show up on many switches, so a lot of these are repeated. Set its max_size to 0 to turn it off.
+traffic_element_memo = LRUMemo(65536)
 
 
 class TrafficElement:
-    def __init__(self, init_match=None, init_field_wildcard=False):
+    def __init__(self, init_match=None, init_field_wildcard=False, field_backend=None):
+
+        if field_backend:
+            if field_backend not in field_backends:
+                raise Exception("Unknown field backend: " + str(field_backend))
+            self.field_backend = field_backend
+        else:
+            self.field_backend = default_field_backend
 
         self.switch_modifications = {}
         self.written_modifications = {}
         self.written_modifications_apply = None
         self.traffic_fields = {}
         self.enabling_edge_data = None
+        self.fields_key = None
 
         # If a match has been provided to initialize with
         if init_match:
@@ -63,49 +89,76 @@ class TrafficElement:
 
         return is_wildcard
 
+    def get_empty_field(self, field_name):
+        return field_backends[self.field_backend](field_name)
+
     def set_traffic_field(self, field_name, value=None, set_wildcard=False, is_exception_value=False):
 
+        # Fields are never changed in place once they are in a te, as they may be shared with other te (and memoized),
+        # a new field is always put in instead
+        self.fields_key = None
+
         if set_wildcard:
             self.traffic_fields[field_name] = Interval(0, sys.maxsize)
 
         elif not is_exception_value:
 
-            # If the field already exists in the Traffic Element, then clear it, otherwise spin up an IntervalTree
-            if field_name not in self.traffic_fields:
-                self.traffic_fields[field_name] = IntervalTree()
-            else:
-
-                if self.is_traffic_field_wildcard(self.traffic_fields[field_name]):
-                    self.traffic_fields[field_name] = IntervalTree()
-                else:
-                    self.traffic_fields[field_name].clear()
+            field = self.get_empty_field(field_name)
 
             # Deal with IP Network fields
             if field_name == 'src_ip_addr' or field_name == 'dst_ip_addr':
                 if isinstance(value, IPNetwork):
-                    self.traffic_fields[field_name].add(Interval(value.first, value.last + 1))
+                    field.add(Interval(value.first, value.last + 1))
                 else:
                     raise Exception("Gotta be IPNetwork!")
             else:
-                self.traffic_fields[field_name].add(Interval(value, value + 1))
+                field.add(Interval(value, value + 1))
 
-        elif is_exception_value:
+            self.traffic_fields[field_name] = field
 
-            if self.is_traffic_field_wildcard(self.traffic_fields[field_name]):
-                self.traffic_fields[field_name] = IntervalTree()
-            else:
-                self.traffic_fields[field_name].clear()
+        elif is_exception_value:
 
-            self.traffic_fields[field_name].add(Interval(0, sys.maxsize))
+            field = self.get_empty_field(field_name)
+            field.add(Interval(0, sys.maxsize))
 
             # Deal with IP Network fields
             if field_name == 'src_ip_addr' or field_name == 'dst_ip_addr':
                 if isinstance(value, IPNetwork):
-                    self.traffic_fields[field_name].chop(value.first, value.last + 1)
+                    field.chop(value.first, value.last + 1)
                 else:
                     raise Exception("Gotta be IPNetwork!")
             else:
-                self.traffic_fields[field_name].chop(value, value + 1)
+                field.chop(value, value + 1)
+
+            self.traffic_fields[field_name] = field
+
+    def get_field_key(self, field):
+
+        if self.is_traffic_field_wildcard(field):
+            return None
+        elif isinstance(field, IntervalSet):
+            return field.bounds
+        elif isinstance(field, TernaryField):
+            return field.width, field.prefixes
+        else:
+            return tuple(sorted((iv.begin, iv.end) for iv in field))
+
+    # Structural key of the values in the fields (and not the modifications or edge data), te with the same fields have
+    # the same key. It is computed once, the fields are only replaced via set_traffic_field which resets it.
+    def get_fields_key(self):
+
+        if self.fields_key is None:
+            self.fields_key = (self.field_backend,) + tuple(self.get_field_key(self.traffic_fields[field_name])
+                                                            for field_name in field_names)
+        return self.fields_key
+
+    def get_traffic_element_from_fields(self, fields):
+
+        te = TrafficElement(field_backend=self.field_backend)
+        for i in range(len(field_names)):
+            te.traffic_fields[field_names[i]] = fields[i]
+
+        return te
 
     def get_field_num_values(self, field):
         if self.is_traffic_field_wildcard(field):
@@ -130,6 +183,20 @@ class TrafficElement:
             return field2
         elif self.is_traffic_field_wildcard(field2):
             return field1
+
+        # Bounded fields are intersected with a merge over their sorted contents, bring the other field to the same form
+        elif isinstance(field1, bounded_field_types) or isinstance(field2, bounded_field_types):
+
+            if not isinstance(field1, bounded_field_types):
+                field1 = field2.from_field(field2.width, field1)
+            elif type(field2) != type(field1):
+                field2 = field1.from_field(field1.width, field2)
+
+            field_intersection = field1.intersect(field2)
+            if field_intersection.is_empty():
+                return None
+            else:
+                return field_intersection
         else:
             # If neither is a wildcard, then we have to get down to brasstacks and do the intersection
             field_intersection_intervals = []
@@ -161,38 +228,221 @@ class TrafficElement:
             else:
                 return None
 
-    def intersect(self, in_traffic_element):
+    # Returns a field with the values that are not in the given field, None if it has all of them
+    def get_field_complement(self, field):
+
+        if self.is_traffic_field_wildcard(field):
+            return None
+
+        if isinstance(field, bounded_field_types):
+            complement_field = field.complement()
+        else:
+            complement_field = IntervalTree([Interval(0, sys.maxsize)])
+
+            # Chop out each interval from the wildcard
+            for interval in field:
+                complement_field.chop(interval.begin, interval.end)
+
+        if complement_field.is_empty():
+            return None
+        else:
+            return complement_field
+
+    # Computes field1 - field2, None if nothing is left
+    def get_field_difference(self, field1, field2):
+
+        complement_field = self.get_field_complement(field2)
+        if not complement_field:
+            return None
+
+        return self.get_field_intersection(field1, complement_field)
+
+    # Sorted list of the (begin, end) of disjoint, non-adjacent ranges with the values in the field
+    @staticmethod
+    def get_field_ranges(field):
+
+        ranges = []
+        for iv in sorted(field):
+            if ranges and iv.begin <= ranges[-1][1]:
+                if iv.end > ranges[-1][1]:
+                    ranges[-1] = (ranges[-1][0], iv.end)
+            else:
+                ranges.append((iv.begin, iv.end))
+
+        return ranges
+
+    # Checks if all the values in field1 are in field2
+    def is_field_subset(self, field1, field2):
+
+        if self.is_traffic_field_wildcard(field2):
+            return True
+
+        if self.is_traffic_field_wildcard(field1):
+            return self.get_field_complement(field2) is None
+
+        # Same kind of bounded fields can just check that intersecting with field2 leaves field1 as it is
+        if type(field1) == type(field2) and isinstance(field1, bounded_field_types):
+            return field1.intersect(field2) == field1
+
+        # Otherwise each interval in field1 has to be inside one of the ranges of field2
+        field2_ranges = self.get_field_ranges(field2)
+        for iv in field1:
+            i = bisect_right(field2_ranges, (iv.begin, sys.maxsize)) - 1
+            if i < 0 or iv.end > field2_ranges[i][1]:
+                return False
+
+        return True
+
+    def is_field_equal(self, field1, field2):
+
+        if type(field1) == type(field2) and (isinstance(field1, bounded_field_types) or
+                                             self.is_traffic_field_wildcard(field1)):
+            return field1 == field2
 
-        intersection_element = TrafficElement()
+        return self.is_field_subset(field1, field2) and self.is_field_subset(field2, field1)
+
+    # Returns a field with the values of both the fields, it is the wildcard if that covers all the values
+    def get_field_union(self, field1, field2):
+
+        if self.is_traffic_field_wildcard(field1) or self.is_traffic_field_wildcard(field2):
+            return Interval(0, sys.maxsize)
+
+        if isinstance(field1, bounded_field_types):
+            field_union = field1.from_field(field1.width, list(field1) + list(field2))
+        elif isinstance(field2, bounded_field_types):
+            field_union = field2.from_field(field2.width, list(field1) + list(field2))
+        else:
+            field_union = IntervalTree([Interval(begin, end) for begin, end in
+                                        self.get_field_ranges(list(field1) + list(field2))])
+
+        if not self.get_field_complement(field_union):
+            return Interval(0, sys.maxsize)
+        else:
+            return field_union
+
+    # The modifications and edge data that a traffic element carries along with its fields
+    def get_metadata_key(self):
+        return (id(self.enabling_edge_data),
+                self.written_modifications_apply,
+                tuple(sorted((mf, id(self.switch_modifications[mf])) for mf in self.switch_modifications)),
+                tuple(sorted((mf, id(self.written_modifications[mf])) for mf in self.written_modifications)))
+
+    def set_metadata(self, in_traffic_element):
+        self.switch_modifications.update(in_traffic_element.switch_modifications)
+        self.written_modifications.update(in_traffic_element.written_modifications)
+        self.written_modifications_apply = in_traffic_element.written_modifications_apply
+        self.enabling_edge_data = in_traffic_element.enabling_edge_data
+
+    # get_orig_field leaves a field that has more than one value (but not all of them) as it is, and maps the others back
+    # to the match of the modification, so two fields can only be combined into one if they are the same, or if they
+    # both have more than one value: Otherwise the combined field would come out of get_orig_traffic_element differently
+    def is_field_combinable(self, field1, field2):
+
+        if self.is_field_equal(field1, field2):
+            return True
+
+        return 1 < self.get_field_num_values(field1) < sys.maxsize and \
+               1 < self.get_field_num_values(field2) < sys.maxsize
+
+    def is_combinable(self, in_traffic_element):
 
         for field_name in field_names:
-            intersection_element.traffic_fields[field_name] = self.get_field_intersection(
-                in_traffic_element.traffic_fields[field_name], self.traffic_fields[field_name])
+            if not self.is_field_combinable(self.traffic_fields[field_name],
+                                            in_traffic_element.traffic_fields[field_name]):
+                return False
+
+        return True
+
+    # If in_traffic_element differs from self in just one field, returns the element that has the union of the values in
+    # that field (and everything else same), None otherwise, or if the fields cannot be combined.
+    def get_merged_traffic_element(self, in_traffic_element):
+
+        diff_field_name = None
+        for field_name in field_names:
+            if not self.is_field_equal(self.traffic_fields[field_name], in_traffic_element.traffic_fields[field_name]):
+                if diff_field_name:
+                    return None
+                diff_field_name = field_name
+
+        if diff_field_name and not self.is_field_combinable(self.traffic_fields[diff_field_name],
+                                                            in_traffic_element.traffic_fields[diff_field_name]):
+            return None
+
+        merged_traffic_element = TrafficElement(field_backend=self.field_backend)
+        merged_traffic_element.traffic_fields.update(self.traffic_fields)
+        if diff_field_name:
+            field_union = self.get_field_union(self.traffic_fields[diff_field_name],
+                                               in_traffic_element.traffic_fields[diff_field_name])
+
+            # The wildcard is mapped back by the modifications, the fields it is made of are not
+            if self.is_traffic_field_wildcard(field_union):
+                return None
+
+            merged_traffic_element.traffic_fields[diff_field_name] = field_union
+
+        merged_traffic_element.set_metadata(self)
+
+        return merged_traffic_element
+
+    def get_intersection_fields(self, in_traffic_element):
+
+        intersection_fields = []
+
+        for field_name in field_names:
+            field_intersection = self.get_field_intersection(in_traffic_element.traffic_fields[field_name],
+                                                             self.traffic_fields[field_name])
 
             # If the resulting tree has no intervals in it, then balk:
-            if not intersection_element.traffic_fields[field_name]:
+            if not field_intersection:
                 return None
 
-        return intersection_element
+            intersection_fields.append(field_intersection)
+
+        return tuple(intersection_fields)
+
+    def intersect(self, in_traffic_element):
+
+        key = ("intersect", self.get_fields_key(), in_traffic_element.get_fields_key())
+        found, intersection_fields = traffic_element_memo.lookup(key)
+        if not found:
+            intersection_fields = self.get_intersection_fields(in_traffic_element)
+            traffic_element_memo.store(key, intersection_fields)
+
+        if intersection_fields:
+            return self.get_traffic_element_from_fields(intersection_fields)
+        else:
+            return None
 
     def get_complement_traffic_elements(self):
 
+        key = ("complement", self.get_fields_key())
+        found, complement_fields_list = traffic_element_memo.lookup(key)
+        if not found:
+            complement_fields_list = [tuple(te.traffic_fields[field_name] for field_name in field_names)
+                                      for te in self.compute_complement_traffic_elements()]
+            traffic_element_memo.store(key, complement_fields_list)
+
+        return [self.get_traffic_element_from_fields(fields) for fields in complement_fields_list]
+
+    def compute_complement_traffic_elements(self):
+
         complement_traffic_elements = []
         for field_name in field_names:
 
             # If the field is not a wildcard, then chop it from the wildcard initialized Traffic
             if not self.is_traffic_field_wildcard(self.traffic_fields[field_name]):
-                te = TrafficElement(init_field_wildcard=True)
-                te.traffic_fields[field_name] = IntervalTree()
-                te.traffic_fields[field_name].add(Interval(0, sys.maxsize))
 
-                # Chop out each interval from te[field_name]
-                for interval in self.traffic_fields[field_name]:
-                    te.traffic_fields[field_name].chop(interval.begin, interval.end)
+                # If the field covers all of its values, there is nothing in its complement
+                complement_field = self.get_field_complement(self.traffic_fields[field_name])
+                if not complement_field:
+                    continue
+
+                te = TrafficElement(init_field_wildcard=True, field_backend=self.field_backend)
+                te.traffic_fields[field_name] = complement_field
 
                 # If this complement traffic has a non-wildcard vlan_id, then has_vlan_tag has to be 1
                 if not self.is_traffic_field_wildcard(te.traffic_fields["vlan_id"]):
-                    te.traffic_fields["has_vlan_tag"] = IntervalTree()
+                    te.traffic_fields["has_vlan_tag"] = te.get_empty_field("has_vlan_tag")
                     te.traffic_fields["has_vlan_tag"].add(Interval(1, 2))
 
                 complement_traffic_elements.append(te)
@@ -220,23 +470,57 @@ class TrafficElement:
 
         return diff_traffic_elements
 
+    # Computes A - B as a list of elements that do not overlap each other, the i-th one has the fields before the
+    # i-th field from A Int B, i-th field from A - B and the rest as they are in A.
+    # A is in_traffic_element
+    # B here is self
+    def get_disjoint_diff_traffic_elements(self, in_traffic_element):
+
+        if not in_traffic_element.intersect(self):
+            return [in_traffic_element]
+
+        diff_traffic_elements = []
+        remaining_fields = {}
+        remaining_fields.update(in_traffic_element.traffic_fields)
+
+        for field_name in field_names:
+
+            field_diff = self.get_field_difference(remaining_fields[field_name], self.traffic_fields[field_name])
+            if field_diff:
+                te = TrafficElement(field_backend=in_traffic_element.field_backend)
+                te.traffic_fields.update(remaining_fields)
+                te.traffic_fields[field_name] = field_diff
+                te.set_metadata(in_traffic_element)
+                diff_traffic_elements.append(te)
+
+            remaining_fields[field_name] = self.get_field_intersection(remaining_fields[field_name],
+                                                                       self.traffic_fields[field_name])
+
+        return diff_traffic_elements
+
     # Checks if in_traffic_element is a subset of self
-    # A is_subset of B if A - B == NullSet
+    # Both are cross products of their fields, so A is_subset of B if each field of A is a subset of the same in B
     # A is in_traffic_element
     # B here is self
     def is_subset(self, in_traffic_element):
 
-        diff_traffic_elements = self.get_diff_traffic_elements(in_traffic_element)
+        key = ("is_subset", self.get_fields_key(), in_traffic_element.get_fields_key())
+        found, is_subset = traffic_element_memo.lookup(key)
+        if found:
+            return is_subset
 
-        # Return True/False based on if there was anything found in A Int B'
-        if diff_traffic_elements:
-            return False
-        else:
-            return True
+        is_subset = True
+        for field_name in field_names:
+            if not self.is_field_subset(in_traffic_element.traffic_fields[field_name], self.traffic_fields[field_name]):
+                is_subset = False
+                break
+
+        traffic_element_memo.store(key, is_subset)
+        return is_subset
 
     def get_modified_traffic_element(self, use_embedded_switch_modifications):
 
-        modified_traffic_element = TrafficElement()
+        modified_traffic_element = TrafficElement(field_backend=self.field_backend)
 
         mf = None
         if use_embedded_switch_modifications:
@@ -316,7 +600,7 @@ class TrafficElement:
         modifications_used = {}
         modifications_used.update(modifications)
 
-        orig_traffic_element = TrafficElement()
+        orig_traffic_element = TrafficElement(field_backend=self.field_backend)
 
         for field_name in field_names:
 
@@ -347,7 +631,8 @@ class TrafficElement:
                     else:
                         # If ever reversing effects of push_vlan and not matching on it, while there is a modification
                         # on the has_vlan_tag as well then nullify this te. One way is to set has_vlan_tag to empty
-                        orig_traffic_element.traffic_fields["has_vlan_tag"] = IntervalTree()
+                        orig_traffic_element.traffic_fields["has_vlan_tag"] = \
+                            orig_traffic_element.get_empty_field("has_vlan_tag")
 
                         # Also ensure that both of these modifications are not propagated..
                         del modifications_used["has_vlan_tag"]
@@ -0,0 +1,1421 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: sdnsim.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor.FileDescriptor(
+  name='sdnsim.proto',
+  package='sdnsim',
+  syntax='proto3',
+  serialized_options=None,
+  create_key=_descriptor._internal_create_key,
+  serialized_pb=b'\n\x0csdnsim.proto\x12\x06sdnsim\"\xa0\x01\n\x11NumActiveFlowsRep\x12+\n\x15link_failure_sequence\x18\x01 \x03(\x0b\x32\x0c.sdnsim.Link\x12\x18\n\x10num_active_flows\x18\x02 \x03(\x04\x12.\n&time_taken_per_active_flow_computation\x18\x03 \x03(\x02\x12\x14\n\x0cpath_lengths\x18\x04 \x03(\x04\"\\\n\x14NumActiveFlowsParams\x12\x1b\n\x05\x66lows\x18\x01 \x03(\x0b\x32\x0c.sdnsim.Flow\x12\'\n\x04reps\x18\x02 \x03(\x0b\x32\x19.sdnsim.NumActiveFlowsRep\"p\n\x10MonteCarloParams\x12\x16\n\x0enum_iterations\x18\x01 \x01(\x04\x12\x19\n\x11link_failure_rate\x18\x02 \x01(\x02\x12\x1b\n\x05\x66lows\x18\x03 \x03(\x0b\x32\x0c.sdnsim.Flow\x12\x0c\n\x04seed\x18\x04 \x01(\x04\"Q\n\x12NumActiveFlowsInfo\x12\x12\n\ntime_taken\x18\x01 \x01(\x02\x12\'\n\x04reps\x18\x02 \x03(\x0b\x32\x19.sdnsim.NumActiveFlowsRep\"D\n\x14TimeToDisconnectInfo\x12\x12\n\ntime_taken\x18\x01 \x01(\x02\x12\x0c\n\x04mean\x18\x02 \x01(\x02\x12\n\n\x02sd\x18\x03 \x01(\x02\"$\n\x0eInitializeInfo\x12\x12\n\ntime_taken\x18\x01 \x01(\x02\"L\n\x10\x41\x63tivePathParams\x12\x1a\n\x04\x66low\x18\x01 \x01(\x0b\x32\x0c.sdnsim.Flow\x12\x1c\n\x05lmbda\x18\x02 \x01(\x0b\x32\r.sdnsim.Lmbda\"G\n\x0e\x41\x63tivePathInfo\x12\x12\n\ntime_taken\x18\x01 \x01(\x02\x12!\n\x05ports\x18\x02 \x03(\x0b\x32\x12.sdnsim.PolicyPort\")\n\x04Port\x12\x10\n\x08port_num\x18\x01 \x01(\x04\x12\x0f\n\x07hw_addr\x18\x02 \x01(\t\"q\n\x06\x41\x63tion\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x16\n\x0emodified_field\x18\x02 \x01(\t\x12\x16\n\x0emodified_value\x18\x03 \x01(\x04\x12\x17\n\x0foutput_port_num\x18\x04 \x01(\x04\x12\x10\n\x08group_id\x18\x05 \x01(\x05\"Q\n\x06\x42ucket\x12\x16\n\x0ewatch_port_num\x18\x01 \x01(\x04\x12\x0e\n\x06weight\x18\x02 \x01(\x05\x12\x1f\n\x07\x61\x63tions\x18\x03 \x03(\x0b\x32\x0e.sdnsim.Action\"B\n\x05Group\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\n\n\x02id\x18\x02 \x01(\x05\x12\x1f\n\x07\x62uckets\x18\x03 \x03(\x0b\x32\x0e.sdnsim.Bucket\"?\n\x15\x46lowRuleMatchFieldVal\x12\x13\n\x0bvalue_start\x18\x01 \x01(\x04\x12\x11\n\tvalue_end\x18\x02 \x01(\x04\"U\n\x0bInstruction\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x1f\n\x07\x61\x63tions\x18\x02 \x03(\x0b\x32\x0e.sdnsim.Action\x12\x17\n\x0fgo_to_table_num\x18\x03 \x01(\x05\"\xda\x01\n\x08\x46lowRule\x12\x10\n\x08priority\x18\x01 \x01(\x05\x12<\n\x0f\x66low_rule_match\x18\x02 \x03(\x0b\x32#.sdnsim.FlowRule.FlowRuleMatchEntry\x12)\n\x0cinstructions\x18\x03 \x03(\x0b\x32\x13.sdnsim.Instruction\x1aS\n\x12\x46lowRuleMatchEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12,\n\x05value\x18\x02 \x01(\x0b\x32\x1d.sdnsim.FlowRuleMatchFieldVal:\x02\x38\x01\"D\n\tFlowTable\x12\x11\n\ttable_num\x18\x01 \x01(\x05\x12$\n\nflow_rules\x18\x02 \x03(\x0b\x32\x10.sdnsim.FlowRule\"\x84\x01\n\x06Switch\x12\x11\n\tswitch_id\x18\x01 \x01(\t\x12\x1b\n\x05ports\x18\x02 \x03(\x0b\x32\x0c.sdnsim.Port\x12&\n\x0b\x66low_tables\x18\x03 \x03(\x0b\x32\x11.sdnsim.FlowTable\x12\"\n\x0bgroup_table\x18\x04 \x03(\x0b\x32\r.sdnsim.Group\"T\n\x04Host\x12\x11\n\thost_name\x18\x01 \x01(\t\x12\x10\n\x08host_MAC\x18\x02 \x01(\t\x12\x0f\n\x07host_IP\x18\x03 \x01(\t\x12\x16\n\x0ehost_switch_id\x18\x04 \x01(\t\"V\n\x04Link\x12\x10\n\x08src_node\x18\x01 \x01(\t\x12\x14\n\x0csrc_port_num\x18\x02 \x01(\x04\x12\x10\n\x08\x64st_node\x18\x03 \x01(\t\x12\x14\n\x0c\x64st_port_num\x18\x04 \x01(\x04\"~\n\x0cNetworkGraph\x12\x12\n\ncontroller\x18\x01 \x01(\t\x12 \n\x08switches\x18\x02 \x03(\x0b\x32\x0e.sdnsim.Switch\x12\x1b\n\x05hosts\x18\x03 \x03(\x0b\x32\x0c.sdnsim.Host\x12\x1b\n\x05links\x18\x04 \x03(\x0b\x32\x0c.sdnsim.Link\"1\n\nPolicyPort\x12\x11\n\tswitch_id\x18\x01 \x01(\t\x12\x10\n\x08port_num\x18\x02 \x01(\x04\"$\n\x05Lmbda\x12\x1b\n\x05links\x18\x01 \x03(\x0b\x32\x0c.sdnsim.Link\"\xbb\x01\n\x04\x46low\x12$\n\x08src_port\x18\x01 \x01(\x0b\x32\x12.sdnsim.PolicyPort\x12$\n\x08\x64st_port\x18\x02 \x01(\x0b\x32\x12.sdnsim.PolicyPort\x12\x33\n\x0cpolicy_match\x18\x03 \x03(\x0b\x32\x1d.sdnsim.Flow.PolicyMatchEntry\x1a\x32\n\x10PolicyMatchEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x04:\x02\x38\x01\x32\xbe\x02\n\x06SDNSim\x12<\n\nInitialize\x12\x14.sdnsim.NetworkGraph\x1a\x16.sdnsim.InitializeInfo\"\x00\x12G\n\x11GetActiveFlowPath\x12\x18.sdnsim.ActivePathParams\x1a\x16.sdnsim.ActivePathInfo\"\x00\x12O\n\x13GetTimeToDisconnect\x12\x18.sdnsim.MonteCarloParams\x1a\x1c.sdnsim.TimeToDisconnectInfo\"\x00\x12\\\n\x1eGetNumActiveFlowsWhenLinksFail\x12\x1c.sdnsim.NumActiveFlowsParams\x1a\x1a.sdnsim.NumActiveFlowsInfo\"\x00\x62\x06proto3'
+)
+
+
+
+
+_NUMACTIVEFLOWSREP = _descriptor.Descriptor(
+  name='NumActiveFlowsRep',
+  full_name='sdnsim.NumActiveFlowsRep',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='link_failure_sequence', full_name='sdnsim.NumActiveFlowsRep.link_failure_sequence', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='num_active_flows', full_name='sdnsim.NumActiveFlowsRep.num_active_flows', index=1,
+      number=2, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='time_taken_per_active_flow_computation', full_name='sdnsim.NumActiveFlowsRep.time_taken_per_active_flow_computation', index=2,
+      number=3, type=2, cpp_type=6, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='path_lengths', full_name='sdnsim.NumActiveFlowsRep.path_lengths', index=3,
+      number=4, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=25,
+  serialized_end=185,
+)
+
+
+_NUMACTIVEFLOWSPARAMS = _descriptor.Descriptor(
+  name='NumActiveFlowsParams',
+  full_name='sdnsim.NumActiveFlowsParams',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='flows', full_name='sdnsim.NumActiveFlowsParams.flows', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='reps', full_name='sdnsim.NumActiveFlowsParams.reps', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=187,
+  serialized_end=279,
+)
+
+
+_MONTECARLOPARAMS = _descriptor.Descriptor(
+  name='MonteCarloParams',
+  full_name='sdnsim.MonteCarloParams',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='num_iterations', full_name='sdnsim.MonteCarloParams.num_iterations', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='link_failure_rate', full_name='sdnsim.MonteCarloParams.link_failure_rate', index=1,
+      number=2, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='flows', full_name='sdnsim.MonteCarloParams.flows', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seed', full_name='sdnsim.MonteCarloParams.seed', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=281,
+  serialized_end=393,
+)
+
+
+_NUMACTIVEFLOWSINFO = _descriptor.Descriptor(
+  name='NumActiveFlowsInfo',
+  full_name='sdnsim.NumActiveFlowsInfo',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='time_taken', full_name='sdnsim.NumActiveFlowsInfo.time_taken', index=0,
+      number=1, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='reps', full_name='sdnsim.NumActiveFlowsInfo.reps', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=395,
+  serialized_end=476,
+)
+
+
+_TIMETODISCONNECTINFO = _descriptor.Descriptor(
+  name='TimeToDisconnectInfo',
+  full_name='sdnsim.TimeToDisconnectInfo',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='time_taken', full_name='sdnsim.TimeToDisconnectInfo.time_taken', index=0,
+      number=1, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='mean', full_name='sdnsim.TimeToDisconnectInfo.mean', index=1,
+      number=2, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='sd', full_name='sdnsim.TimeToDisconnectInfo.sd', index=2,
+      number=3, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=478,
+  serialized_end=546,
+)
+
+
+_INITIALIZEINFO = _descriptor.Descriptor(
+  name='InitializeInfo',
+  full_name='sdnsim.InitializeInfo',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='time_taken', full_name='sdnsim.InitializeInfo.time_taken', index=0,
+      number=1, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=548,
+  serialized_end=584,
+)
+
+
+_ACTIVEPATHPARAMS = _descriptor.Descriptor(
+  name='ActivePathParams',
+  full_name='sdnsim.ActivePathParams',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='flow', full_name='sdnsim.ActivePathParams.flow', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='lmbda', full_name='sdnsim.ActivePathParams.lmbda', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=586,
+  serialized_end=662,
+)
+
+
+_ACTIVEPATHINFO = _descriptor.Descriptor(
+  name='ActivePathInfo',
+  full_name='sdnsim.ActivePathInfo',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='time_taken', full_name='sdnsim.ActivePathInfo.time_taken', index=0,
+      number=1, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ports', full_name='sdnsim.ActivePathInfo.ports', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=664,
+  serialized_end=735,
+)
+
+
+_PORT = _descriptor.Descriptor(
+  name='Port',
+  full_name='sdnsim.Port',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='port_num', full_name='sdnsim.Port.port_num', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='hw_addr', full_name='sdnsim.Port.hw_addr', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=737,
+  serialized_end=778,
+)
+
+
+_ACTION = _descriptor.Descriptor(
+  name='Action',
+  full_name='sdnsim.Action',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='type', full_name='sdnsim.Action.type', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='modified_field', full_name='sdnsim.Action.modified_field', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='modified_value', full_name='sdnsim.Action.modified_value', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='output_port_num', full_name='sdnsim.Action.output_port_num', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='group_id', full_name='sdnsim.Action.group_id', index=4,
+      number=5, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=780,
+  serialized_end=893,
+)
+
+
+_BUCKET = _descriptor.Descriptor(
+  name='Bucket',
+  full_name='sdnsim.Bucket',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='watch_port_num', full_name='sdnsim.Bucket.watch_port_num', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='weight', full_name='sdnsim.Bucket.weight', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='actions', full_name='sdnsim.Bucket.actions', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=895,
+  serialized_end=976,
+)
+
+
+_GROUP = _descriptor.Descriptor(
+  name='Group',
+  full_name='sdnsim.Group',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='type', full_name='sdnsim.Group.type', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='id', full_name='sdnsim.Group.id', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='buckets', full_name='sdnsim.Group.buckets', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=978,
+  serialized_end=1044,
+)
+
+
+_FLOWRULEMATCHFIELDVAL = _descriptor.Descriptor(
+  name='FlowRuleMatchFieldVal',
+  full_name='sdnsim.FlowRuleMatchFieldVal',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='value_start', full_name='sdnsim.FlowRuleMatchFieldVal.value_start', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value_end', full_name='sdnsim.FlowRuleMatchFieldVal.value_end', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1046,
+  serialized_end=1109,
+)
+
+
+_INSTRUCTION = _descriptor.Descriptor(
+  name='Instruction',
+  full_name='sdnsim.Instruction',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='type', full_name='sdnsim.Instruction.type', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='actions', full_name='sdnsim.Instruction.actions', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='go_to_table_num', full_name='sdnsim.Instruction.go_to_table_num', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1111,
+  serialized_end=1196,
+)
+
+
+_FLOWRULE_FLOWRULEMATCHENTRY = _descriptor.Descriptor(
+  name='FlowRuleMatchEntry',
+  full_name='sdnsim.FlowRule.FlowRuleMatchEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='sdnsim.FlowRule.FlowRuleMatchEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='sdnsim.FlowRule.FlowRuleMatchEntry.value', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1334,
+  serialized_end=1417,
+)
+
+_FLOWRULE = _descriptor.Descriptor(
+  name='FlowRule',
+  full_name='sdnsim.FlowRule',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='priority', full_name='sdnsim.FlowRule.priority', index=0,
+      number=1, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='flow_rule_match', full_name='sdnsim.FlowRule.flow_rule_match', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='instructions', full_name='sdnsim.FlowRule.instructions', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_FLOWRULE_FLOWRULEMATCHENTRY, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1199,
+  serialized_end=1417,
+)
+
+
+_FLOWTABLE = _descriptor.Descriptor(
+  name='FlowTable',
+  full_name='sdnsim.FlowTable',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='table_num', full_name='sdnsim.FlowTable.table_num', index=0,
+      number=1, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='flow_rules', full_name='sdnsim.FlowTable.flow_rules', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1419,
+  serialized_end=1487,
+)
+
+
+_SWITCH = _descriptor.Descriptor(
+  name='Switch',
+  full_name='sdnsim.Switch',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='switch_id', full_name='sdnsim.Switch.switch_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ports', full_name='sdnsim.Switch.ports', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='flow_tables', full_name='sdnsim.Switch.flow_tables', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='group_table', full_name='sdnsim.Switch.group_table', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1490,
+  serialized_end=1622,
+)
+
+
+_HOST = _descriptor.Descriptor(
+  name='Host',
+  full_name='sdnsim.Host',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='host_name', full_name='sdnsim.Host.host_name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='host_MAC', full_name='sdnsim.Host.host_MAC', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='host_IP', full_name='sdnsim.Host.host_IP', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='host_switch_id', full_name='sdnsim.Host.host_switch_id', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1624,
+  serialized_end=1708,
+)
+
+
+_LINK = _descriptor.Descriptor(
+  name='Link',
+  full_name='sdnsim.Link',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='src_node', full_name='sdnsim.Link.src_node', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='src_port_num', full_name='sdnsim.Link.src_port_num', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='dst_node', full_name='sdnsim.Link.dst_node', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='dst_port_num', full_name='sdnsim.Link.dst_port_num', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1710,
+  serialized_end=1796,
+)
+
+
+_NETWORKGRAPH = _descriptor.Descriptor(
+  name='NetworkGraph',
+  full_name='sdnsim.NetworkGraph',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='controller', full_name='sdnsim.NetworkGraph.controller', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='switches', full_name='sdnsim.NetworkGraph.switches', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='hosts', full_name='sdnsim.NetworkGraph.hosts', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='links', full_name='sdnsim.NetworkGraph.links', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1798,
+  serialized_end=1924,
+)
+
+
+_POLICYPORT = _descriptor.Descriptor(
+  name='PolicyPort',
+  full_name='sdnsim.PolicyPort',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='switch_id', full_name='sdnsim.PolicyPort.switch_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='port_num', full_name='sdnsim.PolicyPort.port_num', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1926,
+  serialized_end=1975,
+)
+
+
+_LMBDA = _descriptor.Descriptor(
+  name='Lmbda',
+  full_name='sdnsim.Lmbda',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='links', full_name='sdnsim.Lmbda.links', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1977,
+  serialized_end=2013,
+)
+
+
+_FLOW_POLICYMATCHENTRY = _descriptor.Descriptor(
+  name='PolicyMatchEntry',
+  full_name='sdnsim.Flow.PolicyMatchEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='sdnsim.Flow.PolicyMatchEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='sdnsim.Flow.PolicyMatchEntry.value', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=b'8\001',
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2153,
+  serialized_end=2203,
+)
+
+_FLOW = _descriptor.Descriptor(
+  name='Flow',
+  full_name='sdnsim.Flow',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='src_port', full_name='sdnsim.Flow.src_port', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='dst_port', full_name='sdnsim.Flow.dst_port', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='policy_match', full_name='sdnsim.Flow.policy_match', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[_FLOW_POLICYMATCHENTRY, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2016,
+  serialized_end=2203,
+)
+
+_NUMACTIVEFLOWSREP.fields_by_name['link_failure_sequence'].message_type = _LINK
+_NUMACTIVEFLOWSPARAMS.fields_by_name['flows'].message_type = _FLOW
+_NUMACTIVEFLOWSPARAMS.fields_by_name['reps'].message_type = _NUMACTIVEFLOWSREP
+_MONTECARLOPARAMS.fields_by_name['flows'].message_type = _FLOW
+_NUMACTIVEFLOWSINFO.fields_by_name['reps'].message_type = _NUMACTIVEFLOWSREP
+_ACTIVEPATHPARAMS.fields_by_name['flow'].message_type = _FLOW
+_ACTIVEPATHPARAMS.fields_by_name['lmbda'].message_type = _LMBDA
+_ACTIVEPATHINFO.fields_by_name['ports'].message_type = _POLICYPORT
+_BUCKET.fields_by_name['actions'].message_type = _ACTION
+_GROUP.fields_by_name['buckets'].message_type = _BUCKET
+_INSTRUCTION.fields_by_name['actions'].message_type = _ACTION
+_FLOWRULE_FLOWRULEMATCHENTRY.fields_by_name['value'].message_type = _FLOWRULEMATCHFIELDVAL
+_FLOWRULE_FLOWRULEMATCHENTRY.containing_type = _FLOWRULE
+_FLOWRULE.fields_by_name['flow_rule_match'].message_type = _FLOWRULE_FLOWRULEMATCHENTRY
+_FLOWRULE.fields_by_name['instructions'].message_type = _INSTRUCTION
+_FLOWTABLE.fields_by_name['flow_rules'].message_type = _FLOWRULE
+_SWITCH.fields_by_name['ports'].message_type = _PORT
+_SWITCH.fields_by_name['flow_tables'].message_type = _FLOWTABLE
+_SWITCH.fields_by_name['group_table'].message_type = _GROUP
+_NETWORKGRAPH.fields_by_name['switches'].message_type = _SWITCH
+_NETWORKGRAPH.fields_by_name['hosts'].message_type = _HOST
+_NETWORKGRAPH.fields_by_name['links'].message_type = _LINK
+_LMBDA.fields_by_name['links'].message_type = _LINK
+_FLOW_POLICYMATCHENTRY.containing_type = _FLOW
+_FLOW.fields_by_name['src_port'].message_type = _POLICYPORT
+_FLOW.fields_by_name['dst_port'].message_type = _POLICYPORT
+_FLOW.fields_by_name['policy_match'].message_type = _FLOW_POLICYMATCHENTRY
+DESCRIPTOR.message_types_by_name['NumActiveFlowsRep'] = _NUMACTIVEFLOWSREP
+DESCRIPTOR.message_types_by_name['NumActiveFlowsParams'] = _NUMACTIVEFLOWSPARAMS
+DESCRIPTOR.message_types_by_name['MonteCarloParams'] = _MONTECARLOPARAMS
+DESCRIPTOR.message_types_by_name['NumActiveFlowsInfo'] = _NUMACTIVEFLOWSINFO
+DESCRIPTOR.message_types_by_name['TimeToDisconnectInfo'] = _TIMETODISCONNECTINFO
+DESCRIPTOR.message_types_by_name['InitializeInfo'] = _INITIALIZEINFO
+DESCRIPTOR.message_types_by_name['ActivePathParams'] = _ACTIVEPATHPARAMS
+DESCRIPTOR.message_types_by_name['ActivePathInfo'] = _ACTIVEPATHINFO
+DESCRIPTOR.message_types_by_name['Port'] = _PORT
+DESCRIPTOR.message_types_by_name['Action'] = _ACTION
+DESCRIPTOR.message_types_by_name['Bucket'] = _BUCKET
+DESCRIPTOR.message_types_by_name['Group'] = _GROUP
+DESCRIPTOR.message_types_by_name['FlowRuleMatchFieldVal'] = _FLOWRULEMATCHFIELDVAL
+DESCRIPTOR.message_types_by_name['Instruction'] = _INSTRUCTION
+DESCRIPTOR.message_types_by_name['FlowRule'] = _FLOWRULE
+DESCRIPTOR.message_types_by_name['FlowTable'] = _FLOWTABLE
+DESCRIPTOR.message_types_by_name['Switch'] = _SWITCH
+DESCRIPTOR.message_types_by_name['Host'] = _HOST
+DESCRIPTOR.message_types_by_name['Link'] = _LINK
+DESCRIPTOR.message_types_by_name['NetworkGraph'] = _NETWORKGRAPH
+DESCRIPTOR.message_types_by_name['PolicyPort'] = _POLICYPORT
+DESCRIPTOR.message_types_by_name['Lmbda'] = _LMBDA
+DESCRIPTOR.message_types_by_name['Flow'] = _FLOW
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
+
+NumActiveFlowsRep = _reflection.GeneratedProtocolMessageType('NumActiveFlowsRep', (_message.Message,), {
+  'DESCRIPTOR' : _NUMACTIVEFLOWSREP,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.NumActiveFlowsRep)
+  })
+_sym_db.RegisterMessage(NumActiveFlowsRep)
+
+NumActiveFlowsParams = _reflection.GeneratedProtocolMessageType('NumActiveFlowsParams', (_message.Message,), {
+  'DESCRIPTOR' : _NUMACTIVEFLOWSPARAMS,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.NumActiveFlowsParams)
+  })
+_sym_db.RegisterMessage(NumActiveFlowsParams)
+
+MonteCarloParams = _reflection.GeneratedProtocolMessageType('MonteCarloParams', (_message.Message,), {
+  'DESCRIPTOR' : _MONTECARLOPARAMS,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.MonteCarloParams)
+  })
+_sym_db.RegisterMessage(MonteCarloParams)
+
+NumActiveFlowsInfo = _reflection.GeneratedProtocolMessageType('NumActiveFlowsInfo', (_message.Message,), {
+  'DESCRIPTOR' : _NUMACTIVEFLOWSINFO,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.NumActiveFlowsInfo)
+  })
+_sym_db.RegisterMessage(NumActiveFlowsInfo)
+
+TimeToDisconnectInfo = _reflection.GeneratedProtocolMessageType('TimeToDisconnectInfo', (_message.Message,), {
+  'DESCRIPTOR' : _TIMETODISCONNECTINFO,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.TimeToDisconnectInfo)
+  })
+_sym_db.RegisterMessage(TimeToDisconnectInfo)
+
+InitializeInfo = _reflection.GeneratedProtocolMessageType('InitializeInfo', (_message.Message,), {
+  'DESCRIPTOR' : _INITIALIZEINFO,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.InitializeInfo)
+  })
+_sym_db.RegisterMessage(InitializeInfo)
+
+ActivePathParams = _reflection.GeneratedProtocolMessageType('ActivePathParams', (_message.Message,), {
+  'DESCRIPTOR' : _ACTIVEPATHPARAMS,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.ActivePathParams)
+  })
+_sym_db.RegisterMessage(ActivePathParams)
+
+ActivePathInfo = _reflection.GeneratedProtocolMessageType('ActivePathInfo', (_message.Message,), {
+  'DESCRIPTOR' : _ACTIVEPATHINFO,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.ActivePathInfo)
+  })
+_sym_db.RegisterMessage(ActivePathInfo)
+
+Port = _reflection.GeneratedProtocolMessageType('Port', (_message.Message,), {
+  'DESCRIPTOR' : _PORT,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Port)
+  })
+_sym_db.RegisterMessage(Port)
+
+Action = _reflection.GeneratedProtocolMessageType('Action', (_message.Message,), {
+  'DESCRIPTOR' : _ACTION,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Action)
+  })
+_sym_db.RegisterMessage(Action)
+
+Bucket = _reflection.GeneratedProtocolMessageType('Bucket', (_message.Message,), {
+  'DESCRIPTOR' : _BUCKET,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Bucket)
+  })
+_sym_db.RegisterMessage(Bucket)
+
+Group = _reflection.GeneratedProtocolMessageType('Group', (_message.Message,), {
+  'DESCRIPTOR' : _GROUP,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Group)
+  })
+_sym_db.RegisterMessage(Group)
+
+FlowRuleMatchFieldVal = _reflection.GeneratedProtocolMessageType('FlowRuleMatchFieldVal', (_message.Message,), {
+  'DESCRIPTOR' : _FLOWRULEMATCHFIELDVAL,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.FlowRuleMatchFieldVal)
+  })
+_sym_db.RegisterMessage(FlowRuleMatchFieldVal)
+
+Instruction = _reflection.GeneratedProtocolMessageType('Instruction', (_message.Message,), {
+  'DESCRIPTOR' : _INSTRUCTION,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Instruction)
+  })
+_sym_db.RegisterMessage(Instruction)
+
+FlowRule = _reflection.GeneratedProtocolMessageType('FlowRule', (_message.Message,), {
+
+  'FlowRuleMatchEntry' : _reflection.GeneratedProtocolMessageType('FlowRuleMatchEntry', (_message.Message,), {
+    'DESCRIPTOR' : _FLOWRULE_FLOWRULEMATCHENTRY,
+    '__module__' : 'sdnsim_pb2'
+    # @@protoc_insertion_point(class_scope:sdnsim.FlowRule.FlowRuleMatchEntry)
+    })
+  ,
+  'DESCRIPTOR' : _FLOWRULE,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.FlowRule)
+  })
+_sym_db.RegisterMessage(FlowRule)
+_sym_db.RegisterMessage(FlowRule.FlowRuleMatchEntry)
+
+FlowTable = _reflection.GeneratedProtocolMessageType('FlowTable', (_message.Message,), {
+  'DESCRIPTOR' : _FLOWTABLE,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.FlowTable)
+  })
+_sym_db.RegisterMessage(FlowTable)
+
+Switch = _reflection.GeneratedProtocolMessageType('Switch', (_message.Message,), {
+  'DESCRIPTOR' : _SWITCH,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Switch)
+  })
+_sym_db.RegisterMessage(Switch)
+
+Host = _reflection.GeneratedProtocolMessageType('Host', (_message.Message,), {
+  'DESCRIPTOR' : _HOST,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Host)
+  })
+_sym_db.RegisterMessage(Host)
+
+Link = _reflection.GeneratedProtocolMessageType('Link', (_message.Message,), {
+  'DESCRIPTOR' : _LINK,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Link)
+  })
+_sym_db.RegisterMessage(Link)
+
+NetworkGraph = _reflection.GeneratedProtocolMessageType('NetworkGraph', (_message.Message,), {
+  'DESCRIPTOR' : _NETWORKGRAPH,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.NetworkGraph)
+  })
+_sym_db.RegisterMessage(NetworkGraph)
+
+PolicyPort = _reflection.GeneratedProtocolMessageType('PolicyPort', (_message.Message,), {
+  'DESCRIPTOR' : _POLICYPORT,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.PolicyPort)
+  })
+_sym_db.RegisterMessage(PolicyPort)
+
+Lmbda = _reflection.GeneratedProtocolMessageType('Lmbda', (_message.Message,), {
+  'DESCRIPTOR' : _LMBDA,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Lmbda)
+  })
+_sym_db.RegisterMessage(Lmbda)
+
+Flow = _reflection.GeneratedProtocolMessageType('Flow', (_message.Message,), {
+
+  'PolicyMatchEntry' : _reflection.GeneratedProtocolMessageType('PolicyMatchEntry', (_message.Message,), {
+    'DESCRIPTOR' : _FLOW_POLICYMATCHENTRY,
+    '__module__' : 'sdnsim_pb2'
+    # @@protoc_insertion_point(class_scope:sdnsim.Flow.PolicyMatchEntry)
+    })
+  ,
+  'DESCRIPTOR' : _FLOW,
+  '__module__' : 'sdnsim_pb2'
+  # @@protoc_insertion_point(class_scope:sdnsim.Flow)
+  })
+_sym_db.RegisterMessage(Flow)
+_sym_db.RegisterMessage(Flow.PolicyMatchEntry)
+
+
+_FLOWRULE_FLOWRULEMATCHENTRY._options = None
+_FLOW_POLICYMATCHENTRY._options = None
+
+_SDNSIM = _descriptor.ServiceDescriptor(
+  name='SDNSim',
+  full_name='sdnsim.SDNSim',
+  file=DESCRIPTOR,
+  index=0,
+  serialized_options=None,
+  create_key=_descriptor._internal_create_key,
+  serialized_start=2206,
+  serialized_end=2524,
+  methods=[
+  _descriptor.MethodDescriptor(
+    name='Initialize',
+    full_name='sdnsim.SDNSim.Initialize',
+    index=0,
+    containing_service=None,
+    input_type=_NETWORKGRAPH,
+    output_type=_INITIALIZEINFO,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetActiveFlowPath',
+    full_name='sdnsim.SDNSim.GetActiveFlowPath',
+    index=1,
+    containing_service=None,
+    input_type=_ACTIVEPATHPARAMS,
+    output_type=_ACTIVEPATHINFO,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetTimeToDisconnect',
+    full_name='sdnsim.SDNSim.GetTimeToDisconnect',
+    index=2,
+    containing_service=None,
+    input_type=_MONTECARLOPARAMS,
+    output_type=_TIMETODISCONNECTINFO,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetNumActiveFlowsWhenLinksFail',
+    full_name='sdnsim.SDNSim.GetNumActiveFlowsWhenLinksFail',
+    index=3,
+    containing_service=None,
+    input_type=_NUMACTIVEFLOWSPARAMS,
+    output_type=_NUMACTIVEFLOWSINFO,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+])
+_sym_db.RegisterServiceDescriptor(_SDNSIM)
+
+DESCRIPTOR.services_by_name['SDNSim'] = _SDNSIM
+
+# @@protoc_insertion_point(module_scope)
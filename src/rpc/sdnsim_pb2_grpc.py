@@ -0,0 +1,165 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+import sdnsim_pb2 as sdnsim__pb2
+
+
+class SDNSimStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Initialize = channel.unary_unary(
+                '/sdnsim.SDNSim/Initialize',
+                request_serializer=sdnsim__pb2.NetworkGraph.SerializeToString,
+                response_deserializer=sdnsim__pb2.InitializeInfo.FromString,
+                )
+        self.GetActiveFlowPath = channel.unary_unary(
+                '/sdnsim.SDNSim/GetActiveFlowPath',
+                request_serializer=sdnsim__pb2.ActivePathParams.SerializeToString,
+                response_deserializer=sdnsim__pb2.ActivePathInfo.FromString,
+                )
+        self.GetTimeToDisconnect = channel.unary_unary(
+                '/sdnsim.SDNSim/GetTimeToDisconnect',
+                request_serializer=sdnsim__pb2.MonteCarloParams.SerializeToString,
+                response_deserializer=sdnsim__pb2.TimeToDisconnectInfo.FromString,
+                )
+        self.GetNumActiveFlowsWhenLinksFail = channel.unary_unary(
+                '/sdnsim.SDNSim/GetNumActiveFlowsWhenLinksFail',
+                request_serializer=sdnsim__pb2.NumActiveFlowsParams.SerializeToString,
+                response_deserializer=sdnsim__pb2.NumActiveFlowsInfo.FromString,
+                )
+
+
+class SDNSimServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Initialize(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetActiveFlowPath(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTimeToDisconnect(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNumActiveFlowsWhenLinksFail(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_SDNSimServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Initialize': grpc.unary_unary_rpc_method_handler(
+                    servicer.Initialize,
+                    request_deserializer=sdnsim__pb2.NetworkGraph.FromString,
+                    response_serializer=sdnsim__pb2.InitializeInfo.SerializeToString,
+            ),
+            'GetActiveFlowPath': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetActiveFlowPath,
+                    request_deserializer=sdnsim__pb2.ActivePathParams.FromString,
+                    response_serializer=sdnsim__pb2.ActivePathInfo.SerializeToString,
+            ),
+            'GetTimeToDisconnect': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTimeToDisconnect,
+                    request_deserializer=sdnsim__pb2.MonteCarloParams.FromString,
+                    response_serializer=sdnsim__pb2.TimeToDisconnectInfo.SerializeToString,
+            ),
+            'GetNumActiveFlowsWhenLinksFail': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNumActiveFlowsWhenLinksFail,
+                    request_deserializer=sdnsim__pb2.NumActiveFlowsParams.FromString,
+                    response_serializer=sdnsim__pb2.NumActiveFlowsInfo.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'sdnsim.SDNSim', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class SDNSim(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Initialize(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sdnsim.SDNSim/Initialize',
+            sdnsim__pb2.NetworkGraph.SerializeToString,
+            sdnsim__pb2.InitializeInfo.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetActiveFlowPath(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sdnsim.SDNSim/GetActiveFlowPath',
+            sdnsim__pb2.ActivePathParams.SerializeToString,
+            sdnsim__pb2.ActivePathInfo.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTimeToDisconnect(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sdnsim.SDNSim/GetTimeToDisconnect',
+            sdnsim__pb2.MonteCarloParams.SerializeToString,
+            sdnsim__pb2.TimeToDisconnectInfo.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetNumActiveFlowsWhenLinksFail(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/sdnsim.SDNSim/GetNumActiveFlowsWhenLinksFail',
+            sdnsim__pb2.NumActiveFlowsParams.SerializeToString,
+            sdnsim__pb2.NumActiveFlowsInfo.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -3,15 +3,27 @@ __author__ = 'Rakesh Kumar'
 import networkx as nx
 import sys
 import json
+import multiprocessing
 
 from collections import defaultdict
 from copy import deepcopy
 from model.intent import Intent
 
+# The AboresceneSynthesis and the flow match, as seen by the processes of the pool that synthesizes for each of the
+# destination switches. It is set before the pool is started, so the processes get it as they are forked.
+synthesis_pool_context = None
+
+
+def synthesize_dst_sw_in_pool(dst_sw_id):
+
+    synthesis, flow_match = synthesis_pool_context
+
+    return synthesis.synthesize_dst_sw(dst_sw_id, flow_match)
+
 
 class AboresceneSynthesis(object):
 
-    def __init__(self, params):
+    def __init__(self, params, controller):
 
         self.network_graph = None
         self.network_configuration = None
@@ -32,8 +44,20 @@ class AboresceneSynthesis(object):
 
         self.apply_group_intents_immediately = params["apply_group_intents_immediately"]
 
+        # Number of processes that synthesize for the destination switches, at the same time when more than one
+        self.num_processes = params.get("num_processes", 1)
+
+        # The flows and groups from the pool are given new ids before they are pushed, which is only done for ryu
+        if self.num_processes > 1 and controller != "ryu":
+            raise NotImplementedError("Synthesis in a pool is only available for ryu")
+
         self.sw_intent_lists = defaultdict(defaultdict)
 
+        # The flows and groups pushed for each (src_sw_id, dst_sw_id), so that the ones for the destinations whose
+        # aborescenes change along with a link can be replaced
+        self.flow_match = None
+        self.sw_dst_changes = dict()
+
         # As a packet arrives, these are the tables it is evaluated against, in this order:
 
         # If the packet belongs to a local host, just pop any tags and send it along.
@@ -52,7 +76,7 @@ class AboresceneSynthesis(object):
     def __str__(self):
         params_str = ''
         for k, v in self.params.items():
-            if k == "dst_k_eda_path":
+            if k in ["dst_k_eda_path", "num_processes"]:
                 continue
             params_str += "_" + str(k) + "_" + str(v)
         return self.__class__.__name__ + params_str
@@ -290,23 +314,106 @@ class AboresceneSynthesis(object):
             flow_match,
             self.apply_group_intents_immediately)
 
+    def get_sw_dst_changes(self, src_sw, dst_sw, flow_match):
+
+        '''
+        :return: The flows and groups at src_sw for the traffic headed to dst_sw, as (sw, change_type, content)
+        '''
+
+        self.synthesis_lib.held_changes = []
+
+        try:
+            # Install the rules to put the vlan tags on for hosts that are at this destination switch
+            self.push_src_sw_vlan_push_intents(src_sw, dst_sw, flow_match)
+
+            # Install flow rules for 1st ... k - 1 aborescene
+            self.install_failover_group_vlan_tag_flow(src_sw, dst_sw)
+
+            # Install the flow rules for the bolt-back case on 1st -- k -1 aborescene
+            self.bolt_back_failover_group_vlan_tag_flow(src_sw, dst_sw)
+
+            # Install the flow rules for the kth aborescene...
+            self.install_all_group_vlan_tag_flow(src_sw, dst_sw)
+
+            return self.synthesis_lib.held_changes
+
+        finally:
+            self.synthesis_lib.held_changes = None
+
+    def push_changes(self, changes):
+        for sw, change_type, content in changes:
+            if change_type == "flow":
+                self.synthesis_lib.push_flow(sw, content)
+            else:
+                self.synthesis_lib.push_group(sw, content)
+
     def push_sw_intent_lists(self, flow_match):
 
         for src_sw in self.sw_intent_lists:
             print "-- Pushing at Switch:", src_sw.node_id
             for dst_sw in self.sw_intent_lists[src_sw]:
+                changes = self.get_sw_dst_changes(src_sw, dst_sw, flow_match)
+                self.sw_dst_changes[(src_sw.node_id, dst_sw.node_id)] = changes
+                self.push_changes(changes)
+
+    def get_flow_key(self, flow):
+        return flow["table_id"], flow["priority"], json.dumps(flow["match"], sort_keys=True)
+
+    # The same flows and groups give the same key, whatever ids the groups were given
+    def get_changes_key(self, changes):
+
+        group_ids = dict()
+        changes_key = []
+
+        for sw, change_type, content in changes:
+            content = deepcopy(content)
+
+            if change_type == "group":
+                group_ids[content["group_id"]] = len(group_ids)
+                content["group_id"] = group_ids[content["group_id"]]
+            else:
+                del content["cookie"]
+                for instruction in content["instructions"]:
+                    for action in instruction.get("actions", []):
+                        if action["type"] == "GROUP":
+                            action["group_id"] = group_ids[action["group_id"]]
+
+            changes_key.append((sw, change_type, json.dumps(content, sort_keys=True)))
 
-                # Install the rules to put the vlan tags on for hosts that are at this destination switch
-                self.push_src_sw_vlan_push_intents(src_sw, dst_sw, flow_match)
+        return changes_key
 
-                # Install flow rules for 1st ... k - 1 aborescene
-                self.install_failover_group_vlan_tag_flow(src_sw, dst_sw)
+    def replace_sw_dst_changes(self, src_sw_id, dst_sw_id, changes):
 
-                # Install the flow rules for the bolt-back case on 1st -- k -1 aborescene
-                self.bolt_back_failover_group_vlan_tag_flow(src_sw, dst_sw)
+        '''
+        Pushes the given flows and groups for the traffic at src_sw_id headed to dst_sw_id in place of the ones pushed
+        for it before, unless they are the same.
+        :return: True if anything was pushed or deleted
+        '''
 
-                # Install the flow rules for the kth aborescene...
-                self.install_all_group_vlan_tag_flow(src_sw, dst_sw)
+        prev_changes = self.sw_dst_changes.pop((src_sw_id, dst_sw_id), [])
+
+        if self.get_changes_key(changes) == self.get_changes_key(prev_changes):
+            if prev_changes:
+                self.sw_dst_changes[(src_sw_id, dst_sw_id)] = prev_changes
+            return False
+
+        # The new flows replace the previous ones with the same match and priority in place, so the previous groups
+        # go only after the new flows point to the new groups and the previous flows that are left are gone
+        self.push_changes(changes)
+
+        flow_keys = set(self.get_flow_key(content) for sw, change_type, content in changes if change_type == "flow")
+        for sw, change_type, content in prev_changes:
+            if change_type == "flow" and self.get_flow_key(content) not in flow_keys:
+                self.synthesis_lib.delete_flow(sw, content)
+
+        for sw, change_type, content in prev_changes:
+            if change_type == "group":
+                self.synthesis_lib.delete_group(sw, content)
+
+        if changes:
+            self.sw_dst_changes[(src_sw_id, dst_sw_id)] = changes
+
+        return True
 
     def push_src_sw_vlan_push_intents(self, src_sw, dst_sw, flow_match):
         for h_obj in dst_sw.attached_hosts:
@@ -415,10 +522,186 @@ class AboresceneSynthesis(object):
                     total_path = primary_path_chunk + failover_path
                     self.record_host_host_primary_paths(src_sw_node, dst_sw_node, total_path, e)
 
+    def compute_dst_sw_intent_lists(self, dst_sw, flow_match):
+
+        k_eda = []
+        for edges in self.dst_k_eda[dst_sw.node_id]:
+            k_eda.append(nx.MultiDiGraph(edges))
+
+        self.k_eda[dst_sw.node_id] = k_eda
+
+        self.record_paths(dst_sw, k_eda)
+
+        for i in range(self.params["k"]):
+            self.compute_sw_intent_lists(dst_sw, flow_match, k_eda[i], i+1)
+
+    # All of the arcs weigh the same, except for the ones back along an arc of an earlier aborescene, so an added
+    # link could only make for better aborescenes if some of them are missing, leave out a switch or take such an arc
+    def is_k_eda_improvable(self, k_eda_edges, switch_ids):
+
+        if len(k_eda_edges) < self.params["k"]:
+            return True
+
+        earlier_edges = set()
+        for edges in k_eda_edges:
+            if set(n for e in edges for n in e) != switch_ids:
+                return True
+
+            if any((e[1], e[0]) in earlier_edges for e in edges):
+                return True
+
+            earlier_edges.update(edges)
+
+        return False
+
+    def synthesize_link_change(self, node1_id, node2_id):
+
+        '''
+        Brings the flows and groups up to date after the link between node1_id and node2_id has been added to or
+        removed from the network graph. Only the aborescenes of the destinations that used the link, or that could
+        come out better with it, are computed again, and only the flows and groups for the switches whose part in
+        them changed are pushed and deleted.
+        :return: The ids of the destination switches whose aborescenes changed
+        '''
+
+        is_added = self.network_graph.graph.has_edge(node1_id, node2_id)
+        link_edges = [(node1_id, node2_id), (node2_id, node1_id)]
+        switch_ids = set(self.get_mdg().nodes())
+
+        changed_dst_sw_ids = []
+
+        for dst_sw in self.network_graph.get_switches():
+
+            if dst_sw.node_id not in self.dst_k_eda:
+                continue
+
+            k_eda_edges = [[tuple(e) for e in edges] for edges in self.dst_k_eda[dst_sw.node_id]]
+
+            if is_added:
+                if not self.is_k_eda_improvable(k_eda_edges, switch_ids):
+                    continue
+            elif not any(e in edges for edges in k_eda_edges for e in link_edges):
+                continue
+
+            new_k_eda_edges = [list(x.edges()) for x in self.compute_k_edge_disjoint_aborescenes(dst_sw)]
+            if map(sorted, new_k_eda_edges) == map(sorted, k_eda_edges):
+                continue
+
+            self.dst_k_eda[dst_sw.node_id] = new_k_eda_edges
+            changed_dst_sw_ids.append(dst_sw.node_id)
+
+            for src_sw in self.sw_intent_lists:
+                self.sw_intent_lists[src_sw].pop(dst_sw, None)
+
+            for h_obj in dst_sw.attached_hosts:
+                self.synthesis_lib.forget_synthesized_paths(h_obj)
+
+            self.compute_dst_sw_intent_lists(dst_sw, self.flow_match)
+
+            prev_src_sw_ids = set(src_sw_id for src_sw_id, dst_sw_id in self.sw_dst_changes
+                                  if dst_sw_id == dst_sw.node_id)
+
+            for src_sw in self.sw_intent_lists:
+                if dst_sw in self.sw_intent_lists[src_sw]:
+                    prev_src_sw_ids.discard(src_sw.node_id)
+                    changes = self.get_sw_dst_changes(src_sw, dst_sw, self.flow_match)
+                    self.replace_sw_dst_changes(src_sw.node_id, dst_sw.node_id, changes)
+
+            # Switches that are no longer on any of the aborescenes
+            for src_sw_id in prev_src_sw_ids:
+                self.replace_sw_dst_changes(src_sw_id, dst_sw.node_id, [])
+
+        with open(self.network_configuration.conf_path + "/dst_k_eda.json", "w") as outfile:
+            json.dump(self.dst_k_eda, outfile, indent=4)
+
         self.synthesis_lib.save_synthesized_paths(self.network_configuration.conf_path)
+        self.synthesis_lib.flush_changes()
+
+        return changed_dst_sw_ids
+
+    def synthesize_dst_sw(self, dst_sw_id, flow_match):
+
+        '''
+        Does, in a process of the pool, all of the synthesis for the traffic headed to dst_sw_id that does not depend
+        on the other destination switches. Nothing is pushed, the flows and groups come back with the ids given out
+        in this process.
+        :return: (k_eda edges, intent lists per src_sw_id, list of (src_sw_id, changes) in the switch order,
+        primary paths, failover paths)
+        '''
+
+        dst_sw = self.network_graph.get_node_object(dst_sw_id)
+
+        if dst_sw_id not in self.dst_k_eda:
+            self.dst_k_eda[dst_sw_id] = [list(x.edges()) for x in self.compute_k_edge_disjoint_aborescenes(dst_sw)]
+
+        # Just the ones for this dst_sw, a process goes through more than one of them
+        self.sw_intent_lists = defaultdict(defaultdict)
+        self.synthesis_lib.synthesized_primary_paths = defaultdict(defaultdict)
+        self.synthesis_lib.synthesized_failover_paths = defaultdict(defaultdict)
+
+        self.compute_dst_sw_intent_lists(dst_sw, flow_match)
+
+        sw_intent_lists = dict()
+        sw_changes = []
+        for src_sw in self.network_graph.get_switches():
+            if src_sw in self.sw_intent_lists and dst_sw in self.sw_intent_lists[src_sw]:
+                sw_intent_lists[src_sw.node_id] = self.sw_intent_lists[src_sw][dst_sw]
+                sw_changes.append((src_sw.node_id, self.get_sw_dst_changes(src_sw, dst_sw, flow_match)))
+
+        return (self.dst_k_eda[dst_sw_id],
+                sw_intent_lists,
+                sw_changes,
+                self.synthesis_lib.synthesized_primary_paths,
+                self.synthesis_lib.synthesized_failover_paths)
+
+    def synthesize_dst_switches_in_pool(self, dst_switches, flow_match):
+
+        '''
+        Synthesizes for the destination switches in a pool of processes forked before anything is computed for any of
+        them. What comes back is merged in the order of dst_switches, with the groups and flows given their ids here,
+        so that the ids and the order of the pushes do not depend on which process is done first.
+        :param dst_switches: Destination switches, with attached hosts
+        :param flow_match: Match of the traffic being synthesized for
+        :return: None
+        '''
+
+        global synthesis_pool_context
+
+        synthesis_pool_context = (self, flow_match)
+
+        pool = multiprocessing.Pool(self.num_processes)
+        try:
+            results = pool.map(synthesize_dst_sw_in_pool, [dst_sw.node_id for dst_sw in dst_switches], chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+            synthesis_pool_context = None
+
+        for dst_sw, (k_eda_edges, sw_intent_lists, sw_changes, primary_paths, failover_paths) in \
+                zip(dst_switches, results):
+
+            self.dst_k_eda[dst_sw.node_id] = k_eda_edges
+
+            k_eda = []
+            for edges in k_eda_edges:
+                k_eda.append(nx.MultiDiGraph(edges))
+
+            self.k_eda[dst_sw.node_id] = k_eda
+
+            for src_sw_id, intent_list in sw_intent_lists.items():
+                self.sw_intent_lists[self.network_graph.get_node_object(src_sw_id)][dst_sw] = intent_list
+
+            self.synthesis_lib.merge_synthesized_paths(primary_paths, failover_paths)
+
+            for src_sw_id, changes in sw_changes:
+                changes = self.synthesis_lib.renumber_changes(changes)
+                self.sw_dst_changes[(src_sw_id, dst_sw.node_id)] = changes
+                self.push_changes(changes)
 
     def synthesize_all_switches(self, flow_match):
 
+        self.flow_match = flow_match
+
         if "dst_k_eda_path" in self.params:
             with open(self.params["dst_k_eda_path"], "r") as infile:
                 self.dst_k_eda = dict()
@@ -431,14 +714,15 @@ class AboresceneSynthesis(object):
 
         else:
             self.dst_k_eda = dict()
-            # For each possible switch that can be a destination for traffic
-            for dst_sw in self.network_graph.get_switches():
-                if dst_sw.attached_hosts:
-                    k_eda = self.compute_k_edge_disjoint_aborescenes(dst_sw)
-                    self.dst_k_eda[dst_sw.node_id] = [list(x.edges()) for x in k_eda]
 
-            with open(self.network_configuration.conf_path + "/dst_k_eda.json", "w") as outfile:
-                json.dump(self.dst_k_eda, outfile, indent=4)
+            # In a pool, these are computed along with everything else for each destination switch
+            if self.num_processes == 1:
+
+                # For each possible switch that can be a destination for traffic
+                for dst_sw in self.network_graph.get_switches():
+                    if dst_sw.attached_hosts:
+                        k_eda = self.compute_k_edge_disjoint_aborescenes(dst_sw)
+                        self.dst_k_eda[dst_sw.node_id] = [list(x.edges()) for x in k_eda]
 
         # For each possible switch that can be a destination for traffic
         for dst_sw in self.network_graph.get_switches():
@@ -457,15 +741,17 @@ class AboresceneSynthesis(object):
 
                 self.push_local_mac_forwarding_rules_rules(dst_sw, flow_match)
 
-                k_eda = []
-                for edges in self.dst_k_eda[dst_sw.node_id]:
-                    k_eda.append(nx.MultiDiGraph(edges))
-
-                self.k_eda[dst_sw.node_id] = k_eda
+                if self.num_processes == 1:
+                    self.compute_dst_sw_intent_lists(dst_sw, flow_match)
 
-                self.record_paths(dst_sw, k_eda)
+        if self.num_processes > 1:
+            self.synthesize_dst_switches_in_pool([dst_sw for dst_sw in self.network_graph.get_switches()
+                                                  if dst_sw.attached_hosts], flow_match)
+        else:
+            self.push_sw_intent_lists(flow_match)
 
-                for i in range(self.params["k"]):
-                    self.compute_sw_intent_lists(dst_sw, flow_match, k_eda[i], i+1)
+        if "dst_k_eda_path" not in self.params:
+            with open(self.network_configuration.conf_path + "/dst_k_eda.json", "w") as outfile:
+                json.dump(self.dst_k_eda, outfile, indent=4)
 
-        self.push_sw_intent_lists(flow_match)
+        self.synthesis_lib.save_synthesized_paths(self.network_configuration.conf_path)
@@ -25,6 +25,12 @@ class DijkstraSynthesis(object):
 
         self.primary_path_edges = []
 
+        # Paths only depend on the switches they are between, not the hosts, so they are kept here for all of the
+        # host pairs. Both are thrown away when a link or port changes state.
+        self.primary_paths = {}
+        self.backup_paths = {}
+        self.paths_port_state_key = None
+
         self.apply_tag_intents_immediately = True
         self.apply_other_intents_immediately = True
 
@@ -257,6 +263,46 @@ class DijkstraSynthesis(object):
                                                     self.vlan_tag_push_rules_table_id,
                                                     group_id, True)
 
+    def check_paths_port_state(self):
+        port_state_key = self.network_graph.get_port_state_key()
+        if port_state_key != self.paths_port_state_key:
+            self.primary_paths = {}
+            self.backup_paths = {}
+            self.paths_port_state_key = port_state_key
+
+    def get_primary_path(self, src_sw_id, dst_sw_id):
+
+        self.check_paths_port_state()
+
+        if (src_sw_id, dst_sw_id) not in self.primary_paths:
+            self.primary_paths[(src_sw_id, dst_sw_id)] = nx.shortest_path(self.network_graph.graph,
+                                                                          source=src_sw_id,
+                                                                          target=dst_sw_id,
+                                                                          weight='weight')
+
+        return self.primary_paths[(src_sw_id, dst_sw_id)]
+
+    def get_backup_path(self, node_id, dst_sw_id, excluded_edge):
+
+        '''
+        :return: The shortest path from node_id to dst_sw_id that does not use excluded_edge, None if there is none
+        '''
+
+        self.check_paths_port_state()
+
+        if (node_id, dst_sw_id, excluded_edge) not in self.backup_paths:
+
+            # The edge is only hidden in a view, the graph and its link data stay as they are
+            g = nx.restricted_view(self.network_graph.graph, [], [excluded_edge])
+            try:
+                bp = nx.shortest_path(g, source=node_id, target=dst_sw_id)
+            except nx.exception.NetworkXNoPath:
+                bp = None
+
+            self.backup_paths[(node_id, dst_sw_id, excluded_edge)] = bp
+
+        return self.backup_paths[(node_id, dst_sw_id, excluded_edge)]
+
     def synthesize_flow(self, src_host, dst_host, flow_match):
 
         if src_host.node_id == 'h91' and dst_host.node_id == 'h451':
@@ -280,10 +326,7 @@ class DijkstraSynthesis(object):
         #     else:
         #         self.network_graph.graph['s1']['s2']['weight'] = 1.5
 
-        p = nx.shortest_path(self.network_graph.graph,
-                             source=src_host.sw.node_id,
-                             target=dst_host.sw.node_id,
-                             weight='weight')
+        p = self.get_primary_path(src_host.sw.node_id, dst_host.sw.node_id)
 
         print "Primary Path:", p
 
@@ -319,13 +362,10 @@ class DijkstraSynthesis(object):
             if i > 0:
                 switch_port_tuple_prefix_list.append((p[i-1], prev_in_port, prev_out_port))
 
-            # Delete the edge
-            self.network_graph.graph.remove_edge(p[i], p[i + 1])
-
             # Find the shortest path that results when the link breaks
             # and compute forwarding intents for that
-            try:
-                bp = nx.shortest_path(self.network_graph.graph, source=p[i], target=dst_host.sw.node_id)
+            bp = self.get_backup_path(p[i], dst_host.sw.node_id, (p[i], p[i + 1]))
+            if bp:
                 print "Backup Path from src:", p[i], "to destination:", dst_host.sw.node_id, "is:", bp
 
                 if i == 0:
@@ -350,12 +390,9 @@ class DijkstraSynthesis(object):
                                                   edge_broken=(p[i], p[i+1]),
                                                   switch_port_tuple_prefix_list=switch_port_tuple_prefix_list)
 
-            except nx.exception.NetworkXNoPath:
+            else:
                 print "No backup path between:", p[i], "to:", dst_host.sw.node_id
 
-            # Add the edge back and the data that goes along with it
-            self.network_graph.add_link(p[i], edge_ports_dict[p[i]], p[i + 1], edge_ports_dict[p[i + 1]])
-
             prev_in_port = in_port
             prev_out_port = edge_ports_dict[p[i]]
 
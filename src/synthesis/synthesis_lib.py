@@ -6,15 +6,21 @@ import json
 import os
 import sys
 import urllib
+import socket
+import httplib
+import httplib2
+import Queue
+import threading
 
 from model.match import Match
 
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
 
 class SynthesisLib(object):
 
-    def __init__(self, controller_host, controller_port, network_graph, network_configuration):
+    def __init__(self, controller_host, controller_port, network_graph, network_configuration, offline=False):
 
         self.network_graph = network_graph
         self.network_configuration = network_configuration
@@ -27,10 +33,38 @@ class SynthesisLib(object):
         self.queue_id_cntr = 1
 
         self.h = self.network_configuration.h
+
+        # Flows and groups wait in a queue per switch until flush_changes, which pushes the queues of different
+        # switches at the same time, each over a keep-alive connection from a pool of at most num_connections
+        self.queued_changes = defaultdict(list)
+        self.num_queued_changes = 0
+        self.max_queued_changes = 1000
+        self.num_connections = 4
+        self.connection_pool = Queue.Queue()
+
+        # Time to wait before each push, goes up while the controller is turning pushes away and back down after.
+        # It is shared by the threads that flush_changes pushes with, so it is only changed with the lock held.
+        self.push_delay = 0.0
+        self.push_delay_lock = threading.Lock()
+        self.min_push_delay = 0.05
+        self.max_push_delay = 5.0
+        self.max_push_attempts = 8
+
+        # When not None, the flows and groups are put in here as (sw, change_type, content) instead of being pushed
+        self.held_changes = None
+
         self.synthesized_primary_paths = defaultdict(defaultdict)
         self.synthesized_failover_paths = defaultdict(defaultdict)
 
-        if self.network_graph.controller == "onos":
+        # When offline, nothing is pushed to a controller, the flows and groups are kept here per dpid instead,
+        # the way Ryu gives them back in stats/flow and stats/groupdesc
+        self.offline = offline
+        self.offline_switches = defaultdict(dict)
+
+        if self.offline:
+            if self.network_graph.controller != "ryu":
+                raise NotImplementedError("Offline synthesis is only available for ryu")
+        elif self.network_graph.controller == "onos":
             self.onos_app_id = "50"
             self.delete_all_onos_rules()
             self.delete_all_onos_groups()
@@ -89,6 +123,22 @@ class SynthesisLib(object):
 
         self.synthesized_failover_paths[src_host.node_id][dst_host.node_id][e[0]][e[1]] = port_path
 
+    def forget_synthesized_paths(self, dst_host):
+
+        for src_host_id in self.synthesized_primary_paths:
+            self.synthesized_primary_paths[src_host_id].pop(dst_host.node_id, None)
+
+        for src_host_id in self.synthesized_failover_paths:
+            self.synthesized_failover_paths[src_host_id].pop(dst_host.node_id, None)
+
+    def merge_synthesized_paths(self, synthesized_primary_paths, synthesized_failover_paths):
+
+        for src_host_id in synthesized_primary_paths:
+            self.synthesized_primary_paths[src_host_id].update(synthesized_primary_paths[src_host_id])
+
+        for src_host_id in synthesized_failover_paths:
+            self.synthesized_failover_paths[src_host_id].update(synthesized_failover_paths[src_host_id])
+
     def save_synthesized_paths(self, conf_path):
         with open(conf_path + "synthesized_primary_paths.json", "w") as outfile:
             json.dump(self.synthesized_primary_paths, outfile, indent=4)
@@ -99,6 +149,11 @@ class SynthesisLib(object):
     def push_queue(self, sw, port, min_rate, max_rate):
 
         self.queue_id_cntr = self.queue_id_cntr + 1
+
+        # Queues are configured on the switch ports, there is nothing to keep for them in the flow tables
+        if self.offline:
+            return self.queue_id_cntr
+
         min_rate_str = str(min_rate * 1000000)
         max_rate_str = str(max_rate * 1000000)
         sw_port_str = sw + "-" + "eth" + str(port)
@@ -120,29 +175,110 @@ class SynthesisLib(object):
             if node.linked_key == "OpenFlow:{}".format(switch[1:]):
                 return node.id
 
-    def push_change(self, url, pushed_content):
+    def get_connection(self):
+        try:
+            return self.connection_pool.get_nowait()
+        except Queue.Empty:
+            h = httplib2.Http()
+            h.add_credentials(self.network_configuration.controller_api_user_name,
+                              self.network_configuration.controller_api_password)
+            return h
+
+    def update_push_delay(self, is_pushed):
+        with self.push_delay_lock:
+            if is_pushed:
+                self.push_delay = self.push_delay / 2 if self.push_delay > self.min_push_delay else 0.0
+            else:
+                self.push_delay = min(max(self.push_delay * 2, self.min_push_delay), self.max_push_delay)
 
-        time.sleep(0.2)
+    def push_change(self, h, url, pushed_content):
 
-        if self.network_graph.controller == "ryu":
+        '''
+        Pushes the change, trying again while the controller says it is busy or cannot be reached.
+        :return: True if the controller took the change
+        '''
 
-            resp, content = self.h.request(url, "POST",
-                                           headers={'Content-Type': 'application/json; charset=UTF-8'},
-                                           body=json.dumps(pushed_content))
+        for attempt in range(self.max_push_attempts):
 
-        elif self.network_graph.controller == "onos":
+            push_delay = self.push_delay
+            if push_delay:
+                time.sleep(push_delay)
 
-            resp, content = self.h.request(url, "POST",
-                                           headers={'Content-Type': 'application/json; charset=UTF-8'},
-                                           body=json.dumps(pushed_content))
+            try:
+                resp, content = h.request(url, "POST",
+                                          headers={'Content-Type': 'application/json; charset=UTF-8'},
+                                          body=json.dumps(pushed_content))
+                status = resp["status"]
+            except (socket.error, httplib.HTTPException) as e:
+                resp, content, status = None, str(e), None
 
-        if resp["status"].startswith("2"):
-            print "Pushed Successfully:", pushed_content.keys()[0]
-            #print resp["status"]
-        else:
-            print "Problem Pushing:", pushed_content.keys()[0]
-            print "resp:", resp, "content:", content
-            pprint.pprint(pushed_content)
+            if status and status.startswith("2"):
+                self.update_push_delay(True)
+                print "Pushed Successfully:", pushed_content.keys()[0]
+                return True
+
+            self.update_push_delay(False)
+
+            # Anything else the controller turns away would be turned away again
+            if status and status != "429" and not status.startswith("5"):
+                break
+
+        print "Problem Pushing:", pushed_content.keys()[0]
+        print "resp:", resp, "content:", content
+        pprint.pprint(pushed_content)
+
+        return False
+
+    def push_switch_changes(self, changes):
+
+        h = self.get_connection()
+
+        try:
+            i = 0
+            while i < len(changes):
+                change_type, url, pushed_content = changes[i]
+                i += 1
+
+                # ONOS takes all of the flows in a row together, the order with the groups stays the same
+                if change_type == "flow" and self.network_graph.controller == "onos":
+                    flows = [pushed_content]
+                    while i < len(changes) and changes[i][0] == "flow":
+                        flows.append(changes[i][2])
+                        i += 1
+
+                    self.push_change(h, self.create_onos_flows_url(), {"flows": flows})
+                else:
+                    self.push_change(h, url, pushed_content)
+        finally:
+            self.connection_pool.put(h)
+
+    def queue_change(self, sw, change_type, url, pushed_content):
+
+        self.queued_changes[sw].append((change_type, url, pushed_content))
+        self.num_queued_changes += 1
+
+        if self.num_queued_changes >= self.max_queued_changes:
+            self.flush_changes()
+
+    def flush_changes(self):
+
+        '''
+        Pushes all of the queued changes, each switch's in the order they were queued in.
+        '''
+
+        switch_changes = self.queued_changes.values()
+        self.queued_changes = defaultdict(list)
+        self.num_queued_changes = 0
+
+        if not switch_changes:
+            return
+
+        pool = ThreadPool(min(self.num_connections, len(switch_changes)))
+        try:
+            pool.map(self.push_switch_changes, switch_changes, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
 
     def create_ryu_flow_url(self):
         return "http://localhost:8080/stats/flowentry/add"
@@ -150,20 +286,106 @@ class SynthesisLib(object):
     def create_ryu_group_url(self):
         return "http://localhost:8080/stats/groupentry/add"
 
+    def create_ryu_flow_delete_url(self):
+        return "http://localhost:8080/stats/flowentry/delete_strict"
+
+    def create_ryu_group_delete_url(self):
+        return "http://localhost:8080/stats/groupentry/delete"
+
     def create_onos_flow_url(self, flow):
         flow_url = self.network_graph.network_configuration.controller_api_base_url + "flows/" + \
                    urllib.quote(flow["deviceId"]) + "?appId=" + self.onos_app_id
 
         return flow_url
 
+    def create_onos_flows_url(self):
+        return self.network_graph.network_configuration.controller_api_base_url + "flows?appId=" + self.onos_app_id
+
     def create_onos_group_url(self, group):
         group_url = self.network_graph.network_configuration.controller_api_base_url + "groups/" + \
                     urllib.quote(group["deviceId"])
 
         return group_url
 
+    def get_offline_switch(self, sw):
+
+        offline_switch = self.offline_switches[int(sw[1:])]
+        if not offline_switch:
+            offline_switch["flow_tables"] = defaultdict(list)
+            offline_switch["groups"] = []
+
+        return offline_switch
+
+    def get_offline_flow(self, flow):
+
+        flow = dict((k, v) for k, v in flow.items() if k not in ["dpid", "cookie_mask"])
+
+        # Ryu gives the vlan_vid back without the OFPVID_PRESENT bit it puts in when it is given as an int
+        flow["match"] = dict(flow["match"])
+        if isinstance(flow["match"].get("vlan_vid"), int):
+            flow["match"]["vlan_vid"] = str(flow["match"]["vlan_vid"])
+
+        instructions = []
+        for instruction in flow["instructions"]:
+            if instruction["type"] == "GOTO_TABLE":
+                instruction = {"type": "GOTO_TABLE", "table_id": int(instruction["table_id"])}
+            instructions.append(instruction)
+        flow["instructions"] = instructions
+
+        return flow
+
+    def record_offline_flow(self, sw, flow):
+
+        flow = self.get_offline_flow(flow)
+
+        # A flow with the same match and priority as one already in the table replaces it
+        flow_table = self.get_offline_switch(sw)["flow_tables"][flow["table_id"]]
+        for i, other_flow in enumerate(flow_table):
+            if other_flow["priority"] == flow["priority"] and other_flow["match"] == flow["match"]:
+                flow_table[i] = flow
+                break
+        else:
+            flow_table.append(flow)
+
+    def record_offline_group(self, sw, group):
+
+        group = dict((k, v) for k, v in group.items() if k != "dpid")
+
+        buckets = []
+        for bucket in group["buckets"]:
+            bucket = dict(bucket)
+            bucket.setdefault("weight", 0)
+            bucket.setdefault("watch_port", 4294967295)
+            bucket.setdefault("watch_group", 4294967295)
+            buckets.append(bucket)
+        group["buckets"] = buckets
+
+        self.get_offline_switch(sw)["groups"].append(group)
+
+    def delete_offline_flow(self, sw, flow):
+
+        flow = self.get_offline_flow(flow)
+
+        flow_table = self.get_offline_switch(sw)["flow_tables"][flow["table_id"]]
+        flow_table[:] = [other_flow for other_flow in flow_table
+                         if other_flow["priority"] != flow["priority"] or other_flow["match"] != flow["match"]]
+
+    def delete_offline_group(self, sw, group):
+
+        offline_switch = self.get_offline_switch(sw)
+        offline_switch["groups"] = [other_group for other_group in offline_switch["groups"]
+                                    if other_group["group_id"] != group["group_id"]]
+
     def push_flow(self, sw, flow):
 
+        if self.held_changes is not None:
+            self.held_changes.append((sw, "flow", flow))
+            return
+
+        if self.offline:
+            self.record_offline_flow(sw, flow)
+            return
+
         url = None
         if self.network_graph.controller == "ryu":
             url = self.create_ryu_flow_url()
@@ -171,10 +393,18 @@ class SynthesisLib(object):
         elif self.network_graph.controller == "onos":
             url = self.create_onos_flow_url(flow)
 
-        self.push_change(url, flow)
+        self.queue_change(sw, "flow", url, flow)
 
     def push_group(self, sw, group):
 
+        if self.held_changes is not None:
+            self.held_changes.append((sw, "group", group))
+            return
+
+        if self.offline:
+            self.record_offline_group(sw, group)
+            return
+
         url = None
         if self.network_graph.controller == "ryu":
             url = self.create_ryu_group_url()
@@ -186,7 +416,64 @@ class SynthesisLib(object):
         else:
             raise NotImplementedError
 
-        self.push_change(url, group)
+        self.queue_change(sw, "group", url, group)
+
+    def renumber_changes(self, changes):
+
+        '''
+        Gives the groups and flows that were made with another SynthesisLib's ids (e.g. in another process) the next
+        ids from this one, in their order, and points the flows to the renumbered groups.
+        :param changes: List of (sw, change_type, content), changed in place
+        :return: changes
+        '''
+
+        if self.network_graph.controller != "ryu":
+            raise NotImplementedError
+
+        group_ids = dict()
+
+        for sw, change_type, content in changes:
+            if change_type == "group":
+                group_ids[content["group_id"]] = self.group_id_cntr
+                content["group_id"] = self.group_id_cntr
+                self.group_id_cntr += 1
+            else:
+                content["cookie"] = self.flow_id_cntr
+                self.flow_id_cntr += 1
+                for instruction in content["instructions"]:
+                    for action in instruction.get("actions", []):
+                        if action["type"] == "GROUP":
+                            action["group_id"] = group_ids[action["group_id"]]
+
+        return changes
+
+    # Deletes the flow in the same table with the same match and priority as the given one
+    def delete_flow(self, sw, flow):
+
+        if self.offline:
+            self.delete_offline_flow(sw, flow)
+            return
+
+        if self.network_graph.controller == "ryu":
+            deleted_flow = dict((k, flow[k]) for k in ["dpid", "table_id", "priority", "match"])
+            self.queue_change(sw, "flow_delete", self.create_ryu_flow_delete_url(), deleted_flow)
+
+        else:
+            raise NotImplementedError
+
+    # A group can only be deleted once the flows that point to it do not, or the switch deletes them with it
+    def delete_group(self, sw, group):
+
+        if self.offline:
+            self.delete_offline_group(sw, group)
+            return
+
+        if self.network_graph.controller == "ryu":
+            deleted_group = dict((k, group[k]) for k in ["dpid", "group_id"])
+            self.queue_change(sw, "group_delete", self.create_ryu_group_delete_url(), deleted_group)
+
+        else:
+            raise NotImplementedError
 
     def create_base_flow(self, sw, table_id, priority):
 
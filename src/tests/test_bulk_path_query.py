@@ -0,0 +1,145 @@
+import unittest
+import numpy as np
+from netaddr import IPNetwork, IPAddress
+from model.traffic import Traffic
+from model.match import field_names
+from experiments.network_configuration import NetworkConfiguration
+from analysis.flow_validator import FlowValidator
+from analysis.util import get_active_path
+from analysis.bulk_path_query import AdmittedTrafficTable, BulkPathQuery, get_host_pair_headers, header_dtype
+
+
+def get_header_traffic(headers, i, field_backend=None):
+    t = Traffic(init_wildcard=True, field_backend=field_backend)
+    for field_name in field_names:
+        value = int(headers[field_name][i])
+        if field_name == 'src_ip_addr' or field_name == 'dst_ip_addr':
+            t.set_field(field_name, IPNetwork(str(IPAddress(value)) + "/32"))
+        else:
+            t.set_field(field_name, value)
+
+    return t
+
+
+class TestAdmittedTrafficTable(unittest.TestCase):
+
+    def check_admitted_traffic_table(self, field_backend):
+
+        te_1 = Traffic(init_wildcard=True, field_backend=field_backend)
+        te_1.set_field("vlan_id", 0x1001, is_exception_value=True)
+        te_1.set_field("has_vlan_tag", 1)
+
+        te_2 = Traffic(init_wildcard=True, field_backend=field_backend)
+        te_2.set_field("ethernet_type", 0x0800)
+        te_2.set_field("dst_ip_addr", IPNetwork("10.0.0.0/24"))
+
+        modified_vlan = Traffic(init_wildcard=True, field_backend=field_backend)
+        modified_vlan.set_field("vlan_id", 0x1005)
+
+        modified_vlan_field = modified_vlan.traffic_elements[0].traffic_fields["vlan_id"]
+
+        table = AdmittedTrafficTable(te_1.traffic_elements + te_2.traffic_elements,
+                                     ["succ_1", "succ_2"],
+                                     [{}, {"vlan_id": (None, modified_vlan_field)}])
+
+        headers = np.zeros(4, dtype=header_dtype)
+        headers["has_vlan_tag"] = [1, 1, 0, 0]
+        headers["vlan_id"] = [0x1001, 0x1002, 0, 0]
+        headers["ethernet_type"] = [0x0800, 0, 0x0800, 0x0800]
+        headers["dst_ip_addr"] = [int(IPAddress(ip_addr)) for ip_addr in ["10.0.0.1", "0.0.0.0", "10.0.0.255", "10.0.1.0"]]
+
+        matches = table.get_matches(headers)
+        for i in range(len(headers)):
+            t = get_header_traffic(headers, i, field_backend)
+            for j, te in enumerate([te_1, te_2]):
+                self.assertEqual(matches[j, i], not te.intersect(t).is_empty())
+
+        succ_matches = dict((succ, (list(rows), list(elements)))
+                            for succ, rows, elements in table.iter_succ_matches(headers))
+        self.assertEqual(succ_matches, {"succ_1": ([1], [0]), "succ_2": ([0, 2], [1, 1])})
+
+        modified_headers = headers[[0, 2]]
+        table.apply_modifications(modified_headers, np.array([1, 1]))
+        self.assertEqual(list(modified_headers["vlan_id"]), [0x1005, 0x1005])
+        self.assertEqual(list(headers["vlan_id"]), [0x1001, 0x1002, 0, 0])
+
+    def test_admitted_traffic_table(self):
+        for field_backend in ["interval_set", "ternary"]:
+            self.check_admitted_traffic_table(field_backend)
+
+
+class TestBulkPathQuery(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        ip_str = "172.17.0.2"
+        port_str = "8181"
+        num_switches_per_grid = 3
+        num_grids = 1
+        num_hosts_per_switch = 3
+        cls.nc_microgrid = NetworkConfiguration("onos",
+                                                ip_str,
+                                                int(port_str),
+                                                "http://" + ip_str + ":" + port_str + "/onos/v1/",
+                                                "karaf",
+                                                "karaf",
+                                                "microgrid_topo",
+                                                {"num_switches": 1 + 1 * num_switches_per_grid,
+                                                 "nGrids": num_grids,
+                                                 "nSwitchesPerGrid": num_switches_per_grid,
+                                                 "nHostsPerSwitch": num_hosts_per_switch},
+                                                conf_root="configurations/",
+                                                synthesis_name=None,
+                                                synthesis_params=None)
+
+        cls.ng_microgrid = cls.nc_microgrid.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=1)
+        cls.fv = FlowValidator(cls.ng_microgrid)
+        cls.fv.init_network_port_graph()
+
+    def check_active_paths(self, bpq, headers, src_ports, dst_ports):
+
+        paths = bpq.get_paths(headers, src_ports, dst_ports)
+
+        for i in range(len(headers)):
+            active_path = get_active_path(self.fv.port_graph,
+                                          get_header_traffic(headers, i),
+                                          src_ports[i],
+                                          dst_ports[i])
+            if active_path:
+                self.assertEqual(paths[i], active_path.path_nodes)
+            else:
+                self.assertEqual(paths[i], None)
+
+        return paths
+
+    def test_ng_microgrid_active_paths(self):
+
+        host_ids = sorted(self.ng_microgrid.host_ids)
+        host_pairs = [(src_h_id, dst_h_id) for src_h_id in host_ids for dst_h_id in host_ids if src_h_id != dst_h_id]
+
+        # Hosts in the enclaves talk with their own vlan
+        headers = get_host_pair_headers(self.ng_microgrid, host_pairs)
+        headers["has_vlan_tag"] = 1
+        headers["vlan_id"] = [int(self.ng_microgrid.get_node_object(src_h_id).sw.node_id[1:]) + 0x1000
+                              for src_h_id, dst_h_id in host_pairs]
+
+        src_ports = [self.ng_microgrid.get_node_object(src_h_id).switch_port for src_h_id, dst_h_id in host_pairs]
+        dst_ports = [self.ng_microgrid.get_node_object(dst_h_id).switch_port for src_h_id, dst_h_id in host_pairs]
+
+        bpq = BulkPathQuery(self.fv.port_graph)
+        paths = self.check_active_paths(bpq, headers, src_ports, dst_ports)
+        self.assertNotEqual(paths.count(None), len(paths))
+
+        # The tables need to be compiled again after a link fails
+        ld = list(self.ng_microgrid.get_switch_link_data())[0]
+        self.fv.port_graph.remove_node_graph_link(*ld.forward_link)
+        try:
+            self.check_active_paths(bpq, headers, src_ports, dst_ports)
+        finally:
+            self.fv.port_graph.add_node_graph_link(ld.forward_link[0], ld.forward_link[1], updating=True)
+
+        self.assertEqual(bpq.get_paths(headers, src_ports, dst_ports), paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
+import os
+import shutil
+import tempfile
 import unittest
 import itertools
 from model.traffic import Traffic
+from model.network_port_graph import NetworkPortGraph
 from experiments.network_configuration import NetworkConfiguration
 from experiments.security_policy_times import construct_security_policy_statements
 from analysis.flow_validator import FlowValidator
@@ -41,6 +45,227 @@ class TestFlowValidator(unittest.TestCase):
         violations = self.fv.validate_policy(policy_statements)
         self.assertEqual(len(violations), 0)
 
+    def test_ng_microgrid_active_path_cache(self):
+        policy_statements = construct_security_policy_statements(self.nc_microgrid)
+        violations = self.fv.validate_policy(policy_statements)
+
+        # Nothing changed, so the second time around all the active paths come from the cache
+        misses = self.fv.active_path_cache.misses
+        self.assertEqual(sorted(map(str, self.fv.validate_policy(policy_statements))), sorted(map(str, violations)))
+        self.assertEqual(self.fv.active_path_cache.misses, misses)
+
+        # Failing and restoring a link makes them all be computed again
+        ld = list(self.ng_microgrid.get_switch_link_data())[0]
+        self.fv.port_graph.remove_node_graph_link(*ld.forward_link)
+        self.fv.port_graph.add_node_graph_link(ld.forward_link[0], ld.forward_link[1], updating=True)
+
+        hits = self.fv.active_path_cache.hits
+        self.assertEqual(sorted(map(str, self.fv.validate_policy(policy_statements))), sorted(map(str, violations)))
+        self.assertEqual(self.fv.active_path_cache.hits, hits)
+
+    def test_ng_microgrid_flow_applied_traffic(self):
+
+        # Same as the traffic left after all the flows ahead of it in the table take theirs
+        for sw in self.ng_microgrid.get_switches():
+            for flow_table in sw.flow_tables:
+                remaining_traffic = Traffic(init_wildcard=True)
+                for flow in flow_table.flows:
+                    applied_traffic = flow.traffic.intersect(remaining_traffic)
+                    remaining_traffic = flow.complement_traffic.intersect(remaining_traffic)
+
+                    if applied_traffic.is_empty():
+                        self.assertEqual(flow.applied_traffic, None)
+                    else:
+                        self.assertEqual(flow.applied_traffic.is_equal_traffic(applied_traffic), True)
+
+    def check_flow_table_port_graph_edges(self):
+        for sw in self.ng_microgrid.get_switches():
+            for flow_table in sw.flow_tables:
+                current_port_graph_edges = dict(flow_table.current_port_graph_edges)
+                self.assertEqual(current_port_graph_edges, dict(flow_table._get_port_graph_edges_dict()))
+
+    def test_ng_microgrid_port_graph_edges_link_failure(self):
+
+        # Same edges as computing all of the flows' edges again, while the link is down and after it is back up
+        ld = list(self.ng_microgrid.get_switch_link_data())[0]
+        self.fv.port_graph.remove_node_graph_link(*ld.forward_link)
+        try:
+            self.check_flow_table_port_graph_edges()
+        finally:
+            self.fv.port_graph.add_node_graph_link(ld.forward_link[0], ld.forward_link[1], updating=True)
+
+        self.check_flow_table_port_graph_edges()
+
+    def get_npg_admitted_traffic(self):
+        pg = self.fv.port_graph
+        admitted_traffic = {}
+        for node_id in pg.g.nodes():
+            node = pg.get_node(node_id)
+            for dst in pg.get_admitted_traffic_dsts(node):
+                admitted_traffic[(node_id, dst.node_id)] = pg.get_admitted_traffic(node, dst)
+
+        return admitted_traffic
+
+    def test_ng_microgrid_admitted_traffic_link_failure(self):
+
+        # The admitted traffic is back to what it was once the failed link is restored
+        admitted_traffic = self.get_npg_admitted_traffic()
+
+        ld = list(self.ng_microgrid.get_switch_link_data())[0]
+        self.fv.port_graph.remove_node_graph_link(*ld.forward_link)
+        self.fv.port_graph.add_node_graph_link(ld.forward_link[0], ld.forward_link[1], updating=True)
+
+        restored_admitted_traffic = self.get_npg_admitted_traffic()
+        self.assertEqual(sorted(restored_admitted_traffic.keys()), sorted(admitted_traffic.keys()))
+        for k in admitted_traffic:
+            self.assertEqual(restored_admitted_traffic[k].is_equal_traffic(admitted_traffic[k]), True)
+
+class TestFlowValidatorClique(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.conf_root = tempfile.mkdtemp() + "/"
+        cls.ng_clique = cls.get_nc_clique().setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+        cls.fv = FlowValidator(cls.ng_clique)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.conf_root)
+
+    # Synthesized offline the first time, the ones after that load what was written out then
+    @classmethod
+    def get_nc_clique(cls):
+        return NetworkConfiguration("ryu",
+                                    "127.0.0.1",
+                                    6633,
+                                    "http://localhost:8080/",
+                                    "admin",
+                                    "admin",
+                                    "cliquetopo",
+                                    {"num_switches": 4,
+                                     "per_switch_links": 3,
+                                     "num_hosts_per_switch": 1},
+                                    conf_root=cls.conf_root,
+                                    synthesis_name="AboresceneSynthesis",
+                                    synthesis_params={"apply_group_intents_immediately": True,
+                                                      "k": 1},
+                                    offline=True)
+
+    def get_policy_statements(self, ng):
+
+        # Synthesized for one link failure, so there are violations with two of them down. One statement per src host,
+        # each with a constraint of its own.
+        lmbdas = list(itertools.combinations(ng.get_switch_link_data(), 2))
+        host_ports = [ng.get_node_object(h_id).switch_port for h_id in sorted(ng.host_ids)]
+
+        specific_traffic = Traffic(init_wildcard=True)
+        specific_traffic.set_field("ethernet_type", 0x0800)
+
+        policy_statements = []
+        for src_port in host_ports:
+            dst_zone = [dst_port for dst_port in host_ports if dst_port != src_port]
+            constraints = [PolicyConstraint(CONNECTIVITY_CONSTRAINT, None)]
+            policy_statements.append(PolicyStatement(ng, [src_port], dst_zone, specific_traffic, constraints, lmbdas))
+
+        return policy_statements
+
+    def test_clique_init_twice_in_pool(self):
+        violations = self.fv.validate_policy(self.get_policy_statements(self.ng_clique))
+        self.assertNotEqual(len(violations), 0)
+
+        # Initialized in the pool once more, over what was initialized when it was created
+        ng = self.get_nc_clique().setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+        fv = FlowValidator(ng, num_processes=2)
+        fv.init_network_port_graph()
+
+        violations_in_pool = fv.validate_policy(self.get_policy_statements(ng))
+        self.assertEqual(sorted(map(str, violations_in_pool)), sorted(map(str, violations)))
+
+
+    def test_clique_in_pool(self):
+        policy_statements = self.get_policy_statements(self.ng_clique)
+        violations = self.fv.validate_policy(policy_statements)
+        self.assertNotEqual(len(violations), 0)
+
+        self.fv.num_processes = 2
+        try:
+            violations_in_pool = self.fv.validate_policy(policy_statements)
+        finally:
+            self.fv.num_processes = 1
+
+        self.assertEqual(map(str, violations_in_pool), map(str, violations))
+
+    def test_clique_iter_violations(self):
+        policy_statements = self.get_policy_statements(self.ng_clique)
+        violations = map(str, self.fv.validate_policy(policy_statements))
+        violated_constraints = set(id(v.constraint) for v in self.fv.violations)
+        self.assertGreater(len(violations), 5)
+        self.assertGreater(len(violated_constraints), 1)
+
+        for num_processes in [1, 2]:
+            self.fv.num_processes = num_processes
+            try:
+                self.assertEqual(map(str, self.fv.iter_violations(policy_statements)), violations)
+                self.assertEqual(map(str, self.fv.iter_violations(policy_statements, max_violations=5)),
+                                 violations[:5])
+
+                # Each policy statement has its own constraint, so there is one violation per violated statement
+                first_violations = list(self.fv.iter_violations(policy_statements,
+                                                                first_violation_per_statement=True))
+            finally:
+                self.fv.num_processes = 1
+
+            first_violated_constraints = set(id(v.constraint) for v in first_violations)
+            self.assertEqual(len(first_violated_constraints), len(first_violations))
+            self.assertEqual(first_violated_constraints, violated_constraints)
+
+    def test_clique_lazy_admitted_traffic(self):
+        violations = self.fv.validate_policy(self.get_policy_statements(self.ng_clique))
+        self.assertNotEqual(len(violations), 0)
+
+        ng = self.get_nc_clique().setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+        fv = FlowValidator(ng, lazy_admitted_traffic=True)
+        self.assertEqual(fv.port_graph.admitted_traffic_sw_ids, set())
+
+        # Looking up the admitted traffic for a dst only computes it for the dsts at its switch
+        sw = ng.get_node_object("s1")
+        dst = list(sw.non_host_port_iter())[0].network_port_graph_ingress_node
+        fv.port_graph.get_admitted_traffic(dst, dst)
+        self.assertEqual(fv.port_graph.admitted_traffic_sw_ids, set(["s1"]))
+
+        lazy_violations = fv.validate_policy(self.get_policy_statements(ng))
+        self.assertEqual(sorted(map(str, lazy_violations)), sorted(map(str, violations)))
+
+    def test_clique_snapshot(self):
+        violations = self.fv.validate_policy(self.get_policy_statements(self.ng_clique))
+        self.assertNotEqual(len(violations), 0)
+
+        computed_sw_ids = []
+        compute_sw_transfer_function = NetworkPortGraph.compute_sw_transfer_function
+
+        def count_compute_sw_transfer_function(npg, sw):
+            computed_sw_ids.append(sw.node_id)
+            return compute_sw_transfer_function(npg, sw)
+
+        snapshot_dir = tempfile.mkdtemp()
+        NetworkPortGraph.compute_sw_transfer_function = count_compute_sw_transfer_function
+        try:
+            # The first one saves the snapshot, the second one loads it, and so do the initializations after that
+            for expected_computed_sw_ids in [["s1", "s2", "s3", "s4"], []]:
+                del computed_sw_ids[:]
+                ng = self.get_nc_clique().setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+                fv = FlowValidator(ng, snapshot_dir=snapshot_dir)
+                fv.init_network_port_graph()
+
+                self.assertEqual(sorted(computed_sw_ids), expected_computed_sw_ids)
+                self.assertEqual(len(os.listdir(snapshot_dir)), 1)
+
+                snapshot_violations = fv.validate_policy(self.get_policy_statements(ng))
+                self.assertEqual(sorted(map(str, snapshot_violations)), sorted(map(str, violations)))
+        finally:
+            NetworkPortGraph.compute_sw_transfer_function = compute_sw_transfer_function
+            shutil.rmtree(snapshot_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,7 +7,7 @@ from model.traffic_path import TrafficPath
 from model.network_port_graph import NetworkPortGraph
 from experiments.network_configuration import NetworkConfiguration
 from analysis.util import get_paths, get_active_path, get_failover_path, get_failover_path_after_failed_sequence
-from analysis.util import get_specific_traffic, get_admitted_traffic
+from analysis.util import get_specific_traffic, get_admitted_traffic, get_failover_paths_after_failed_sequences
 
 
 class TestNetworkPortGraph(unittest.TestCase):
@@ -356,6 +356,27 @@ class TestNetworkPortGraph(unittest.TestCase):
                                            self.npg_linear_dijkstra_mac_acl,
                                            h2s2, h1s1)
 
+    def test_flow_remove_add_linear_dijkstra(self):
+
+        ng = self.nc_linear_dijkstra.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=1)
+        npg = NetworkPortGraph(ng)
+        npg.init_network_port_graph()
+        npg.init_network_admitted_traffic()
+
+        host_pairs = list(ng.host_obj_pair_iter())
+        before_ats = [get_admitted_traffic(npg, h1.switch_port, h2.switch_port) for h1, h2 in host_pairs]
+
+        # Taking out any flow and putting it back should leave the admitted traffic as it was
+        for sw in ng.get_switches():
+            for flow_table in sw.flow_tables:
+                for flow in list(flow_table.flows):
+                    npg.remove_flow(flow)
+                    npg.add_flow(sw.node_id, flow_table.table_id, flow.flow_raw)
+
+                    for (h1, h2), before_at in zip(host_pairs, before_ats):
+                        after_at = get_admitted_traffic(npg, h1.switch_port, h2.switch_port)
+                        self.assertEqual(after_at.is_equal_traffic(before_at), True)
+
     def test_path_linear_dijkstra(self):
 
         h1s1 = self.ng_linear_dijkstra.get_node_object("h1s1")
@@ -483,6 +504,17 @@ class TestNetworkPortGraph(unittest.TestCase):
                                                                 analyzed_host_pairs_traffic_paths)
         self.assertEqual(paths_match, True)
 
+    def test_primary_paths_match_synthesized_clos_dijkstra_in_pool(self):
+        ng = self.nc_clos_dijkstra.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=1)
+        npg = NetworkPortGraph(ng)
+        npg.init_network_port_graph(num_processes=2)
+        npg.init_network_admitted_traffic(num_processes=2)
+
+        analyzed_host_pairs_traffic_paths = self.get_all_host_pairs_traffic_paths(ng, npg)
+        paths_match = self.compare_primary_paths_with_synthesis(self.nc_clos_dijkstra,
+                                                                analyzed_host_pairs_traffic_paths)
+        self.assertEqual(paths_match, True)
+
     def test_failover_paths_match_synthesized_clos_dijkstra(self):
         paths_match = self.compare_failover_paths_with_synthesis(self.nc_clos_dijkstra,
                                                                  self.ng_clos_dijkstra,
@@ -595,6 +627,30 @@ class TestNetworkPortGraph(unittest.TestCase):
             self.ng_ring_aborescene_apply_true,
             self.npg_ring_aborescene_apply_true)
 
+    def test_failover_paths_after_failed_sequences_ring_aborescene_apply_true(self):
+
+        ng = self.ng_ring_aborescene_apply_true
+        npg = self.npg_ring_aborescene_apply_true
+
+        lmbdas = [()]
+        for ld1 in ng.get_switch_link_data():
+            lmbdas.append((ld1,))
+            for ld2 in ng.get_switch_link_data():
+                if ld1 != ld2:
+                    lmbdas.append((ld1, ld2))
+
+        # The failover paths for all the sequences at once are the same as for each sequence on its own
+        for src_host, dst_host in ng.host_obj_pair_iter():
+
+            specific_traffic = get_specific_traffic(ng, src_host.node_id, dst_host.node_id)
+            active_path = get_active_path(npg, specific_traffic, src_host.switch_port, dst_host.switch_port)
+
+            failover_paths = get_failover_paths_after_failed_sequences(npg, active_path, lmbdas)
+
+            for lmbda in lmbdas:
+                failover_path = get_failover_path_after_failed_sequence(npg, active_path, lmbda)
+                self.assertEqual(str(failover_paths[lmbda]), str(failover_path))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from model.traffic import Traffic
+from model.port_graph_node import PortGraphNode
+from model.object_registry import ObjectRegistry
+
+
+class TestObjectRegistry(unittest.TestCase):
+
+    def get_root(self):
+        root = PortGraphNode(None, "s1:egress1", "egress")
+        root.parent_obj = Traffic(init_wildcard=True)
+        return root
+
+    def test_state_changes(self):
+
+        # Two roots built the same way stand in for the objects before and after a fork
+        root_1 = self.get_root()
+        root_2 = self.get_root()
+        registry_1 = ObjectRegistry(root_1)
+        registry_2 = ObjectRegistry(root_2)
+        self.assertEqual(len(registry_1.objects), len(registry_2.objects))
+
+        snapshot = registry_1.get_state_snapshot(registry_1.objects)
+
+        # Replace an attribute with a new object that refers back to objects in the registry,
+        # change a container in-place and drop an attribute
+        dst = PortGraphNode(None, "s1:egress2", "egress")
+        dst.parent_obj = root_1
+        root_1.admitted_traffic[dst][None] = root_1.parent_obj
+        root_1.parent_obj.set_field("in_port", 1)
+        root_1.node_type = "ingress"
+        del root_1.sw
+
+        changes = registry_2.loads(registry_1.dumps(registry_1.get_state_changes(snapshot)))
+        registry_2.apply_state_changes(changes)
+
+        self.assertEqual(root_2.node_type, "ingress")
+        self.assertEqual(hasattr(root_2, "sw"), False)
+        self.assertEqual(root_2.parent_obj.is_equal_traffic(root_1.parent_obj), True)
+
+        dst_2 = root_2.admitted_traffic.keys()[0]
+        self.assertEqual(dst_2.node_id, "s1:egress2")
+        self.assertIs(dst_2.parent_obj, root_2)
+        self.assertIs(root_2.admitted_traffic[dst_2][None], root_2.parent_obj)
+
+        # Nothing changed since
+        snapshot = registry_2.get_state_snapshot(registry_2.objects)
+        self.assertEqual(registry_2.get_state_changes(snapshot), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
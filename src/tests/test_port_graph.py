@@ -0,0 +1,128 @@
+import sys
+import unittest
+
+from model.traffic import Traffic
+from model.match import field_names
+from model.port_graph import PortGraph
+from model.port_graph_node import PortGraphNode
+
+
+class ChainPortGraph(PortGraph):
+
+    # Lets all the traffic through every edge and counts how many times it was asked to
+    def compute_edge_admitted_traffic(self, traffic_to_propagate, edge):
+        self.num_edge_computations += 1
+        pred_admitted_traffic = Traffic()
+        pred_admitted_traffic.union(traffic_to_propagate)
+        return pred_admitted_traffic
+
+
+class TestPortGraph(unittest.TestCase):
+
+    def get_chain_port_graph(self, num_nodes):
+
+        pg = ChainPortGraph(None)
+        pg.num_edge_computations = 0
+
+        nodes = [PortGraphNode(None, "n" + str(i), "egress") for i in range(num_nodes)]
+        for node in nodes:
+            pg.add_node(node)
+
+        for i in range(num_nodes - 1):
+            pg.add_edge(nodes[i], nodes[i + 1], None)
+
+        return pg, nodes
+
+    def test_propagate_long_chain(self):
+
+        # Longer than what the recursion limit would have allowed
+        num_nodes = sys.getrecursionlimit() * 2
+        pg, nodes = self.get_chain_port_graph(num_nodes)
+        pg.boundary_ingress_nodes = [nodes[0]]
+
+        dst = nodes[-1]
+        dst_traffic = Traffic(init_wildcard=True)
+        dst_traffic.set_field("in_port", 1)
+
+        end_to_end_modified_edges = []
+        pg.propagate_admitted_traffic(dst, dst_traffic, None, dst, end_to_end_modified_edges)
+
+        self.assertEqual(pg.get_admitted_traffic(nodes[0], dst).is_equal_traffic(dst_traffic), True)
+        self.assertEqual(end_to_end_modified_edges, [(nodes[0].node_id, dst.node_id)])
+        self.assertEqual(pg.num_edge_computations, num_nodes - 1)
+
+    def test_propagate_batched_changes(self):
+
+        # Two chains a0 -> a1 -> m and b0 -> m that meet at m, m gets to d via x and y
+        pg = ChainPortGraph(None)
+        pg.num_edge_computations = 0
+        nodes = dict((node_id, PortGraphNode(None, node_id, "egress"))
+                     for node_id in ["a0", "a1", "b0", "m", "x", "y", "d"])
+        for node in nodes.values():
+            pg.add_node(node)
+        for pred, succ in [("a0", "a1"), ("a1", "m"), ("b0", "m"), ("m", "x"), ("m", "y"), ("x", "d"), ("y", "d")]:
+            pg.add_edge(nodes[pred], nodes[succ], None)
+
+        dst = nodes["d"]
+        t1 = Traffic(init_wildcard=True)
+        t1.set_field("in_port", 1)
+        t2 = Traffic(init_wildcard=True)
+        t2.set_field("in_port", 2)
+
+        # Both changes at m are collected before m is propagated
+        pg.propagate_admitted_traffic_changes([(nodes["m"], t1, nodes["x"], dst),
+                                               (nodes["m"], t2, nodes["y"], dst)], [])
+
+        t = Traffic()
+        t.union(t1)
+        t.union(t2)
+        self.assertEqual(pg.get_admitted_traffic(nodes["a0"], dst).is_equal_traffic(t), True)
+        self.assertEqual(pg.get_admitted_traffic(nodes["b0"], dst).is_equal_traffic(t), True)
+        self.assertEqual(pg.num_edge_computations, 3)
+
+    def test_packet_admitted_succs(self):
+
+        # m gets to d via x with in_port 1 or 2 and via y with in_port 2 or anything but vlan 0x1001
+        pg = ChainPortGraph(None)
+        pg.num_edge_computations = 0
+        nodes = dict((node_id, PortGraphNode(None, node_id, "egress")) for node_id in ["m", "x", "y", "d"])
+        for node in nodes.values():
+            pg.add_node(node)
+
+        t1 = Traffic(init_wildcard=True)
+        t1.set_field("in_port", 1)
+        t2 = Traffic(init_wildcard=True)
+        t2.set_field("in_port", 2)
+        t3 = Traffic(init_wildcard=True)
+        t3.set_field("vlan_id", 0x1001, is_exception_value=True)
+
+        x_traffic = Traffic()
+        x_traffic.union(t1)
+        x_traffic.union(t2)
+        y_traffic = Traffic()
+        y_traffic.union(t2)
+        y_traffic.union(t3)
+
+        dst = nodes["d"]
+        pg.set_admitted_traffic_via_succ(nodes["m"], dst, nodes["x"], x_traffic)
+        pg.set_admitted_traffic_via_succ(nodes["m"], dst, nodes["y"], y_traffic)
+
+        for in_port, vlan_id, succs in [(1, 0x1001, ["x"]),
+                                         (1, 0x1002, ["x", "y"]),
+                                         (2, 0x1001, ["x", "y"]),
+                                         (3, 0x1001, []),
+                                         (3, 0, ["y"])]:
+
+            packet = dict((field_name, 0) for field_name in field_names)
+            packet["in_port"] = in_port
+            packet["vlan_id"] = vlan_id
+
+            packet_succs = pg.get_packet_admitted_succs(nodes["m"], dst, packet)
+            self.assertEqual(sorted(succ.node_id for succ in packet_succs), succs)
+
+        # Nothing is admitted for other dsts
+        self.assertEqual(pg.get_packet_admitted_succs(nodes["m"], nodes["x"], packet), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
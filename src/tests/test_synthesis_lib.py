@@ -0,0 +1,288 @@
+import json
+import shutil
+import tempfile
+import unittest
+import model.traffic
+from model.traffic import Traffic
+from model.network_graph import NetworkGraph
+from synthesis.synthesis_lib import SynthesisLib
+from synthesis.aborescene_synthesis import AboresceneSynthesis
+from experiments.network_configuration import NetworkConfiguration
+from analysis.flow_validator import FlowValidator
+from analysis.policy_statement import PolicyStatement, PolicyConstraint
+from analysis.policy_statement import CONNECTIVITY_CONSTRAINT
+
+
+class TestSynthesisLib(unittest.TestCase):
+
+    def setUp(self):
+        self.conf_root = tempfile.mkdtemp() + "/"
+
+    def tearDown(self):
+        shutil.rmtree(self.conf_root)
+
+    def get_nc_clique_offline(self, num_switches=4, num_processes=1):
+        return NetworkConfiguration("ryu",
+                                    "127.0.0.1",
+                                    6633,
+                                    "http://localhost:8080/",
+                                    "admin",
+                                    "admin",
+                                    "cliquetopo",
+                                    {"num_switches": num_switches,
+                                     "per_switch_links": num_switches - 1,
+                                     "num_hosts_per_switch": 1},
+                                    conf_root=self.conf_root,
+                                    synthesis_name="AboresceneSynthesis",
+                                    synthesis_params={"apply_group_intents_immediately": True,
+                                                      "k": 1,
+                                                      "num_processes": num_processes},
+                                    offline=True)
+
+    def get_connectivity_violations(self, ng, failed_links=()):
+
+        fv = FlowValidator(ng)
+        fv.init_network_port_graph()
+
+        src_zone = [ng.get_node_object(h_id).switch_port for h_id in ng.host_ids]
+
+        specific_traffic = Traffic(init_wildcard=True)
+        specific_traffic.set_field("ethernet_type", 0x0800)
+
+        constraints = [PolicyConstraint(CONNECTIVITY_CONSTRAINT, None)]
+        # The failed links along with each one of the others
+        failed_lds = [ng.get_link_data(*link) for link in failed_links]
+        lmbdas = [tuple(failed_lds)] + [tuple(failed_lds + [ld]) for ld in ng.get_switch_link_data()
+                                        if ld not in failed_lds]
+
+        s = PolicyStatement(ng, src_zone, src_zone, specific_traffic, constraints, lmbdas)
+        return fv.validate_policy([s])
+
+    def get_intent_out_ports(self, synthesis):
+        intent_out_ports = dict()
+        for src_sw, dst_sw_intent_lists in synthesis.sw_intent_lists.items():
+            for dst_sw, intent_list in dst_sw_intent_lists.items():
+                intent_out_ports[(src_sw.node_id, dst_sw.node_id)] = [(intent.tree_id, intent.out_port)
+                                                                     for intent in intent_list]
+        return intent_out_ports
+
+    def test_offline_synthesis(self):
+
+        nc = self.get_nc_clique_offline()
+        ng = nc.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+
+        # Synthesized for one link failure, so all the hosts can reach each other with any one link down
+        self.assertEqual(len(self.get_connectivity_violations(ng)), 0)
+
+        with open(nc.conf_path + "ryu_switches.json", "r") as in_file:
+            ryu_switches = json.loads(in_file.read())
+
+        self.assertEqual(sorted(ryu_switches.keys()), ["1", "2", "3", "4"])
+        for dpid in ryu_switches:
+            self.assertNotEqual(len(ryu_switches[dpid]["groups"]), 0)
+            for table_id, flows in ryu_switches[dpid]["flow_tables"].items():
+                for flow in flows:
+                    self.assertEqual(flow["table_id"], int(table_id))
+
+        # The second time around the switches come from what was written out the first time
+        nc_loaded = self.get_nc_clique_offline()
+        self.assertEqual(nc_loaded.load_config, True)
+        ng_loaded = nc_loaded.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+        self.assertEqual(len(self.get_connectivity_violations(ng_loaded)), 0)
+
+    def test_offline_synthesis_in_pool(self):
+
+        nc_serial = self.get_nc_clique_offline()
+        nc_serial.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+        shutil.rmtree(nc_serial.conf_path)
+
+        nc = self.get_nc_clique_offline(num_processes=2)
+        ng = nc.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+        self.assertEqual(len(self.get_connectivity_violations(ng)), 0)
+
+        # Same configuration and intents as the ones synthesized in one process
+        self.assertEqual(nc.conf_path, nc_serial.conf_path)
+        self.assertEqual(self.get_intent_out_ports(nc.synthesis), self.get_intent_out_ports(nc_serial.synthesis))
+
+        # The groups from the different processes got ids that are apart
+        for offline_switch in nc.synthesis.synthesis_lib.offline_switches.values():
+            group_ids = [group["group_id"] for group in offline_switch["groups"]]
+            self.assertEqual(len(set(group_ids)), len(group_ids))
+
+    def test_synthesis_in_pool_onos(self):
+
+        with self.assertRaises(NotImplementedError):
+            AboresceneSynthesis({"apply_group_intents_immediately": True, "k": 1, "num_processes": 2}, "onos")
+
+    def test_offline_synthesis_compaction(self):
+
+        nc = self.get_nc_clique_offline()
+        ng = nc.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+
+        # Synthesized for one link failure, so there are violations with two of them down
+        failed_links = [("s1", "s2"), ("s1", "s3"), ("s1", "s4"), ("s2", "s3"), ("s2", "s4"), ("s3", "s4")]
+
+        compaction_threshold = model.traffic.compaction_threshold
+        try:
+            model.traffic.compaction_threshold = None
+            violations = [self.get_connectivity_violations(ng, [link]) for link in failed_links]
+            model.traffic.compaction_threshold = 2
+            compacted_violations = [self.get_connectivity_violations(ng, [link]) for link in failed_links]
+        finally:
+            model.traffic.compaction_threshold = compaction_threshold
+
+        self.assertNotEqual(sum(len(v) for v in violations), 0)
+        for v, compacted_v in zip(violations, compacted_violations):
+            self.assertEqual(sorted(map(str, compacted_v)), sorted(map(str, v)))
+
+    # The network graph with all of the links and the flows and groups the synthesis has at the moment
+    def get_synthesized_network_graph(self, nc):
+        links = nc.get_all_links()
+        ng = NetworkGraph(nc.controller)
+        ng.parse_network_graph(nc.get_switches(), (nc.get_host_nodes(), links), links)
+        return ng
+
+    def test_offline_synthesis_link_change(self):
+
+        nc = self.get_nc_clique_offline(num_switches=5)
+        ng = nc.setup_network_graph(mininet_setup_gap=1, synthesis_setup_gap=None)
+
+        ld = list(ng.get_switch_link_data())[0]
+        (node1_id, node1_port), (node2_id, node2_port) = ld.link_ports_dict.items()
+
+        # Synthesized again without the link, so all of the hosts can still reach each other with another link down
+        ng.remove_link(node1_id, node1_port, node2_id, node2_port)
+        self.assertNotEqual(nc.synthesis.synthesize_link_change(node1_id, node2_id), [])
+        for dst_sw_id, k_eda_edges in nc.synthesis.dst_k_eda.items():
+            for edges in k_eda_edges:
+                self.assertNotIn((node1_id, node2_id), edges)
+                self.assertNotIn((node2_id, node1_id), edges)
+
+        ng_changed = self.get_synthesized_network_graph(nc)
+        self.assertEqual(len(self.get_connectivity_violations(ng_changed, [(node1_id, node2_id)])), 0)
+
+        ng.add_link(node1_id, node1_port, node2_id, node2_port)
+        nc.synthesis.synthesize_link_change(node1_id, node2_id)
+
+        ng_changed = self.get_synthesized_network_graph(nc)
+        self.assertEqual(len(self.get_connectivity_violations(ng_changed)), 0)
+
+        # The groups that the flows no longer point to are all gone
+        for offline_switch in nc.synthesis.synthesis_lib.offline_switches.values():
+            flow_group_ids = set()
+            for flows in offline_switch["flow_tables"].values():
+                for flow in flows:
+                    for instruction in flow["instructions"]:
+                        for action in instruction.get("actions", []):
+                            if action["type"] == "GROUP":
+                                flow_group_ids.add(action["group_id"])
+
+            self.assertEqual(set(group["group_id"] for group in offline_switch["groups"]), flow_group_ids)
+
+
+class StubHttp(object):
+
+    '''
+    Answers the POSTs with the given statuses in turn (and 200 once they run out), the GETs with nothing. Keeps the
+    POSTs it got along with the push delay of the SynthesisLib at the time.
+    '''
+
+    def __init__(self, statuses=()):
+        self.synthesis_lib = None
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def add_credentials(self, name, password):
+        pass
+
+    def request(self, url, method, headers=None, body=None):
+
+        if method == "GET":
+            return {"status": "200"}, json.dumps({"flows": [], "groups": []})
+
+        self.requests.append((url, json.loads(body), self.synthesis_lib.push_delay))
+        status = self.statuses.pop(0) if self.statuses else "200"
+
+        return {"status": status}, ""
+
+
+class StubNetworkConfiguration(object):
+
+    def __init__(self):
+        self.h = StubHttp()
+        self.controller_api_base_url = "http://localhost:8181/onos/v1/"
+        self.controller_api_user_name = "karaf"
+        self.controller_api_password = "karaf"
+
+
+class TestSynthesisLibPush(unittest.TestCase):
+
+    def setUp(self):
+        nc = StubNetworkConfiguration()
+        ng = NetworkGraph("onos")
+        ng.network_configuration = nc
+
+        self.synthesis_lib = SynthesisLib("localhost", "8181", ng, nc)
+        self.synthesis_lib.min_push_delay = 0.01
+        self.synthesis_lib.max_push_delay = 0.04
+
+    def get_stub_http(self, statuses=()):
+        h = StubHttp(statuses)
+        h.synthesis_lib = self.synthesis_lib
+        return h
+
+    def test_push_change_retries_with_backoff(self):
+
+        h = self.get_stub_http(["429", "503", "500", "201"])
+        self.assertEqual(self.synthesis_lib.push_change(h, "url", {"flow": 1}), True)
+
+        # Waits longer after each time it is turned away, and half as long once it gets through
+        self.assertEqual([push_delay for url, body, push_delay in h.requests], [0.0, 0.01, 0.02, 0.04])
+        self.assertEqual(self.synthesis_lib.push_delay, 0.02)
+
+        h = self.get_stub_http(["200"])
+        self.assertEqual(self.synthesis_lib.push_change(h, "url", {"flow": 2}), True)
+        self.assertEqual(self.synthesis_lib.push_delay, 0.01)
+
+    def test_push_change_gives_up(self):
+
+        # Something the controller turns away with a 4xx other than 429 is not pushed again
+        h = self.get_stub_http(["400", "200"])
+        self.assertEqual(self.synthesis_lib.push_change(h, "url", {"flow": 1}), False)
+        self.assertEqual(len(h.requests), 1)
+
+        # Neither is something it keeps turning away, once it has been tried max_push_attempts times
+        h = self.get_stub_http(["503"] * self.synthesis_lib.max_push_attempts + ["200"])
+        self.assertEqual(self.synthesis_lib.push_change(h, "url", {"flow": 2}), False)
+        self.assertEqual(len(h.requests), self.synthesis_lib.max_push_attempts)
+
+    def test_onos_batches_keep_switch_order(self):
+
+        changes = {"s1": [("flow", 1), ("flow", 2), ("group", 3), ("flow", 4)],
+                   "s2": [("group", 5), ("flow", 6), ("flow", 7)]}
+
+        for sw in sorted(changes):
+            for change_type, change_id in changes[sw]:
+                pushed_content = {"deviceId": sw, "id": change_id}
+                self.synthesis_lib.queue_change(sw, change_type, change_type + "_url", pushed_content)
+
+        connections = [self.get_stub_http() for i in range(self.synthesis_lib.num_connections)]
+        for h in connections:
+            self.synthesis_lib.connection_pool.put(h)
+
+        self.synthesis_lib.flush_changes()
+
+        # Each switch's flows in a row go in one push, and between its groups in the order they were queued in
+        pushed_ids = {}
+        for h in connections:
+            for url, body, push_delay in h.requests:
+                if "flows" in body:
+                    pushed_ids.setdefault(body["flows"][0]["deviceId"], []).append([f["id"] for f in body["flows"]])
+                else:
+                    pushed_ids.setdefault(body["deviceId"], []).append(body["id"])
+
+        self.assertEqual(pushed_ids, {"s1": [[1, 2], 3, [4]], "s2": [5, [6, 7]]})
+
+
+if __name__ == '__main__':
+    unittest.main()
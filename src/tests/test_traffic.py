@@ -3,13 +3,17 @@ import itertools
 from netaddr import IPNetwork
 from model.traffic import Traffic
 from model.match import field_names
+from model.ternary_field import TernaryField
+from model.interval_set import IntervalSet
+from model.lru_memo import LRUMemo
+from model.intervaltree_modified import Interval
 
 
-def get_specific_traffic_per_field_dict(val, ipn_val):
+def get_specific_traffic_per_field_dict(val, ipn_val, field_backend=None):
     specific_traffic_per_field_dict = dict()
 
     for field_name in field_names:
-        t = Traffic(init_wildcard=True)
+        t = Traffic(init_wildcard=True, field_backend=field_backend)
 
         if field_name == 'src_ip_addr' or field_name == 'dst_ip_addr':
             t.set_field(field_name, ipn_val)
@@ -23,12 +27,16 @@ def get_specific_traffic_per_field_dict(val, ipn_val):
 
 class TestTraffic(unittest.TestCase):
 
+    field_backend = None
+
     @classmethod
     def setUpClass(cls):
-        cls.wildcard_traffic = Traffic(init_wildcard=True)
+        cls.wildcard_traffic = Traffic(init_wildcard=True, field_backend=cls.field_backend)
 
-        cls.specific_traffic_per_field_1 = get_specific_traffic_per_field_dict(1, IPNetwork("192.168.1.1"))
-        cls.specific_traffic_per_field_2 = get_specific_traffic_per_field_dict(2, IPNetwork("192.168.1.2"))
+        cls.specific_traffic_per_field_1 = get_specific_traffic_per_field_dict(1, IPNetwork("192.168.1.1"),
+                                                                               cls.field_backend)
+        cls.specific_traffic_per_field_2 = get_specific_traffic_per_field_dict(2, IPNetwork("192.168.1.2"),
+                                                                               cls.field_backend)
 
     def test_intersection_wildcard(self):
         at_int = self.wildcard_traffic.intersect(self.wildcard_traffic)
@@ -79,8 +87,8 @@ class TestTraffic(unittest.TestCase):
 
     def test_set_field_specific_value_check_equal(self):
 
-        wct1 = Traffic(init_wildcard=True)
-        wct2 = Traffic(init_wildcard=True)
+        wct1 = Traffic(init_wildcard=True, field_backend=self.field_backend)
+        wct2 = Traffic(init_wildcard=True, field_backend=self.field_backend)
 
         # Set each field to something specific
         for field_name in field_names:
@@ -100,8 +108,9 @@ class TestTraffic(unittest.TestCase):
 
     def test_set_field_exception_check_intersection(self):
 
-        wct = Traffic(init_wildcard=True)
-        specific_traffic_per_field = get_specific_traffic_per_field_dict(1, IPNetwork("192.168.1.1"))
+        wct = Traffic(init_wildcard=True, field_backend=self.field_backend)
+        specific_traffic_per_field = get_specific_traffic_per_field_dict(1, IPNetwork("192.168.1.1"),
+                                                                         self.field_backend)
 
         # Set each field to exclude the value:
         for field_name in field_names:
@@ -122,5 +131,216 @@ class TestTraffic(unittest.TestCase):
             int = specific_traffic_per_field[field_name].intersect(wct)
             self.assertEqual(int.is_empty(), False)
 
+    def get_traffic(self, field_values):
+        t = Traffic(init_wildcard=True, field_backend=self.field_backend)
+        for field_name in field_values:
+            t.set_field(field_name, field_values[field_name])
+        return t
+
+    def test_compact_merge_and_subset(self):
+
+        t = Traffic(field_backend=self.field_backend)
+        for src_ip, dst_ip in itertools.product(["10.0.0.0/25", "10.0.0.128/25"], ["10.0.1.0/25", "10.0.1.128/25"]):
+            t.union(self.get_traffic({"src_ip_addr": IPNetwork(src_ip), "dst_ip_addr": IPNetwork(dst_ip)}))
+        t.union(self.get_traffic({"src_ip_addr": IPNetwork("10.0.0.0/26"), "dst_ip_addr": IPNetwork("10.0.1.0/24")}))
+
+        orig = Traffic(field_backend=self.field_backend)
+        orig.union(t)
+
+        # All five of them are covered by the cube src_ip_addr:10.0.0.0/24 x dst_ip_addr:10.0.1.0/24
+        t.compact()
+        self.assertEqual(len(t.traffic_elements), 1)
+        self.assertEqual(t.is_equal_traffic(orig), True)
+
+    def test_compact_keeps_single_values_apart(self):
+
+        t = Traffic(field_backend=self.field_backend)
+        for in_port in [1, 2]:
+            t.union(self.get_traffic({"in_port": in_port}))
+        t.union(self.get_traffic({"in_port": 1, "vlan_id": 3}))
+
+        # A field with a single value is mapped back by a modification on it, while one with more values is not
+        t.compact()
+        self.assertEqual(len(t.traffic_elements), 3)
+
+    def test_compact_keeps_edge_data_apart(self):
+
+        t1 = self.get_traffic({"in_port": 1})
+        t1.set_enabling_edge_data(object())
+        t2 = self.get_traffic({"in_port": 2})
+        t2.set_enabling_edge_data(object())
+
+        t = Traffic(field_backend=self.field_backend)
+        t.union(t1)
+        t.union(t2)
+        t.compact()
+        self.assertEqual(len(t.traffic_elements), 2)
+
+    def test_compact_keeps_edge_data_order(self):
+
+        ed1 = object()
+        ed2 = object()
+        t = Traffic(field_backend=self.field_backend)
+        for in_port, ed in [(1, ed1), (2, ed2), (2, ed1)]:
+            t_ed = self.get_traffic({"in_port": in_port})
+            t_ed.set_enabling_edge_data(ed)
+            t.union(t_ed)
+
+        # The te with ed1 for in_port 2 is behind the one with ed2 for it, so it cannot be merged into the first one
+        t.compact()
+        self.assertEqual([te.enabling_edge_data for te in t.traffic_elements], [ed1, ed2, ed1])
+
+    def test_fields_key_and_memo(self):
+
+        t1 = self.get_traffic({"in_port": 1, "vlan_id": 3})
+        t2 = self.get_traffic({"vlan_id": 3, "in_port": 1})
+        te1 = t1.traffic_elements[0]
+        te2 = t2.traffic_elements[0]
+        self.assertEqual(te1.get_fields_key(), te2.get_fields_key())
+
+        # A memoized intersection is handed out as a fresh te every time
+        te_int1 = te1.intersect(te2)
+        te_int2 = te1.intersect(te2)
+        self.assertIsNot(te_int1, te_int2)
+        self.assertEqual(te_int1.get_fields_key(), te_int2.get_fields_key())
+
+        # Setting a field on one of them leaves the fields it shares with the other one alone
+        te_int1.switch_modifications["in_port"] = None
+        te_int1.set_traffic_field("vlan_id", 4)
+        self.assertEqual(te_int2.switch_modifications, {})
+        self.assertNotEqual(te_int1.get_fields_key(), te_int2.get_fields_key())
+        self.assertEqual(te2.is_subset(te_int2), True)
+        self.assertEqual(te2.is_subset(te_int1), False)
+        self.assertEqual(te_int1.intersect(te1), None)
+
+    def test_equal_traffic_shortcuts(self):
+
+        t1 = Traffic(field_backend=self.field_backend)
+        for in_port in [1, 2]:
+            t1.union(self.get_traffic({"in_port": in_port, "vlan_id": 3}))
+
+        # Same te in a different order
+        t2 = Traffic(field_backend=self.field_backend)
+        for in_port in [2, 1]:
+            t2.union(self.get_traffic({"in_port": in_port, "vlan_id": 3}))
+        self.assertEqual(t1 == t2, True)
+
+        # Same traffic made of different te
+        t3 = Traffic(field_backend=self.field_backend)
+        t3.union(t1)
+        t3.compact()
+        self.assertEqual(t1 == t3, True)
+
+        # Same values in each field but not the same traffic
+        t4 = Traffic(field_backend=self.field_backend)
+        t4.union(self.get_traffic({"in_port": 1, "vlan_id": 3}))
+        t4.union(self.get_traffic({"in_port": 2, "vlan_id": 4}))
+        t5 = Traffic(field_backend=self.field_backend)
+        t5.union(self.get_traffic({"in_port": 1, "vlan_id": 4}))
+        t5.union(self.get_traffic({"in_port": 2, "vlan_id": 3}))
+        self.assertEqual(t4 == t5, False)
+
+        self.assertEqual(t1 == t4, False)
+        self.assertEqual(t1 == Traffic(field_backend=self.field_backend), False)
+        self.assertEqual(Traffic() == Traffic(), True)
+
+    def test_lru_memo(self):
+
+        memo = LRUMemo(2)
+        memo.store("a", None)
+        memo.store("b", 2)
+        self.assertEqual(memo.lookup("a"), (True, None))
+
+        # b is the least recently used one now
+        memo.store("c", 3)
+        self.assertEqual(memo.lookup("b"), (False, None))
+        self.assertEqual(memo.lookup("a"), (True, None))
+        self.assertEqual(memo.lookup("c"), (True, 3))
+        self.assertEqual(len(memo), 2)
+
+    def test_normalize_disjoint(self):
+
+        t = Traffic(field_backend=self.field_backend)
+        for in_port, tcp_port in [(1, 80), (2, 80), (2, 81), (3, 81)]:
+            t.union(self.get_traffic({"in_port": in_port, "tcp_destination_port": tcp_port}))
+        t.union(self.get_traffic({"in_port": 2}))
+
+        orig = Traffic(field_backend=self.field_backend)
+        orig.union(t)
+
+        t.normalize()
+        self.assertEqual(t.is_equal_traffic(orig), True)
+        for te1, te2 in itertools.combinations(t.traffic_elements, 2):
+            self.assertEqual(te1.intersect(te2), None)
+            self.assertEqual(te1.get_merged_traffic_element(te2), None)
+
+
+class TestTrafficIntervalTree(TestTraffic):
+
+    field_backend = "interval_tree"
+
+
+class TestTrafficIntervalSet(TestTraffic):
+
+    field_backend = "interval_set"
+
+    def test_interval_set_merge(self):
+
+        # Overlapping and adjacent intervals are merged, values beyond the width are clipped off
+        s = IntervalSet(8, [Interval(10, 20), Interval(0, 5), Interval(15, 30), Interval(30, 40), Interval(250, 300)])
+        self.assertEqual(list(s), [Interval(0, 5), Interval(10, 40), Interval(250, 256)])
+        self.assertEqual(s.num_values(), 41)
+
+        self.assertEqual(list(s.complement()), [Interval(5, 10), Interval(40, 250)])
+        self.assertEqual(s.complement().complement(), s)
+        self.assertEqual(IntervalSet(8, [Interval(0, 256)]).complement().is_empty(), True)
+
+    def test_interval_set_intersect_chop_search(self):
+
+        s1 = IntervalSet(16, [Interval(0, 10), Interval(20, 30), Interval(40, 50)])
+        s2 = IntervalSet(16, [Interval(5, 25), Interval(45, 100)])
+        self.assertEqual(list(s1.intersect(s2)), [Interval(5, 10), Interval(20, 25), Interval(45, 50)])
+
+        self.assertEqual(s1.search(8, 21), set([Interval(0, 10), Interval(20, 30)]))
+        self.assertEqual(s1.search(10, 20), set())
+
+        s1.chop(5, 45)
+        self.assertEqual(list(s1), [Interval(0, 5), Interval(45, 50)])
+        self.assertEqual(Interval(46, 48) in s1, True)
+        self.assertEqual(Interval(4, 46) in s1, False)
+
+
+class TestTrafficTernary(TestTraffic):
+
+    field_backend = "ternary"
+
+    def test_ternary_field_prefixes(self):
+
+        # [1, 7) is 001, 01x, 10x, 110 in 3 bits
+        tf = TernaryField(3, [Interval(1, 7)])
+        self.assertEqual(tf.prefixes, ((1, 0), (2, 1), (4, 1), (6, 0)))
+        self.assertEqual(list(tf), [Interval(1, 7)])
+
+        # Values beyond the width are clipped off
+        tf = TernaryField(3, [Interval(4, 100)])
+        self.assertEqual(tf.prefixes, ((4, 2),))
+
+        self.assertEqual(TernaryField(3, [Interval(1, 7)]).complement().num_values(), 2)
+
+    def test_ternary_field_intersect_chop(self):
+
+        tf1 = TernaryField(8, [Interval(0, 100)])
+        tf2 = TernaryField(8, [Interval(50, 200)])
+        self.assertEqual(list(tf1.intersect(tf2)), [Interval(50, 100)])
+
+        tf1.chop(10, 20)
+        self.assertEqual(list(tf1), [Interval(0, 10), Interval(20, 100)])
+        self.assertEqual(Interval(20, 30) in tf1, True)
+        self.assertEqual(Interval(5, 15) in tf1, False)
+
+        # Same values always end up in the same prefixes
+        tf3 = TernaryField(8, [Interval(20, 100), Interval(0, 10)])
+        self.assertEqual(tf1, tf3)
+
 if __name__ == '__main__':
     unittest.main()